@@ -0,0 +1,232 @@
+"""
+Blueprint Archive for FastAPI MCP
+
+This module moves a whole blueprint library in one request. Export streams
+a tar.gz or zip of the blueprint tree chunk by chunk, without building the
+archive in memory or on disk. Import reads an uploaded archive, validates
+every blueprint (in worker processes for large libraries) before any is
+stored, so that a failed import leaves the library untouched.
+
+The validation workers are started with the "spawn" method: forking a
+server that runs other threads can leave the child stuck on a lock one of
+them held.
+"""
+
+import io
+import os
+import time
+import math
+import tarfile
+import zipfile
+import logging
+import posixpath
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from blueprint_upload import MAX_BLUEPRINT_UPLOAD_BYTES, UploadRejected
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-archive")
+
+# Supported archive formats: media type and file extension
+ARCHIVE_FORMATS = {
+    "tar.gz": ("application/gzip", ".tar.gz"),
+    "zip": ("application/zip", ".zip"),
+}
+
+# Largest archive accepted by the import endpoint, as uploaded
+MAX_IMPORT_ARCHIVE_BYTES = int(os.getenv("MCP_MAX_IMPORT_ARCHIVE_BYTES", str(64 * 1024 * 1024)))
+
+# Most blueprint bytes accepted in one archive, uncompressed
+MAX_IMPORT_TOTAL_BYTES = int(os.getenv("MCP_MAX_IMPORT_TOTAL_BYTES", str(256 * 1024 * 1024)))
+
+# Most members accepted in one archive
+MAX_IMPORT_MEMBERS = int(os.getenv("MCP_MAX_IMPORT_MEMBERS", "10000"))
+
+# Below this many blueprints (~70us each), validating in-process beats handing them to workers
+PARALLEL_VALIDATION_MIN_MEMBERS = 1000
+
+# Worker processes used to validate large imports (default: one per CPU)
+IMPORT_VALIDATION_WORKERS = int(os.getenv("MCP_IMPORT_VALIDATION_WORKERS", "0")) or os.cpu_count() or 1
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZIP_MAGIC = b"PK\x03\x04"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable stream that hands written bytes back in chunks"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Take everything written since the last drain"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_archive(entries: Iterable[Tuple[str, bytes, float]], archive_format: str) -> Iterator[bytes]:
+    """
+    Stream an archive of blueprint documents
+
+    Args:
+        entries: (archive name, content, modification time) triples, in
+            archive order; consumed lazily as the archive is written
+        archive_format: "tar.gz" or "zip"
+
+    Yields:
+        Archive bytes, roughly one chunk per file
+    """
+    sink = _ChunkSink()
+    if archive_format == "zip":
+        archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+    else:
+        archive = tarfile.open(fileobj=sink, mode="w|gz", format=tarfile.PAX_FORMAT)
+
+    with archive:
+        for arcname, data, mtime in entries:
+            if archive_format == "zip":
+                info = zipfile.ZipInfo(arcname, time.localtime(mtime)[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, data)
+            else:
+                info = tarfile.TarInfo(arcname)
+                info.size = len(data)
+                info.mtime = int(mtime)
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def _member_name(name: str) -> str:
+    """Normalize an archive member name, refusing names that escape the library"""
+    normalized = posixpath.normpath(name.replace("\\", "/"))
+    if normalized.startswith("/") or normalized == ".." or normalized.startswith("../"):
+        raise UploadRejected(400, f"Archive member escapes the blueprint library: {name}")
+    return normalized
+
+
+def read_archive(path: str, max_member_bytes: int = MAX_BLUEPRINT_UPLOAD_BYTES) -> Tuple[List[Tuple[str, bytes]], List[str]]:
+    """
+    Read the blueprint documents from a tar.gz or zip archive
+
+    Args:
+        path: Path of the spooled archive
+        max_member_bytes: Largest blueprint accepted, uncompressed
+
+    Returns:
+        (member name, content) for each .json file, and the names of the
+        members that were skipped because they are not blueprints
+    """
+    with open(path, "rb") as f:
+        magic = f.read(4)
+
+    members: List[Tuple[str, bytes]] = []
+    skipped: List[str] = []
+    total = [0]
+
+    def accept(name: str, size: int) -> bool:
+        if len(members) + len(skipped) >= MAX_IMPORT_MEMBERS:
+            raise UploadRejected(413, f"Archive has more than {MAX_IMPORT_MEMBERS} members")
+        if not name.endswith(".json") or posixpath.basename(name).startswith("."):
+            skipped.append(name)
+            return False
+        if size > max_member_bytes:
+            raise UploadRejected(413, f"Archive member {name} exceeds the {max_member_bytes} byte limit")
+        total[0] += size
+        if total[0] > MAX_IMPORT_TOTAL_BYTES:
+            raise UploadRejected(413, f"Archive expands to more than {MAX_IMPORT_TOTAL_BYTES} bytes")
+        return True
+
+    try:
+        if magic.startswith(_GZIP_MAGIC):
+            with tarfile.open(path, mode="r:gz") as archive:
+                for info in archive:
+                    if not info.isfile():
+                        continue  # Directories, links and devices carry no blueprints
+                    name = _member_name(info.name)
+                    if accept(name, info.size):
+                        members.append((name, archive.extractfile(info).read()))
+        elif magic.startswith(_ZIP_MAGIC):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        continue
+                    name = _member_name(info.filename)
+                    if accept(name, info.file_size):
+                        with archive.open(info) as member:
+                            # The declared size is not trusted: read at most one byte past the cap
+                            data = member.read(max_member_bytes + 1)
+                        if len(data) > max_member_bytes:
+                            raise UploadRejected(413, f"Archive member {name} exceeds the {max_member_bytes} byte limit")
+                        members.append((name, data))
+        else:
+            raise UploadRejected(400, "Archive must be a tar.gz or zip file")
+    except (tarfile.TarError, zipfile.BadZipFile, EOFError, OSError) as e:
+        raise UploadRejected(400, f"Invalid archive: {str(e)}")
+
+    return members, skipped
+
+
+class _ValidationPool:
+    """Process pool for import validation, spawned on first use and kept for later imports"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+        self._pid: Optional[int] = None
+
+    def get(self, workers: int) -> ProcessPoolExecutor:
+        with self._lock:
+            # A pool does not survive a fork (e.g. gunicorn preload); start a new one
+            if self._executor is None or self._pid != os.getpid() or self._workers != workers:
+                if self._executor is not None and self._pid == os.getpid():
+                    self._executor.shutdown(wait=False)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._workers = workers
+                self._pid = os.getpid()
+            return self._executor
+
+
+_validation_pool = _ValidationPool()
+
+
+def validate_members(
+    members: List[Tuple[str, bytes]],
+    check: Callable[[Tuple[str, bytes]], Any],
+    workers: int = IMPORT_VALIDATION_WORKERS
+) -> List[Any]:
+    """
+    Run a picklable, module-level check over every member
+
+    Large archives are spread over a spawned process pool so parsing and
+    model validation use every core; small ones are checked in-process.
+    """
+    if workers <= 1 or len(members) < PARALLEL_VALIDATION_MIN_MEMBERS:
+        return [check(member) for member in members]
+
+    chunksize = max(1, math.ceil(len(members) / (workers * 4)))
+    return list(_validation_pool.get(workers).map(check, members, chunksize=chunksize))
@@ -0,0 +1,153 @@
+"""
+Blueprint Change Feed for FastAPI MCP
+
+This module lets several server processes that share one blueprint library
+tell each other which blueprints changed. Every write appends a line to a
+shared journal file; each process remembers how far it has read and
+refreshes only the blueprints that appear after that point.
+
+Once the journal grows past MAX_CHANGE_FEED_BYTES the next writer replaces
+it with a fresh file and leaves a marker at the end of the old one. Each
+process switches to the new journal when it reads that marker, and the old
+file's space is freed once the last process has let go of it.
+"""
+
+import os
+import fcntl
+import logging
+import tempfile
+import threading
+from typing import List, Optional
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-changes")
+
+# Environment variable that enables the feed, set by the gunicorn config
+CHANGE_FEED_ENV = "MCP_BLUEPRINT_CHANGE_FEED"
+
+# Journal size that makes the next writer start a fresh journal
+MAX_CHANGE_FEED_BYTES = int(os.getenv("MCP_BLUEPRINT_CHANGE_FEED_MAX_BYTES", str(1024 * 1024)))
+
+# Published instead of an ID when the whole library changed; not a valid blueprint ID
+REBUILD_ALL = "*"
+
+# Control lines: the last line of a replaced journal and the first line of its
+# replacement, both carrying the replacement's generation number
+_ROTATED = "*rotated "
+_GENERATION = "*generation "
+
+
+class BlueprintChangeFeed:
+    """Size-capped journal of changed blueprint IDs shared between workers"""
+
+    def __init__(self, path: str, max_bytes: int = MAX_CHANGE_FEED_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._fd = os.open(path, os.O_RDONLY | os.O_CREAT, 0o600)
+        # Start at the end: the index built at startup already reflects older entries
+        self._offset = os.fstat(self._fd).st_size
+        # Writers take both locks: lockf() excludes other processes (also
+        # after fork, as POSIX locks belong to a process), the mutex other threads
+        self._lock_fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["BlueprintChangeFeed"]:
+        """Open the feed named by the environment, if multi-worker mode is on"""
+        path = os.getenv(CHANGE_FEED_ENV)
+        return cls(path) if path else None
+
+    def publish(self, blueprint_id: str) -> None:
+        """Record that a blueprint was created, updated or deleted"""
+        line = f"{os.getpid()}\t{blueprint_id}\n".encode("utf-8")
+        with self._write_lock:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                # Always append to the current journal, even if this process
+                # has not read up to a rotation marker yet
+                fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    os.write(fd, line)
+                    if os.fstat(fd).st_size > self.max_bytes:
+                        self._rotate(fd)
+                finally:
+                    os.close(fd)
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN)
+
+    def poll(self) -> List[str]:
+        """
+        Return blueprint IDs changed by other processes since the last poll
+
+        A single fstat is all it costs when nothing changed.
+        """
+        changed: List[str] = []
+        # After fork the journal belongs to a new process: our own writes are
+        # tagged with this PID and were already applied locally
+        pid = str(os.getpid())
+        while True:
+            size = os.fstat(self._fd).st_size
+            if size <= self._offset:
+                return changed
+
+            # pread keeps the offset private to this process even though the
+            # descriptor was inherited across fork
+            data = os.pread(self._fd, size - self._offset, self._offset)
+            complete = data.rfind(b"\n") + 1
+            self._offset += complete
+
+            rotated_to = None
+            for line in data[:complete].decode("utf-8").splitlines():
+                writer_pid, _, blueprint_id = line.partition("\t")
+                if blueprint_id.startswith(_ROTATED):
+                    rotated_to = int(blueprint_id[len(_ROTATED):])
+                    break
+                if blueprint_id.startswith(_GENERATION):
+                    continue
+                if writer_pid != pid and blueprint_id not in changed:
+                    changed.append(blueprint_id)
+
+            if rotated_to is None:
+                return changed
+            self._follow_rotation(rotated_to, changed)
+
+    def close(self) -> None:
+        """Close the journal file"""
+        os.close(self._fd)
+        os.close(self._lock_fd)
+
+    def _rotate(self, fd: int) -> None:
+        """Replace the journal behind fd with an empty one; caller holds the writer locks"""
+        generation = _generation(fd) + 1
+        pid = os.getpid()
+        directory, name = os.path.split(self.path)
+        temp_fd, temp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.")
+        try:
+            os.write(temp_fd, f"{pid}\t{_GENERATION}{generation}\n".encode("utf-8"))
+        finally:
+            os.close(temp_fd)
+        os.replace(temp_path, self.path)
+
+        # Written after the swap, so a reader that reaches it finds the new journal
+        os.write(fd, f"{pid}\t{_ROTATED}{generation}\n".encode("utf-8"))
+        logger.info(f"Rotated blueprint change feed {self.path} (generation {generation})")
+
+    def _follow_rotation(self, generation: int, changed: List[str]) -> None:
+        """Switch to the journal that replaced the one just read to its end"""
+        os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDONLY | os.O_CREAT, 0o600)
+        self._offset = 0
+        if _generation(self._fd) != generation:
+            # Rotated again before this process caught up: entries in between are gone
+            self._offset = os.fstat(self._fd).st_size
+            if REBUILD_ALL not in changed:
+                changed.append(REBUILD_ALL)
+
+
+def _generation(fd: int) -> int:
+    """Generation number in a journal's first line; the journal created at startup has none"""
+    first_line = os.pread(fd, 256, 0).split(b"\n", 1)[0].decode("utf-8", "replace")
+    _, _, entry = first_line.partition("\t")
+    if entry.startswith(_GENERATION) and entry[len(_GENERATION):].isdigit():
+        return int(entry[len(_GENERATION):])
+    return 0
@@ -0,0 +1,202 @@
+"""
+Blueprint Extracts for FastAPI MCP
+
+This module renders the embedded code template of every Smart Blueprint
+with sample parameters as soon as the blueprint is indexed or saved, checks
+the syntax of the result once, and keeps the rendered example with its size
+and line metadata. The extract endpoint serves these artifacts, so browsing
+examples never renders or compiles anything on the request path.
+
+{{name}} is replaced with the sample value and {{#if flag}}...{{/if}} blocks
+are kept or dropped for boolean parameters. scripts/smart_blueprint_processor.py
+renders and checks examples with these same functions.
+"""
+
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-extracts")
+
+# Fields of an extract that are listed without the code
+EXTRACT_SUMMARY_FIELDS = ("blueprint_id", "language", "size", "lines", "sha256", "syntax_valid")
+
+
+def sample_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick a sample value for every template parameter"""
+    params: Dict[str, Any] = {}
+    for param_name, param_config in parameters.items():
+        if not isinstance(param_config, dict):
+            continue
+        param_type = param_config.get("type", "string")
+        description = str(param_config.get("description", ""))
+
+        if param_type == "string":
+            if "pattern" in param_config:
+                if "snake_case" in description:
+                    params[param_name] = "sample_resource"
+                elif "PascalCase" in description:
+                    params[param_name] = "SampleResource"
+                else:
+                    params[param_name] = "sample"
+            else:
+                params[param_name] = param_config.get("default", "sample")
+        elif param_type == "boolean":
+            params[param_name] = param_config.get("default", True)
+        elif param_type == "integer":
+            params[param_name] = param_config.get("default", 1)
+        elif "default" in param_config:
+            params[param_name] = param_config["default"]
+    return params
+
+
+def render_template(template: str, parameters: Dict[str, Any]) -> str:
+    """Substitute {{name}} placeholders and resolve {{#if flag}} blocks"""
+    for key, value in parameters.items():
+        if isinstance(value, bool):
+            if_pattern = rf"{{{{#if {re.escape(key)}}}}}(.*?){{{{/if}}}}"
+            template = re.sub(if_pattern, r"\1" if value else "", template, flags=re.DOTALL)
+        else:
+            template = template.replace(f"{{{{{key}}}}}", str(value))
+    return template
+
+
+def check_syntax(code: str, language: str, filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Check the syntax of rendered code
+
+    Returns:
+        None if the code is valid (or the language is not checked), else the
+        error message and line
+    """
+    if language != "python":
+        return None
+    try:
+        compile(code, filename, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return {"message": e.msg, "line": e.lineno}
+    except ValueError as e:  # e.g. null bytes
+        return {"message": str(e), "line": None}
+    return None
+
+
+def build_extract(blueprint_id: str, blueprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Render and check the example of one blueprint, or None if it has no code template"""
+    code_template = blueprint.get("codeTemplate")
+    if not isinstance(code_template, dict) or not isinstance(code_template.get("content"), str):
+        return None
+
+    language = str(code_template.get("language", "python"))
+    parameters = blueprint.get("parameters")
+    params = sample_parameters(parameters if isinstance(parameters, dict) else {})
+    code = render_template(code_template["content"], params)
+    encoded = code.encode("utf-8")
+    syntax_error = check_syntax(code, language, f"{blueprint_id}.example")
+
+    # The ETag covers everything in the response, including the raw template
+    digest = hashlib.sha256(encoded)
+    digest.update(json.dumps(code_template, sort_keys=True).encode("utf-8"))
+
+    return {
+        "success": True,
+        "blueprint_id": blueprint_id,
+        "language": language,
+        "code_template": code_template,
+        "extracted_code": code,
+        "parameters": params,
+        "size": len(encoded),
+        "lines": code.count("\n") + (1 if code and not code.endswith("\n") else 0),
+        "sha256": digest.hexdigest(),
+        "syntax_valid": syntax_error is None,
+        "syntax_error": syntax_error
+    }
+
+
+class BlueprintExtractCache:
+    """Rendered examples of every Smart Blueprint, kept in sync as a registry listener"""
+
+    def __init__(self):
+        self._extracts: Dict[str, Dict[str, Any]] = {}
+        # Render key -> extract, so unchanged templates are not re-rendered on a full rebuild
+        self._by_template: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.renders = 0
+
+    def __len__(self) -> int:
+        return len(self._extracts)
+
+    # Registry listener interface
+    def rebuild(self, blueprints: Dict[str, Dict[str, Any]]) -> None:
+        """Render the examples of all blueprints"""
+        extracts: Dict[str, Dict[str, Any]] = {}
+        by_template: Dict[str, Dict[str, Any]] = {}
+        for blueprint_id, blueprint in blueprints.items():
+            key = self._render_key(blueprint_id, blueprint)
+            extract = self._by_template.get(key) if key else None
+            if extract is None:
+                extract = self._build(blueprint_id, blueprint)
+            if extract is not None:
+                extracts[blueprint_id] = extract
+                if key:
+                    by_template[key] = extract
+
+        with self._lock:
+            self._extracts = extracts
+            self._by_template = by_template
+        invalid = sum(1 for extract in extracts.values() if not extract["syntax_valid"])
+        logger.info(f"Prepared {len(extracts)} blueprint extracts ({invalid} with syntax errors)")
+
+    def update(self, blueprint_id: str, blueprint: Optional[Dict[str, Any]]) -> None:
+        """Re-render the example of a saved blueprint, or drop a deleted one"""
+        extract = self._build(blueprint_id, blueprint) if blueprint is not None else None
+        key = self._render_key(blueprint_id, blueprint) if blueprint is not None else None
+        with self._lock:
+            extracts = dict(self._extracts)
+            by_template = dict(self._by_template)
+            previous = extracts.pop(blueprint_id, None)
+            if previous is not None:
+                by_template = {k: v for k, v in by_template.items() if v is not previous}
+            if extract is not None:
+                extracts[blueprint_id] = extract
+                if key:
+                    by_template[key] = extract
+            self._extracts = extracts
+            self._by_template = by_template
+
+    def get(self, blueprint_id: str) -> Optional[Dict[str, Any]]:
+        """Get the prepared extract of a blueprint; shared, must not be mutated"""
+        return self._extracts.get(blueprint_id)
+
+    def list_extracts(self) -> List[Dict[str, Any]]:
+        """List extract metadata, without the code, ordered by blueprint ID"""
+        extracts = self._extracts
+        return [
+            {field: extracts[blueprint_id][field] for field in EXTRACT_SUMMARY_FIELDS}
+            for blueprint_id in sorted(extracts)
+        ]
+
+    def _build(self, blueprint_id: str, blueprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            extract = build_extract(blueprint_id, blueprint)
+        except Exception as e:
+            logger.error(f"Failed to render example of blueprint {blueprint_id}: {str(e)}")
+            return None
+        if extract is not None:
+            self.renders += 1
+        return extract
+
+    @staticmethod
+    def _render_key(blueprint_id: str, blueprint: Dict[str, Any]) -> Optional[str]:
+        """Everything the rendered example depends on, hashed"""
+        try:
+            source = json.dumps(
+                [blueprint_id, blueprint.get("codeTemplate"), blueprint.get("parameters")],
+                sort_keys=True
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
@@ -0,0 +1,364 @@
+"""
+Blueprint Registry for FastAPI MCP
+
+This module keeps an in-memory index of Smart Blueprints so request handlers
+do not have to read and parse the blueprint store on every call.
+
+The index is published as immutable snapshots. A writer builds the next
+snapshot from the current one (copy-on-write) and swaps it in with a single
+assignment, so readers never take a lock and never see a half-applied
+change. A request or render that holds on to a snapshot keeps a consistent
+view of every blueprint, its content hash and the listing, even while the
+library is being reloaded.
+"""
+
+import os
+import json
+import time
+import bisect
+import hashlib
+import logging
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from blueprint_changes import REBUILD_ALL, BlueprintChangeFeed
+from blueprint_store import BlueprintRecord, BlueprintStore
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-registry")
+
+# Minimum time between two polls of the change feed; reads in between use the current snapshot
+CHANGE_POLL_INTERVAL_MS = int(os.getenv("MCP_BLUEPRINT_CHANGE_POLL_MS", "250"))
+
+# Fields kept in the lightweight metadata index
+SUMMARY_FIELDS = ("id", "name", "description", "version", "category", "layer", "strategy", "tags")
+
+# Fields returned by list_metadata and the default blueprint listing
+DEFAULT_SUMMARY_FIELDS = ("id", "name", "description", "version")
+
+
+class RegistrySnapshot:
+    """
+    Immutable view of the blueprint index at one point in time
+
+    Parsed blueprints and summaries are shared between snapshots and must
+    not be mutated.
+    """
+
+    __slots__ = ("generation", "blueprints", "hashes", "summaries", "sorted_ids", "_index_hash")
+
+    def __init__(
+        self,
+        generation: int,
+        blueprints: Dict[str, Dict[str, Any]],
+        hashes: Dict[str, str],
+        summaries: Dict[str, Dict[str, Any]]
+    ):
+        self.generation = generation
+        self.blueprints: Mapping[str, Dict[str, Any]] = MappingProxyType(blueprints)
+        self.hashes: Mapping[str, str] = MappingProxyType(hashes)
+        self.summaries: Mapping[str, Dict[str, Any]] = MappingProxyType(summaries)
+        self.sorted_ids: Tuple[str, ...] = tuple(sorted(summaries))
+        self._index_hash: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.blueprints)
+
+    def get(self, blueprint_id: str) -> Optional[Dict[str, Any]]:
+        """Get a parsed blueprint by ID"""
+        return self.blueprints.get(blueprint_id)
+
+    def contains(self, blueprint_id: str) -> bool:
+        """Check whether a blueprint ID is indexed"""
+        return blueprint_id in self.blueprints
+
+    def content_hash(self, blueprint_id: str) -> Optional[str]:
+        """Get the SHA-256 of a blueprint as it was read into this snapshot"""
+        return self.hashes.get(blueprint_id)
+
+    def index_hash(self) -> str:
+        """Get a hash covering every blueprint ID and content hash in the snapshot"""
+        index_hash = self._index_hash
+        if index_hash is None:
+            # Derived from immutable data, so computing it twice is harmless
+            digest = hashlib.sha256()
+            for blueprint_id in self.sorted_ids:
+                digest.update(f"{blueprint_id}:{self.hashes[blueprint_id]}\n".encode("utf-8"))
+            index_hash = self._index_hash = digest.hexdigest()
+        return index_hash
+
+    def list_metadata(self) -> List[Dict[str, Any]]:
+        """List id, name, description and version for every blueprint"""
+        summaries, _ = self.query()
+        return [{field: summary[field] for field in DEFAULT_SUMMARY_FIELDS} for summary in summaries]
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        layer: Optional[str] = None,
+        strategy: Optional[str] = None,
+        tag: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Filter and page through the metadata index, ordered by blueprint ID
+
+        Args:
+            category: Category or parent category, e.g. "api" or "api/routes"
+            layer: Exact layer, e.g. "middleware"
+            strategy: Exact strategy, e.g. "embedded-template"
+            tag: Tag the blueprint must carry
+            after: Only return blueprints whose ID sorts after this one
+            limit: Maximum number of results
+
+        Returns:
+            Matching summaries, and the ID to continue after when more remain.
+            Summaries are shared with the index and must not be mutated.
+        """
+        ids = self.sorted_ids
+        summaries = self.summaries
+        results: List[Dict[str, Any]] = []
+        start = bisect.bisect_right(ids, after) if after else 0
+        for blueprint_id in ids[start:]:
+            summary = summaries[blueprint_id]
+            if category and summary["category"] != category and not summary["category"].startswith(category + "/"):
+                continue
+            if layer and summary["layer"] != layer:
+                continue
+            if strategy and summary["strategy"] != strategy:
+                continue
+            if tag and tag not in summary["tags"]:
+                continue
+            if limit is not None and len(results) == limit:
+                return results, results[-1]["id"]
+            results.append(summary)
+        return results, None
+
+
+_EMPTY_SNAPSHOT = RegistrySnapshot(0, {}, {}, {})
+
+
+class BlueprintRegistry:
+    """In-memory index of stored blueprints keyed by blueprint ID"""
+
+    def __init__(
+        self,
+        store: BlueprintStore,
+        change_feed: Optional[BlueprintChangeFeed] = None,
+        poll_interval_ms: int = CHANGE_POLL_INTERVAL_MS
+    ):
+        self.store = store
+        self.change_feed = change_feed
+        self.poll_interval = poll_interval_ms / 1000
+        self._next_poll = 0.0
+        # Held by the one thread polling the change feed; others skip the poll
+        self._poll_lock = threading.Lock()
+        self._snapshot = _EMPTY_SNAPSHOT
+        self._listeners: List[Any] = []
+        # Serializes writers only; readers just load self._snapshot
+        self._write_lock = threading.RLock()
+        self._built = False
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index has been built at least once"""
+        return self._built
+
+    def build(self) -> int:
+        """
+        Read every blueprint from the store and publish a fresh snapshot
+
+        Returns:
+            Number of blueprints indexed
+        """
+        with self._write_lock:
+            blueprints: Dict[str, Dict[str, Any]] = {}
+            hashes: Dict[str, str] = {}
+            summaries: Dict[str, Dict[str, Any]] = {}
+
+            for record in self.store.iter_records():
+                blueprint, content_hash = self._parse(record)
+                if blueprint is not None:
+                    blueprints[record.id] = blueprint
+                    hashes[record.id] = content_hash
+                    summaries[record.id] = self._summarize(record, blueprint)
+
+            self._snapshot = RegistrySnapshot(self._snapshot.generation + 1, blueprints, hashes, summaries)
+            self._built = True
+
+            for listener in self._listeners:
+                listener.rebuild(blueprints)
+
+        logger.info(f"Indexed {len(blueprints)} blueprints from {self.store!r}")
+        return len(blueprints)
+
+    def add_listener(self, listener: Any) -> None:
+        """
+        Keep a derived index in sync with the registry
+
+        The listener must provide rebuild(blueprints), called after every full
+        build, and update(blueprint_id, blueprint), called with None when a
+        blueprint was deleted. Calls are made in snapshot order. The listener
+        is primed right away if the index exists.
+        """
+        with self._write_lock:
+            self._listeners.append(listener)
+            if self._built:
+                listener.rebuild(dict(self._snapshot.blueprints))
+
+    def ensure_built(self) -> None:
+        """
+        Build the index on first use if startup did not already do it,
+        then pick up blueprints changed by other worker processes
+
+        The change feed is polled at most once per poll interval, so changes
+        made by other workers become visible within that interval.
+        """
+        if not self._built:
+            self.build()
+        if self.change_feed is None:
+            return
+
+        now = time.monotonic()
+        if now < self._next_poll or not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_poll = now + self.poll_interval
+            changed = self.change_feed.poll()
+            if REBUILD_ALL in changed:
+                self.build()
+                return
+            for blueprint_id in changed:
+                self._reload(blueprint_id)
+        finally:
+            self._poll_lock.release()
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        Get the current snapshot
+
+        Hold on to it for the duration of a request or render to read a
+        consistent state; later changes publish new snapshots instead of
+        modifying this one.
+        """
+        self.ensure_built()
+        return self._snapshot
+
+    def get(self, blueprint_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a parsed blueprint by ID
+
+        The returned dictionary is shared with the cache and must not be mutated.
+        """
+        return self.snapshot().get(blueprint_id)
+
+    def contains(self, blueprint_id: str) -> bool:
+        """Check whether a blueprint ID is indexed"""
+        return self.snapshot().contains(blueprint_id)
+
+    def content_hash(self, blueprint_id: str) -> Optional[str]:
+        """Get the SHA-256 of a blueprint as it was last read"""
+        return self.snapshot().content_hash(blueprint_id)
+
+    def index_hash(self) -> str:
+        """Get a hash covering every indexed blueprint ID and content hash"""
+        return self.snapshot().index_hash()
+
+    def list_metadata(self) -> List[Dict[str, Any]]:
+        """List id, name, description and version for every indexed blueprint"""
+        return self.snapshot().list_metadata()
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        layer: Optional[str] = None,
+        strategy: Optional[str] = None,
+        tag: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Filter and page through the current snapshot; see RegistrySnapshot.query"""
+        return self.snapshot().query(category, layer, strategy, tag, after, limit)
+
+    def refresh(self, blueprint_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Re-read a single blueprint after it was written or removed,
+        and tell other worker processes to do the same
+
+        Returns:
+            The freshly parsed blueprint, or None if it no longer exists
+        """
+        self.ensure_built()
+        blueprint = self._reload(blueprint_id)
+        if self.change_feed is not None:
+            self.change_feed.publish(blueprint_id)
+        return blueprint
+
+    def reload_all(self) -> int:
+        """
+        Rebuild the whole index after many blueprints were written at once,
+        and tell other worker processes to do the same
+
+        Returns:
+            Number of blueprints indexed
+        """
+        count = self.build()
+        if self.change_feed is not None:
+            self.change_feed.publish(REBUILD_ALL)
+        return count
+
+    def _reload(self, blueprint_id: str) -> Optional[Dict[str, Any]]:
+        """Re-read one blueprint from the store and publish a snapshot with it swapped in"""
+        with self._write_lock:
+            # Read under the lock so a concurrent reload of the same ID can
+            # never publish an older read after a newer one
+            record = self.store.get(blueprint_id)
+            blueprint, content_hash = self._parse(record) if record is not None else (None, None)
+
+            current = self._snapshot
+            blueprints = dict(current.blueprints)
+            hashes = dict(current.hashes)
+            summaries = dict(current.summaries)
+            if blueprint is None:
+                blueprints.pop(blueprint_id, None)
+                hashes.pop(blueprint_id, None)
+                summaries.pop(blueprint_id, None)
+            else:
+                blueprints[blueprint_id] = blueprint
+                hashes[blueprint_id] = content_hash
+                summaries[blueprint_id] = self._summarize(record, blueprint)
+            self._snapshot = RegistrySnapshot(current.generation + 1, blueprints, hashes, summaries)
+
+            for listener in self._listeners:
+                listener.update(blueprint_id, blueprint)
+
+        return blueprint
+
+    def _summarize(self, record: BlueprintRecord, blueprint: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the metadata index entry for a blueprint"""
+        metadata = blueprint.get("metadata")
+        tags = list(blueprint.get("tags") or [])
+        if isinstance(metadata, dict):
+            tags.extend(metadata.get("tags") or [])
+
+        return {
+            "id": record.id,
+            "name": blueprint.get("name", record.id),
+            "description": blueprint.get("description", ""),
+            "version": blueprint.get("version", "1.0.0"),
+            # Declared values win; otherwise fall back to where the blueprint is stored
+            "category": blueprint.get("category") or record.category,
+            "layer": blueprint.get("layer") or record.category.rsplit("/", 1)[-1],
+            "strategy": blueprint.get("strategy", ""),
+            "tags": [tag for tag in tags if isinstance(tag, str)]
+        }
+
+    def _parse(self, record: BlueprintRecord) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Parse a stored blueprint, returning it with its content hash"""
+        try:
+            return json.loads(record.content.decode("utf-8")), hashlib.sha256(record.content).hexdigest()
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            logger.error(f"Failed to parse blueprint JSON: {record.id} in {self.store!r}")
+            return None, None
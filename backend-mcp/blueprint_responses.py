@@ -0,0 +1,254 @@
+"""
+Blueprint Responses for FastAPI MCP
+
+This module serializes blueprint API payloads with orjson (falling back to
+the standard json module), negotiates gzip/brotli compression above a size
+threshold, and caches serialized and compressed bodies by content hash so
+unchanged blueprints are never encoded twice.
+"""
+
+import os
+import json
+import gzip
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-responses")
+
+# Cache policy for blueprint reads: clients and proxies may store responses
+# but must revalidate them with If-None-Match before reuse
+BLUEPRINT_CACHE_CONTROL = os.getenv("MCP_BLUEPRINT_CACHE_CONTROL", "no-cache")
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("MCP_COMPRESSION_MIN_SIZE", "1024"))
+
+# Encoders are only paid once per content hash, so favour ratio over speed
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Upper bound for all cached bodies together
+BODY_CACHE_MAX_BYTES = int(os.getenv("MCP_BODY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Body lengths remembered after their bodies are evicted
+BODY_SIZE_CACHE_ENTRIES = 65536
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_pretty(content: Any) -> bytes:
+    """Serialize content to indented JSON bytes, as stored on disk"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, indent=2).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def envelope_response(fields: Dict[str, Any], name: str, raw_json: bytes) -> Response:
+    """
+    Build a JSON object response that embeds already serialized JSON
+
+    Lets write endpoints reuse the bytes they stored on disk instead of
+    serializing the same blueprint a second time for the response body.
+    """
+    head = dumps(fields)
+    body = head[:-1] + b',' + dumps(name) + b':' + raw_json + b'}'
+    return Response(content=body, media_type="application/json")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with the given content coding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the best content coding the client accepts
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_weight = None, 0.0
+    for coding in candidates:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class SerializedBodyCache:
+    """LRU cache of serialized (and compressed) bodies with a byte budget"""
+
+    def __init__(self, max_bytes: int, max_sizes: int = BODY_SIZE_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_sizes = max_sizes
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._size = 0
+        # Length of every body built, kept after the body itself is evicted so
+        # conditional requests can be answered without building it again
+        self._sizes: "OrderedDict[Tuple[str, str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key: Tuple[str, str, str], factory: Callable[[], bytes]) -> bytes:
+        """Get a cached body or build and store it"""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = factory()
+
+        with self._lock:
+            self._sizes[key] = len(body)
+            self._sizes.move_to_end(key)
+            if len(self._sizes) > self.max_sizes:
+                self._sizes.popitem(last=False)
+            if key not in self._entries and len(body) <= self.max_bytes:
+                self._entries[key] = body
+                self._size += len(body)
+                while self._size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return body
+
+    def body_size(self, key: Tuple[str, str, str]) -> Optional[int]:
+        """Get the length of a body built before, without building it"""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                return len(body)
+            return self._sizes.get(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Shared cache used by the blueprint router
+body_cache = SerializedBodyCache(BODY_CACHE_MAX_BYTES)
+
+
+def make_etag(content_hash: str, encoding: Optional[str] = None) -> str:
+    """Build a strong ETag for one representation of the content"""
+    return f'"{content_hash}-{encoding}"' if encoding else f'"{content_hash}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_json_response(
+    request: Request,
+    kind: str,
+    content_hash: str,
+    payload_factory: Callable[[], Any],
+    extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Build a conditional, compressed JSON response from cached bodies
+
+    Args:
+        request: Incoming request, used for If-None-Match and Accept-Encoding
+        kind: Namespace of the payload, e.g. "blueprint" or "index"
+        content_hash: Hash that changes whenever the payload changes
+        payload_factory: Builds the payload on a cache miss
+        extra_headers: Additional headers for both 200 and 304 responses
+
+    Returns:
+        A 304 when the client's copy is current, otherwise the full body
+    """
+    identity_key = (kind, content_hash, "identity")
+    if_none_match = request.headers.get("if-none-match")
+
+    # The ETag depends only on the body length, so a revalidation of content
+    # built before is answered without calling payload_factory
+    body = None
+    size = body_cache.body_size(identity_key) if if_none_match else None
+    if size is None:
+        body = body_cache.get_or_create(identity_key, lambda: dumps(payload_factory()))
+        size = len(body)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None and size < COMPRESSION_MIN_SIZE:
+        encoding = None
+
+    etag = make_etag(content_hash, encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": BLUEPRINT_CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if body is None:
+        body = body_cache.get_or_create(identity_key, lambda: dumps(payload_factory()))
+    if encoding is not None:
+        body = body_cache.get_or_create((kind, content_hash, encoding), lambda: compress(body, encoding))
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,226 @@
+"""
+Blueprint Search for FastAPI MCP
+
+This module keeps an in-memory inverted index over blueprint names,
+descriptions, parameter descriptions and template identifiers. Queries are
+ranked with BM25; query terms that do not appear in any blueprint are
+expanded to similar indexed terms through a trigram index, so typos such as
+"midleware" still find "middleware".
+"""
+
+import re
+import math
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-search")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term weight per indexed field
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "description": 2.0,
+    "parameters": 1.0,
+    "identifiers": 1.0,
+}
+
+# Fuzzy expansion: minimum trigram similarity and expansions per query term
+FUZZY_MIN_SIMILARITY = 0.4
+FUZZY_MAX_EXPANSIONS = 3
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "to", "with"
+})
+
+_CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_DEFINITION_RE = re.compile(r"\b(?:class|def)\s+([A-Za-z_]\w*)")
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*[#/]?(?:if\s+)?([A-Za-z_]\w*)")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking camelCase, snake_case and kebab-case"""
+    words = _WORD_RE.findall(_CAMEL_RE.sub(r"\1 \2", text).lower())
+    return [word for word in words if len(word) > 1 and word not in STOPWORDS]
+
+
+def _trigrams(term: str) -> Set[str]:
+    """Trigrams of a term padded with spaces, so short terms still have some"""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def extract_fields(blueprint_id: str, blueprint: Dict[str, Any]) -> Dict[str, str]:
+    """Collect the searchable text of a blueprint, per field"""
+    parameters = blueprint.get("parameters")
+    parameter_text = []
+    if isinstance(parameters, dict):
+        for name, config in parameters.items():
+            parameter_text.append(name)
+            if isinstance(config, dict) and isinstance(config.get("description"), str):
+                parameter_text.append(config["description"])
+
+    identifiers = []
+    code_template = blueprint.get("codeTemplate")
+    if isinstance(code_template, dict) and isinstance(code_template.get("content"), str):
+        content = code_template["content"]
+        identifiers.extend(_DEFINITION_RE.findall(content))
+        identifiers.extend(_PLACEHOLDER_RE.findall(content))
+    if isinstance(blueprint.get("template"), str):
+        identifiers.append(blueprint["template"])
+
+    return {
+        "name": f"{blueprint_id} {blueprint.get('name', '')}",
+        "description": str(blueprint.get("description", "")),
+        "parameters": " ".join(parameter_text),
+        "identifiers": " ".join(dict.fromkeys(identifiers)),
+    }
+
+
+class BlueprintSearchIndex:
+    """Incrementally maintained BM25 index with trigram fuzzy matching"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+        self._documents: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    # Registry listener interface
+    def rebuild(self, blueprints: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the whole index with the given blueprints"""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0.0
+            self._trigram_terms.clear()
+            self._documents.clear()
+            for blueprint_id, blueprint in blueprints.items():
+                self._add(blueprint_id, blueprint)
+        logger.info(f"Search index built over {len(blueprints)} blueprints")
+
+    def update(self, blueprint_id: str, blueprint: Optional[Dict[str, Any]]) -> None:
+        """Index a created or updated blueprint, or drop a deleted one"""
+        with self._lock:
+            self._remove(blueprint_id)
+            if blueprint is not None:
+                self._add(blueprint_id, blueprint)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank blueprints against a free-text query
+
+        Args:
+            query: Free text, e.g. "jwt auth middleware"
+            limit: Maximum number of results
+
+        Returns:
+            Results ordered by score, each with id, name, description, score
+            and the indexed terms that matched
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        matched: Dict[str, Set[str]] = defaultdict(set)
+
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if doc_count == 0:
+                return []
+            average_length = self._total_length / doc_count
+
+            for query_term in dict.fromkeys(tokenize(query)):
+                for term, boost in self._expand(query_term):
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for blueprint_id, frequency in postings.items():
+                        norm = 1 - BM25_B + BM25_B * self._doc_lengths[blueprint_id] / average_length
+                        scores[blueprint_id] += boost * idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+                        matched[blueprint_id].add(term)
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [
+                {
+                    "id": blueprint_id,
+                    "name": self._documents[blueprint_id]["title"],
+                    "description": self._documents[blueprint_id]["description"],
+                    "score": round(score, 4),
+                    "matched": sorted(matched[blueprint_id])
+                }
+                for blueprint_id, score in ranked
+            ]
+
+    def _expand(self, query_term: str) -> List[Tuple[str, float]]:
+        """Map a query term to indexed terms with a weight for each"""
+        if query_term in self._postings:
+            return [(query_term, 1.0)]
+
+        query_trigrams = _trigrams(query_term)
+        shared: Counter = Counter()
+        for trigram in query_trigrams:
+            for term in self._trigram_terms.get(trigram, ()):
+                shared[term] += 1
+
+        candidates = []
+        for term, overlap in shared.items():
+            similarity = overlap / (len(query_trigrams) + len(_trigrams(term)) - overlap)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                candidates.append((term, similarity))
+        candidates.sort(key=lambda item: (-item[1], item[0]))
+        return candidates[:FUZZY_MAX_EXPANSIONS]
+
+    def _add(self, blueprint_id: str, blueprint: Dict[str, Any]) -> None:
+        """Add a document; caller holds the lock"""
+        fields = extract_fields(blueprint_id, blueprint)
+        frequencies: Dict[str, float] = defaultdict(float)
+        for field, text in fields.items():
+            for term in tokenize(text):
+                frequencies[term] += FIELD_WEIGHTS[field]
+
+        for term, frequency in frequencies.items():
+            if term not in self._postings:
+                for trigram in _trigrams(term):
+                    self._trigram_terms[trigram].add(term)
+            self._postings[term][blueprint_id] = frequency
+
+        length = sum(frequencies.values())
+        self._doc_terms[blueprint_id] = dict(frequencies)
+        self._doc_lengths[blueprint_id] = length
+        self._total_length += length
+        self._documents[blueprint_id] = {
+            "title": str(blueprint.get("name", blueprint_id)),
+            "description": fields["description"]
+        }
+
+    def _remove(self, blueprint_id: str) -> None:
+        """Remove a document if present; caller holds the lock"""
+        terms = self._doc_terms.pop(blueprint_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(blueprint_id, None)
+            if not postings:
+                del self._postings[term]
+                for trigram in _trigrams(term):
+                    self._trigram_terms[trigram].discard(term)
+                    if not self._trigram_terms[trigram]:
+                        del self._trigram_terms[trigram]
+
+        self._total_length -= self._doc_lengths.pop(blueprint_id)
+        self._documents.pop(blueprint_id, None)
@@ -0,0 +1,385 @@
+"""
+Blueprint Store for FastAPI MCP
+
+This module is the only place that knows where blueprint documents live.
+The registry reads through a BlueprintStore and the API writes through it,
+so the library can be kept as a directory tree of JSON files (the default)
+or in a single SQLite database that lists thousands of blueprints with one
+query instead of a directory walk.
+
+Select the backend with MCP_BLUEPRINT_STORE=filesystem|sqlite; the SQLite
+database path is MCP_BLUEPRINT_DB. An empty database is seeded from the
+blueprints directory the first time it is opened.
+"""
+
+import os
+import json
+import time
+import queue
+import sqlite3
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-store")
+
+# Storage backend and SQLite settings
+BLUEPRINT_STORE = os.getenv("MCP_BLUEPRINT_STORE", "filesystem")
+BLUEPRINT_DB_PATH = os.getenv("MCP_BLUEPRINT_DB", "")
+SQLITE_POOL_SIZE = int(os.getenv("MCP_BLUEPRINT_DB_POOL_SIZE", "4"))
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blueprints (
+    id TEXT PRIMARY KEY,
+    category TEXT NOT NULL DEFAULT '',
+    version TEXT NOT NULL DEFAULT '',
+    content BLOB NOT NULL,
+    modified REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blueprints_category ON blueprints (category, id);
+CREATE INDEX IF NOT EXISTS idx_blueprints_version ON blueprints (version);
+"""
+
+
+class BlueprintRecord(NamedTuple):
+    """A stored blueprint document"""
+    id: str
+    category: str  # "/"-separated location in the library, "" for the top level
+    content: bytes
+    modified: float
+
+
+class BlueprintStore(ABC):
+    """Where blueprint documents are kept, keyed by blueprint ID"""
+
+    @abstractmethod
+    def iter_records(self) -> Iterator[BlueprintRecord]:
+        """Yield every stored blueprint, ordered by ID"""
+
+    @abstractmethod
+    def get(self, blueprint_id: str) -> Optional[BlueprintRecord]:
+        """Get one blueprint, or None if it is not stored"""
+
+    @abstractmethod
+    def exists(self, blueprint_id: str) -> bool:
+        """Check whether a blueprint is stored"""
+
+    @abstractmethod
+    def put_many(self, records: List[Tuple[str, bytes, Optional[str]]]) -> None:
+        """
+        Store several blueprints so that either all of them or none are written
+
+        Args:
+            records: (blueprint ID, content, category) triples. The category
+                places new blueprints; existing ones stay where they are.
+        """
+
+    @abstractmethod
+    def delete(self, blueprint_id: str) -> bool:
+        """Remove a blueprint, returning whether it existed"""
+
+    def put(self, blueprint_id: str, content: bytes, category: Optional[str] = None) -> None:
+        """Store one blueprint atomically"""
+        self.put_many([(blueprint_id, content, category)])
+
+    def close(self) -> None:
+        """Release any resources held by the store"""
+
+
+def write_files_atomically(files: List[Tuple[str, bytes]]) -> None:
+    """
+    Write several files so that either all of them or none are replaced
+
+    Every file is first staged and fsynced next to its target; the staged
+    files are renamed into place only once all of them were written.
+    """
+    staged: List[Tuple[str, str]] = []
+    try:
+        for target_path, content in files:
+            directory = os.path.dirname(target_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".write-", suffix=".tmp")
+            staged.append((temp_path, target_path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+    except Exception:
+        for temp_path, _ in staged:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+        raise
+
+    for temp_path, target_path in staged:
+        os.replace(temp_path, target_path)
+
+    # Persist the renames themselves
+    for directory in {os.path.dirname(target_path) for _, target_path in staged}:
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+
+class FilesystemBlueprintStore(BlueprintStore):
+    """Blueprints as <category>/<id>.json files below a root directory"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._paths: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"FilesystemBlueprintStore({self.root!r})"
+
+    def iter_records(self) -> Iterator[BlueprintRecord]:
+        paths: Dict[str, str] = {}
+        for root, _, files in os.walk(self.root):
+            for filename in sorted(files):
+                if not filename.endswith(".json"):
+                    continue
+                blueprint_id = filename[:-5]  # Remove .json extension
+                path = os.path.join(root, filename)
+                if blueprint_id in paths:
+                    logger.warning(f"Duplicate blueprint ID '{blueprint_id}' at {path}, keeping {paths[blueprint_id]}")
+                    continue
+                paths[blueprint_id] = path
+
+        with self._lock:
+            self._paths = paths
+
+        for blueprint_id in sorted(paths):
+            record = self._read(blueprint_id, paths[blueprint_id])
+            if record is not None:
+                yield record
+
+    def get(self, blueprint_id: str) -> Optional[BlueprintRecord]:
+        return self._read(blueprint_id, self._path(blueprint_id))
+
+    def exists(self, blueprint_id: str) -> bool:
+        return os.path.exists(self._path(blueprint_id))
+
+    def put_many(self, records: List[Tuple[str, bytes, Optional[str]]]) -> None:
+        files = []
+        for blueprint_id, content, category in records:
+            path = self._path(blueprint_id)
+            if not os.path.exists(path) and category:
+                path = os.path.join(self.root, *category.split("/"), f"{blueprint_id}.json")
+            files.append((blueprint_id, path, content))
+
+        write_files_atomically([(path, content) for _, path, content in files])
+        with self._lock:
+            for blueprint_id, path, _ in files:
+                self._paths[blueprint_id] = path
+
+    def delete(self, blueprint_id: str) -> bool:
+        path = self._path(blueprint_id)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self._paths.pop(blueprint_id, None)
+
+        # Drop category directories the blueprint leaves empty
+        directory = os.path.dirname(path)
+        while os.path.normpath(directory) != os.path.normpath(self.root):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+        return True
+
+    def _path(self, blueprint_id: str) -> str:
+        """Where a blueprint lives, or the default location for a new one"""
+        return self._paths.get(blueprint_id) or os.path.join(self.root, f"{blueprint_id}.json")
+
+    def _read(self, blueprint_id: str, path: str) -> Optional[BlueprintRecord]:
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+                modified = os.fstat(f.fileno()).st_mtime
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        category = os.path.relpath(os.path.dirname(path), self.root)
+        category = "" if category == "." else category.replace(os.sep, "/")
+        return BlueprintRecord(blueprint_id, category, content, modified)
+
+
+class SQLiteDatabase:
+    """
+    Pool of connections to one SQLite database in WAL mode
+
+    Readers never block the writer or each other. Each connection is used by
+    a single thread at a time; a pool inherited across fork is dropped, so
+    every worker process opens its own connections.
+    """
+
+    def __init__(self, path: str, schema: str, pool_size: int = SQLITE_POOL_SIZE):
+        self.path = path
+        self.pool_size = max(1, pool_size)
+        self._pid = os.getpid()
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+
+        with self.connection() as conn:
+            conn.executescript(schema)
+
+    def close(self) -> None:
+        """Close every idle connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, opening one if the pool is not full yet"""
+        if self._pid != os.getpid():
+            # SQLite connections must not be shared across fork
+            self._pid = os.getpid()
+            self._pool = queue.LifoQueue()
+            self._opened = 0
+
+        pool = self._pool
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._opened < self.pool_size
+                if can_open:
+                    self._opened += 1
+            conn = self._connect() if can_open else pool.get()
+        try:
+            yield conn
+        finally:
+            pool.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction, rolled back on error"""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly in transaction()
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+
+class SQLiteBlueprintStore(BlueprintStore):
+    """Blueprints as rows of a SQLite database, read and written through a connection pool"""
+
+    def __init__(self, path: str, pool_size: int = SQLITE_POOL_SIZE):
+        self.path = path
+        self.db = SQLiteDatabase(path, _SQLITE_SCHEMA, pool_size)
+
+    def __repr__(self) -> str:
+        return f"SQLiteBlueprintStore({self.path!r})"
+
+    def iter_records(self) -> Iterator[BlueprintRecord]:
+        with self.db.connection() as conn:
+            cursor = conn.execute("SELECT id, category, content, modified FROM blueprints ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(256)
+                if not rows:
+                    break
+                for row in rows:
+                    yield BlueprintRecord(row[0], row[1], bytes(row[2]), row[3])
+
+    def get(self, blueprint_id: str) -> Optional[BlueprintRecord]:
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT id, category, content, modified FROM blueprints WHERE id = ?", (blueprint_id,)
+            ).fetchone()
+        return BlueprintRecord(row[0], row[1], bytes(row[2]), row[3]) if row else None
+
+    def exists(self, blueprint_id: str) -> bool:
+        with self.db.connection() as conn:
+            return conn.execute("SELECT 1 FROM blueprints WHERE id = ?", (blueprint_id,)).fetchone() is not None
+
+    def put_many(self, records: List[Tuple[str, bytes, Optional[str]]]) -> None:
+        modified = time.time()
+        rows = [
+            (blueprint_id, category or "", declared_version(content), content, modified)
+            for blueprint_id, content, category in records
+        ]
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO blueprints (id, category, version, content, modified) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET "
+                "version = excluded.version, content = excluded.content, modified = excluded.modified",
+                rows
+            )
+
+    def delete(self, blueprint_id: str) -> bool:
+        with self.db.transaction() as conn:
+            return conn.execute("DELETE FROM blueprints WHERE id = ?", (blueprint_id,)).rowcount > 0
+
+    def is_empty(self) -> bool:
+        """Check whether the database holds no blueprints yet"""
+        with self.db.connection() as conn:
+            return conn.execute("SELECT 1 FROM blueprints LIMIT 1").fetchone() is None
+
+    def seed_from(self, source: BlueprintStore) -> int:
+        """Copy every blueprint of another store in one transaction, keeping existing rows"""
+        rows = [
+            (record.id, record.category, declared_version(record.content), record.content, record.modified)
+            for record in source.iter_records()
+        ]
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO blueprints (id, category, version, content, modified) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def declared_version(content: bytes) -> str:
+    """Version declared in a blueprint document, for the indexed column"""
+    try:
+        version = json.loads(content).get("version", "")
+    except (ValueError, AttributeError):
+        return ""
+    return version if isinstance(version, str) else str(version)
+
+
+def open_blueprint_store(blueprints_dir: str) -> BlueprintStore:
+    """Open the configured blueprint store for a blueprints directory"""
+    if BLUEPRINT_STORE == "filesystem":
+        return FilesystemBlueprintStore(blueprints_dir)
+    if BLUEPRINT_STORE != "sqlite":
+        raise ValueError(f"Unknown blueprint store '{BLUEPRINT_STORE}', expected 'filesystem' or 'sqlite'")
+
+    store = SQLiteBlueprintStore(BLUEPRINT_DB_PATH or os.path.normpath(blueprints_dir) + ".db")
+    if store.is_empty() and os.path.isdir(blueprints_dir):
+        seeded = store.seed_from(FilesystemBlueprintStore(blueprints_dir))
+        logger.info(f"Seeded {store.path} with {seeded} blueprints from {blueprints_dir}")
+    return store
@@ -0,0 +1,313 @@
+"""
+Blueprint Upload for FastAPI MCP
+
+This module streams an uploaded blueprint from the request body into a
+temporary file. The size cap is enforced on every chunk and the JSON
+structure is checked batch by batch while the body arrives, so an oversized
+or malformed upload is rejected before it is buffered. Batches are checked
+and written in the threadpool to keep file I/O off the event loop. The
+document is only stored after it parsed and validated.
+"""
+
+import os
+import re
+import codecs
+import logging
+import tempfile
+from typing import List, Optional
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import multipart
+    from multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # pragma: no cover - python-multipart is in requirements
+    multipart = None
+    parse_options_header = None
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-upload")
+
+# Largest blueprint document accepted by the upload endpoint
+MAX_BLUEPRINT_UPLOAD_BYTES = int(os.getenv("MCP_MAX_BLUEPRINT_UPLOAD_BYTES", str(2 * 1024 * 1024)))
+
+# Received chunks are checked and written to the spool in batches of this size
+SPOOL_BATCH_BYTES = int(os.getenv("MCP_UPLOAD_SPOOL_BATCH_BYTES", str(256 * 1024)))
+
+# Allowance for multipart boundaries and part headers on top of the document
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+# Deepest object/array nesting accepted in a blueprint
+MAX_JSON_DEPTH = 64
+
+_STRUCTURE_RE = re.compile(r'[{}\[\]"]')
+_STRING_RE = re.compile(r'["\\]')
+_CLOSERS = {"}": "{", "]": "["}
+
+
+class UploadRejected(Exception):
+    """Raised when an upload must be refused; carries the HTTP status to answer with"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class JSONStreamScanner:
+    """
+    Incremental structural check of a JSON object document
+
+    Tracks strings, escapes and bracket nesting across chunk boundaries and
+    fails as soon as the document cannot be a single JSON object. Token-level
+    validity is left to the final parse of the (size-capped) spooled file.
+    """
+
+    def __init__(self, max_depth: int = MAX_JSON_DEPTH):
+        self.max_depth = max_depth
+        self._stack: List[str] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> None:
+        """Consume the next decoded chunk, raising ValueError on a structural error"""
+        position = 0
+        length = len(text)
+        while position < length:
+            if self._escape:
+                self._escape = False
+                position += 1
+                continue
+
+            if self._in_string:
+                match = _STRING_RE.search(text, position)
+                if match is None:
+                    return
+                if match.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                position = match.end()
+                continue
+
+            if self._done:
+                if text[position:].strip():
+                    raise ValueError("Unexpected data after the JSON document")
+                return
+
+            if not self._started:
+                remainder = text[position:].lstrip()
+                if not remainder:
+                    return
+                if remainder[0] != "{":
+                    raise ValueError("Blueprint must be a JSON object")
+                self._started = True
+
+            match = _STRUCTURE_RE.search(text, position)
+            if match is None:
+                return
+            token = match.group()
+            position = match.end()
+
+            if token == '"':
+                self._in_string = True
+            elif token in "{[":
+                self._stack.append(token)
+                if len(self._stack) > self.max_depth:
+                    raise ValueError(f"JSON nesting deeper than {self.max_depth} levels")
+            else:
+                if not self._stack or self._stack.pop() != _CLOSERS[token]:
+                    raise ValueError("Mismatched bracket in JSON document")
+                if not self._stack:
+                    self._done = True
+
+    def close(self) -> None:
+        """Check that a complete document was seen"""
+        if not self._done:
+            raise ValueError("Truncated JSON document")
+
+
+class UploadSpool:
+    """Size-capped temporary file that an upload is streamed into, removed on exit"""
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".tmp",
+                 batch_bytes: int = SPOOL_BATCH_BYTES):
+        self.max_bytes = max_bytes
+        self.batch_bytes = batch_bytes
+        self.size = 0
+        self.filename: Optional[str] = None
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        fd, self.path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=suffix)
+        self._file = os.fdopen(fd, "wb")
+
+    def __enter__(self) -> "UploadSpool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.discard()
+
+    def write(self, chunk: bytes) -> None:
+        """Queue a chunk of the upload; the size cap is checked immediately"""
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadRejected(413, f"Upload exceeds the {self.max_bytes} byte limit")
+        self._pending.append(chunk)
+        self._pending_size += len(chunk)
+
+    async def drain(self, force: bool = False) -> None:
+        """Check and store the queued chunks in the threadpool once a batch is full"""
+        if self._pending and (force or self._pending_size >= self.batch_bytes):
+            await run_in_threadpool(self.flush_pending)
+
+    def flush_pending(self) -> None:
+        """Check and store the queued chunks"""
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        self.check_chunk(data)
+        self._file.write(data)
+
+    def check_chunk(self, chunk: bytes) -> None:
+        """Hook for subclasses to inspect each batch of chunks before it is stored"""
+
+    def close(self) -> None:
+        """Flush everything written so far so the spooled file can be read"""
+        self.flush_pending()
+        self._file.flush()
+
+    def discard(self) -> None:
+        """Drop the spooled upload"""
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class BlueprintUploadSpool(UploadSpool):
+    """Upload spool for a single blueprint document, checked as JSON while it streams"""
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BLUEPRINT_UPLOAD_BYTES):
+        super().__init__(directory, max_bytes)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scanner = JSONStreamScanner()
+
+    def check_chunk(self, chunk: bytes) -> None:
+        """Decode and structurally check the batch"""
+        try:
+            self._scanner.feed(self._decoder.decode(chunk))
+        except UnicodeDecodeError:
+            raise UploadRejected(400, "Blueprint must be UTF-8 encoded")
+        except ValueError as e:
+            raise UploadRejected(400, f"Invalid JSON file: {str(e)}")
+
+    def finish(self) -> bytes:
+        """
+        Complete the upload and return the spooled document
+
+        The document is at most max_bytes, so reading it back is bounded.
+        Does blocking file I/O; call it from the threadpool.
+        """
+        self.flush_pending()
+        try:
+            self._scanner.feed(self._decoder.decode(b"", final=True))
+            self._scanner.close()
+        except UnicodeDecodeError:
+            raise UploadRejected(400, "Blueprint must be UTF-8 encoded")
+        except ValueError as e:
+            raise UploadRejected(400, f"Invalid JSON file: {str(e)}")
+
+        self.close()
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+async def spool_request_body(request: Request, spool: UploadSpool, field_name: str = "file") -> None:
+    """
+    Stream an upload from the request into a spool
+
+    Accepts either multipart/form-data with the upload in `field_name`,
+    or the raw upload as the request body (e.g. application/json). Every
+    chunk is stored by the time this returns.
+    """
+    content_type = request.headers.get("content-type", "")
+    is_multipart = content_type.startswith("multipart/form-data")
+
+    body_limit = spool.max_bytes + (MULTIPART_OVERHEAD_BYTES if is_multipart else 0)
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > body_limit:
+        raise UploadRejected(413, f"Upload exceeds the {spool.max_bytes} byte limit")
+
+    if not is_multipart:
+        async for chunk in request.stream():
+            spool.write(chunk)
+            await spool.drain()
+        await spool.drain(force=True)
+        return
+
+    if multipart is None:
+        raise UploadRejected(400, "Multipart uploads require python-multipart")
+
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadRejected(400, "Missing boundary in multipart upload")
+
+    state = {"header_name": b"", "header_value": b"", "disposition": b"", "target": False, "found": False}
+
+    def on_part_begin() -> None:
+        state["disposition"] = b""
+        state["target"] = False
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        state["header_name"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        state["header_value"] += data[start:end]
+
+    def on_header_end() -> None:
+        if state["header_name"].lower() == b"content-disposition":
+            state["disposition"] = state["header_value"]
+        state["header_name"] = b""
+        state["header_value"] = b""
+
+    def on_headers_finished() -> None:
+        _, options = parse_options_header(state["disposition"])
+        if options.get(b"name", b"").decode("latin-1") == field_name and not state["found"]:
+            state["target"] = True
+            state["found"] = True
+            spool.filename = options.get(b"filename", b"").decode("utf-8", "replace") or None
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if state["target"]:
+            spool.write(data[start:end])
+
+    parser = multipart.MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+    })
+
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > body_limit:
+            raise UploadRejected(413, f"Upload exceeds the {spool.max_bytes} byte limit")
+        parser.write(chunk)
+        await spool.drain()
+    parser.finalize()
+    await spool.drain(force=True)
+
+    if not state["found"]:
+        raise UploadRejected(400, f"Multipart upload has no '{field_name}' field")
@@ -0,0 +1,364 @@
+"""
+Blueprint Versions for FastAPI MCP
+
+This module keeps the revision history of every blueprint. The newest
+revision is stored whole; each older revision is stored as a compressed
+reverse delta against the revision after it, with a full keyframe every
+KEYFRAME_INTERVAL revisions so no version is more than a few deltas away.
+Older versions are only rebuilt when they are requested, and rebuilt
+versions are kept in a small LRU since a revision never changes.
+
+History is recorded by VersionedBlueprintStore, which wraps the configured
+BlueprintStore, so every write path (create, update, upload, import,
+rollback and delete) is covered without the handlers knowing about it.
+A write whose revision cannot be recorded is undone and fails, so the
+library never holds a version the history does not know. Serving the
+current version does not touch the history at all.
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from blueprint_store import (
+    BlueprintRecord,
+    BlueprintStore,
+    SQLiteBlueprintStore,
+    SQLiteDatabase,
+    declared_version
+)
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.blueprint-versions")
+
+# Database for the history when the blueprints themselves are not in SQLite
+BLUEPRINT_HISTORY_DB_PATH = os.getenv("MCP_BLUEPRINT_HISTORY_DB", "")
+
+# Every revision that is a multiple of this keeps a full copy
+KEYFRAME_INTERVAL = 16
+
+# Rebuilt revisions kept in memory
+MATERIALIZED_CACHE_SIZE = 128
+
+_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blueprint_revisions (
+    blueprint_id TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    version TEXT NOT NULL DEFAULT '',
+    content_hash TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    kind TEXT NOT NULL,
+    data BLOB,
+    category TEXT,
+    PRIMARY KEY (blueprint_id, revision)
+);
+"""
+
+# Row kinds: a whole (compressed) document, a reverse delta, or a deletion marker
+FULL = "full"
+DELTA = "delta"
+DELETED = "deleted"
+
+# Split points for deltas: real line breaks, and the escaped "\n" inside
+# JSON strings, so edits to an embedded code template stay small
+_SPLIT_RE = re.compile(rb"(?<=\n)|(?<=\\n)")
+
+
+class HistoryWriteError(Exception):
+    """Raised when a write was undone because its revision could not be recorded"""
+
+
+def _split(content: bytes) -> List[bytes]:
+    return [piece for piece in _SPLIT_RE.split(content) if piece]
+
+
+def make_delta(base: bytes, target: bytes) -> bytes:
+    """Encode how to rebuild target from base, compressed"""
+    base_pieces = _split(base)
+    target_pieces = _split(target)
+    ops: List[Any] = []
+    matcher = SequenceMatcher(None, base_pieces, target_pieces, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(b"".join(target_pieces[j1:j2]).decode("utf-8", "surrogateescape"))
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild the target of make_delta from its base"""
+    base_pieces = _split(base)
+    parts: List[bytes] = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, list):
+            parts.extend(base_pieces[op[0]:op[1]])
+        else:
+            parts.append(op.encode("utf-8", "surrogateescape"))
+    return b"".join(parts)
+
+
+class BlueprintHistory:
+    """Revision history of every blueprint, stored as compressed reverse deltas"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = SQLiteDatabase(path, _HISTORY_SCHEMA)
+        self._add_category_column()
+        self._materialized: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"BlueprintHistory({self.path!r})"
+
+    def record_many(self, changes: List[Tuple[str, Optional[bytes], Optional[bytes], str]]) -> None:
+        """
+        Record new revisions in one transaction
+
+        Args:
+            changes: (blueprint ID, content before the write, content after
+                the write, category) tuples; None stands for "did not exist" /
+                "deleted". The content before the write is recorded first if
+                the history has not seen it, e.g. for blueprints edited on disk.
+                The category is where the blueprint is stored, so a rollback
+                can put a deleted blueprint back in place.
+        """
+        with self.db.transaction() as conn:
+            for blueprint_id, previous, content, category in changes:
+                head = conn.execute(
+                    "SELECT revision, kind, content_hash, data FROM blueprint_revisions "
+                    "WHERE blueprint_id = ? ORDER BY revision DESC LIMIT 1",
+                    (blueprint_id,)
+                ).fetchone()
+
+                if _content_hash(previous) != (head[2] if head else None):
+                    head = self._append(conn, blueprint_id, head, previous, category)
+                if _content_hash(content) != (head[2] if head else None):
+                    self._append(conn, blueprint_id, head, content, category)
+
+    def list_versions(self, blueprint_id: str) -> List[Dict[str, Any]]:
+        """List the revisions of a blueprint, oldest first"""
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT revision, version, content_hash, size, created, kind, length(data), category "
+                "FROM blueprint_revisions WHERE blueprint_id = ? ORDER BY revision",
+                (blueprint_id,)
+            ).fetchall()
+        return [
+            {
+                "revision": revision,
+                "version": version,
+                "content_hash": content_hash,
+                "size": size,
+                "stored_size": stored_size or 0,
+                "created": created,
+                "category": category,
+                "deleted": kind == DELETED,
+                "current": index == len(rows) - 1
+            }
+            for index, (revision, version, content_hash, size, created, kind, stored_size, category) in enumerate(rows)
+        ]
+
+    def get_version(self, blueprint_id: str, revision: int) -> Optional[Dict[str, Any]]:
+        """Get the metadata of one revision, or None if it does not exist"""
+        for entry in self.list_versions(blueprint_id):
+            if entry["revision"] == revision:
+                return entry
+        return None
+
+    def current_revision(self, blueprint_id: str) -> Optional[int]:
+        """Get the newest revision number of a blueprint"""
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT max(revision) FROM blueprint_revisions WHERE blueprint_id = ?", (blueprint_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def materialize(self, blueprint_id: str, revision: int) -> Optional[bytes]:
+        """
+        Rebuild the content of a revision
+
+        Returns:
+            The document as it was at that revision, or None if the revision
+            does not exist or records a deletion
+        """
+        key = (blueprint_id, revision)
+        with self._cache_lock:
+            cached = self._materialized.get(key)
+            if cached is not None:
+                self._materialized.move_to_end(key)
+                return cached
+
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT revision, kind, data FROM blueprint_revisions "
+                "WHERE blueprint_id = ? AND revision >= ? ORDER BY revision LIMIT ?",
+                (blueprint_id, revision, KEYFRAME_INTERVAL + 1)
+            ).fetchall()
+        if not rows or rows[0][0] != revision or rows[0][1] == DELETED:
+            return None
+
+        # Walk up to the nearest full copy, then apply the deltas back down
+        chain = []
+        for row_revision, kind, data in rows:
+            if kind == FULL:
+                content = zlib.decompress(data)
+                break
+            if kind != DELTA:
+                raise ValueError(f"Broken history for blueprint '{blueprint_id}' at revision {row_revision}")
+            chain.append(data)
+        else:
+            raise ValueError(f"No full copy above revision {revision} of blueprint '{blueprint_id}'")
+        for delta in reversed(chain):
+            content = apply_delta(content, delta)
+
+        with self._cache_lock:
+            self._materialized[key] = content
+            while len(self._materialized) > MATERIALIZED_CACHE_SIZE:
+                self._materialized.popitem(last=False)
+        return content
+
+    def _add_category_column(self) -> None:
+        """Upgrade a history written before revisions recorded their category"""
+        with self.db.connection() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(blueprint_revisions)")}
+            if "category" in columns:
+                return
+            try:
+                conn.execute("ALTER TABLE blueprint_revisions ADD COLUMN category TEXT")
+            except sqlite3.OperationalError as e:
+                # Another worker process upgraded it first
+                if "duplicate column" not in str(e):
+                    raise
+
+    def _append(
+        self,
+        conn,
+        blueprint_id: str,
+        head: Optional[tuple],
+        content: Optional[bytes],
+        category: str
+    ) -> tuple:
+        """Add a revision after head and demote head to a delta; returns the new head"""
+        revision = head[0] + 1 if head else 1
+        if content is not None and head is not None and head[1] == FULL and head[0] % KEYFRAME_INTERVAL:
+            previous = zlib.decompress(head[3])
+            delta = make_delta(content, previous)
+            if len(delta) < len(head[3]):
+                conn.execute(
+                    "UPDATE blueprint_revisions SET kind = ?, data = ? WHERE blueprint_id = ? AND revision = ?",
+                    (DELTA, delta, blueprint_id, head[0])
+                )
+
+        content_hash = _content_hash(content)
+        data = zlib.compress(content, 9) if content is not None else None
+        conn.execute(
+            "INSERT INTO blueprint_revisions "
+            "(blueprint_id, revision, version, content_hash, size, created, kind, data, category) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                blueprint_id,
+                revision,
+                declared_version(content) if content is not None else "",
+                content_hash,
+                len(content) if content is not None else 0,
+                time.time(),
+                FULL if content is not None else DELETED,
+                data,
+                category
+            )
+        )
+        return (revision, FULL if content is not None else DELETED, content_hash, data)
+
+
+class VersionedBlueprintStore(BlueprintStore):
+    """BlueprintStore that records every write in a BlueprintHistory"""
+
+    def __init__(self, store: BlueprintStore, history: BlueprintHistory):
+        self.store = store
+        self.history = history
+        self._write_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return repr(self.store)
+
+    def iter_records(self) -> Iterator[BlueprintRecord]:
+        return self.store.iter_records()
+
+    def get(self, blueprint_id: str) -> Optional[BlueprintRecord]:
+        return self.store.get(blueprint_id)
+
+    def exists(self, blueprint_id: str) -> bool:
+        return self.store.exists(blueprint_id)
+
+    def put_many(self, records: List[Tuple[str, bytes, Optional[str]]]) -> None:
+        with self._write_lock:
+            previous = {blueprint_id: self.store.get(blueprint_id) for blueprint_id, _, _ in records}
+            self.store.put_many(records)
+            changes = []
+            for blueprint_id, content, category in records:
+                record = previous[blueprint_id]
+                if record is not None:
+                    # Existing blueprints stay where they are
+                    changes.append((blueprint_id, record.content, content, record.category))
+                else:
+                    changes.append((blueprint_id, None, content, category or ""))
+            self._record(changes, list(previous.items()))
+
+    def delete(self, blueprint_id: str) -> bool:
+        with self._write_lock:
+            previous = self.store.get(blueprint_id)
+            deleted = self.store.delete(blueprint_id)
+            if deleted and previous is not None:
+                self._record(
+                    [(blueprint_id, previous.content, None, previous.category)],
+                    [(blueprint_id, previous)]
+                )
+            return deleted
+
+    def close(self) -> None:
+        self.store.close()
+        self.history.db.close()
+
+    def _record(
+        self,
+        changes: List[Tuple[str, Optional[bytes], Optional[bytes], str]],
+        previous: List[Tuple[str, Optional[BlueprintRecord]]]
+    ) -> None:
+        """Record the revisions of a write, or put the previous blueprints back and fail"""
+        try:
+            self.history.record_many(changes)
+        except Exception as e:
+            logger.error(f"Failed to record blueprint history, undoing the write: {str(e)}")
+            restore = [(record.id, record.content, record.category) for _, record in previous if record is not None]
+            if restore:
+                self.store.put_many(restore)
+            for blueprint_id, record in previous:
+                if record is None:
+                    self.store.delete(blueprint_id)
+            raise HistoryWriteError(f"Failed to record blueprint history: {str(e)}") from e
+
+
+def _content_hash(content: Optional[bytes]) -> Optional[str]:
+    return hashlib.sha256(content).hexdigest() if content is not None else None
+
+
+def open_blueprint_history(blueprints_dir: str, store: BlueprintStore) -> BlueprintHistory:
+    """Open the history database that goes with a blueprint store"""
+    if BLUEPRINT_HISTORY_DB_PATH:
+        path = BLUEPRINT_HISTORY_DB_PATH
+    elif isinstance(store, SQLiteBlueprintStore):
+        path = store.path  # Keep everything in the one database
+    else:
+        path = os.path.normpath(blueprints_dir) + ".history.db"
+    return BlueprintHistory(path)
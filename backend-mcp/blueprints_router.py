@@ -4,29 +4,51 @@ Smart Blueprint Router for FastAPI MCP
 This module provides API endpoints for managing Smart Blueprints with embedded templates.
 """
 
-from fastapi import APIRouter, HTTPException, Body, Depends, Path, Query, UploadFile, File
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from typing import Dict, List, Any, Optional, Union
+from fastapi import APIRouter, HTTPException, Body, Depends, Path, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
+from typing import Dict, List, Any, Optional, Tuple
 import json
-import os
+import re
+import base64
+import hashlib
 import logging
-import shutil
-from pathlib import Path as FilePath
+import posixpath
+import tempfile
+import time
 
 from template_engine import (
-    load_blueprint,
-    list_available_blueprints,
     generate_from_blueprint,
-    find_blueprints_dir
+    generate_project,
+    commit_project,
+    get_preview_cache,
+    preview_project,
+    get_blueprint_registry,
+    get_blueprint_history,
+    get_blueprint_extracts,
+    search_blueprints
+)
+from blueprint_registry import DEFAULT_SUMMARY_FIELDS, SUMMARY_FIELDS
+from blueprint_responses import FastJSONResponse, cached_json_response, dumps_pretty, envelope_response
+from generation_output import OutputProject
+from blueprint_upload import BlueprintUploadSpool, UploadSpool, UploadRejected, spool_request_body
+from blueprint_archive import (
+    ARCHIVE_FORMATS,
+    MAX_IMPORT_ARCHIVE_BYTES,
+    iter_archive,
+    read_archive,
+    validate_members
 )
 
 # Configure logging
 logger = logging.getLogger("mcp-fastapi.blueprints-router")
 
 # Create router
-router = APIRouter(prefix="/api/blueprints", tags=["blueprints"])
+router = APIRouter(prefix="/api/blueprints", tags=["blueprints"], default_response_class=FastJSONResponse)
 
+# Blueprint IDs double as file names, so keep them to a safe character set
+BLUEPRINT_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
 
 # Models
 class BlueprintBase(BaseModel):
@@ -37,6 +59,18 @@ class BlueprintBase(BaseModel):
     version: str = "1.0.0"
 
 
+class BlueprintSummary(BaseModel):
+    """Model for a listing entry; only the fields selected with 'fields' are present"""
+    id: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    version: Optional[str] = None
+    category: Optional[str] = None
+    layer: Optional[str] = None
+    strategy: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+
 class BlueprintParameter(BaseModel):
     """Model for blueprint parameters"""
     type: str
@@ -78,45 +112,352 @@ class GenerateFromBlueprintRequest(BaseModel):
     outputPath: str
 
 
+class GenerateProjectRequest(BaseModel):
+    """Model for generating several files that are written all or not at all"""
+    files: List[GenerateFromBlueprintRequest] = Field(..., min_length=1)
+
+
+# Listing helpers
+def _encode_cursor(blueprint_id: str) -> str:
+    """Encode the last returned blueprint ID as an opaque cursor"""
+    return base64.urlsafe_b64encode(blueprint_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    """Decode a cursor produced by _encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode("utf-8")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """Parse and validate a comma-separated field projection"""
+    if not fields:
+        return list(DEFAULT_SUMMARY_FIELDS)
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in SUMMARY_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available fields: {', '.join(SUMMARY_FIELDS)}"
+        )
+    return selected
+
+
+def _check_blueprint_document(blueprint_data: Any, blueprint_id: Optional[str] = None) -> str:
+    """
+    Check an uploaded blueprint document before it is written
+
+    Args:
+        blueprint_data: The parsed document
+        blueprint_id: ID implied by the file name, if any; the document's own
+            'id' is then optional but must agree with it
+
+    Returns:
+        The blueprint ID
+    """
+    if not isinstance(blueprint_data, dict):
+        raise HTTPException(status_code=400, detail="Blueprint must be a JSON object")
+
+    if blueprint_id is None:
+        if "id" not in blueprint_data:
+            raise HTTPException(status_code=400, detail="Blueprint must have an 'id' field")
+        blueprint_id = blueprint_data["id"]
+    elif blueprint_data.get("id", blueprint_id) != blueprint_id:
+        raise HTTPException(status_code=400, detail=f"Blueprint 'id' does not match its file name '{blueprint_id}.json'")
+
+    if not isinstance(blueprint_id, str) or not BLUEPRINT_ID_PATTERN.match(blueprint_id):
+        raise HTTPException(status_code=400, detail="Blueprint 'id' may only contain letters, digits, '.', '_' and '-'")
+
+    # Smart Blueprints must match the compiled model before they are committed
+    if "codeTemplate" in blueprint_data:
+        try:
+            BlueprintCreate.model_validate(blueprint_data)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    return blueprint_id
+
+
+def _check_archive_member(member: Tuple[str, bytes]) -> Tuple[str, Optional[str], Any]:
+    """Validate one archive member; runs in import worker processes, so errors are returned"""
+    name, content = member
+    try:
+        blueprint_data = json.loads(content)
+    except ValueError as e:
+        return name, None, f"Invalid JSON file: {str(e)}"
+
+    try:
+        return name, _check_blueprint_document(blueprint_data, posixpath.basename(name)[:-5]), None
+    except HTTPException as e:
+        return name, None, e.detail
+
+
+def _import_archive(path: str, overwrite: bool) -> Dict[str, Any]:
+    """Validate every blueprint in a spooled archive, then write them all at once"""
+    registry = get_blueprint_registry()
+    members, skipped = read_archive(path)
+    if not members:
+        raise HTTPException(status_code=400, detail="Archive contains no blueprint JSON files")
+
+    checked = validate_members(members, _check_archive_member)
+    errors = [{"member": name, "error": error} for name, _, error in checked if error is not None]
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Archive contains invalid blueprints", "errors": errors})
+
+    contents = dict(members)
+    records: List[Tuple[str, bytes, Optional[str]]] = []
+    created: List[str] = []
+    updated: List[str] = []
+    seen: Dict[str, str] = {}
+    for name, blueprint_id, _ in checked:
+        if blueprint_id in seen:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Blueprint '{blueprint_id}' appears twice in the archive: {seen[blueprint_id]} and {name}"
+            )
+        seen[blueprint_id] = name
+
+        # New blueprints keep their place in the archive; existing ones stay where they are
+        (updated if registry.store.exists(blueprint_id) else created).append(blueprint_id)
+        records.append((blueprint_id, contents[name], posixpath.dirname(name)))
+
+    if updated and not overwrite:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Blueprints already exist: {', '.join(updated)}. Use 'overwrite=true' to replace them."
+        )
+
+    registry.store.put_many(records)
+    registry.reload_all()
+
+    return {
+        "success": True,
+        "message": f"Imported {len(records)} blueprints",
+        "created": created,
+        "updated": updated,
+        "skipped": skipped
+    }
+
+
+def _save_blueprint(blueprint_id: str, content: bytes, category: Optional[str] = None) -> None:
+    """Write one blueprint and re-index it (blocking, run in the threadpool)"""
+    registry = get_blueprint_registry()
+    registry.store.put(blueprint_id, content, category)
+    registry.refresh(blueprint_id)
+
+
+def _delete_blueprint(blueprint_id: str) -> None:
+    """Remove one blueprint and drop it from the index (blocking, run in the threadpool)"""
+    registry = get_blueprint_registry()
+    registry.store.delete(blueprint_id)
+    registry.refresh(blueprint_id)
+
+
+def _restore_revision(blueprint_id: str, revision: int, category: Optional[str]) -> Tuple[bytes, Optional[int]]:
+    """Save an earlier revision as the current one; returns its content and the new revision number"""
+    history = get_blueprint_history()
+    content = history.materialize(blueprint_id, revision)
+    # A deleted blueprint goes back to the category it was stored in
+    _save_blueprint(blueprint_id, content, category)
+    return content, history.current_revision(blueprint_id)
+
+
 # Endpoints
-@router.get("/", response_model=List[BlueprintBase])
-async def get_all_blueprints():
-    """Get all available blueprints"""
-    return list_available_blueprints()
+@router.get("/", response_model=List[BlueprintSummary], response_model_exclude_unset=True)
+async def get_all_blueprints(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of blueprints to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=f"Comma-separated fields to return: {', '.join(SUMMARY_FIELDS)}"),
+    category: Optional[str] = Query(None, description="Category or parent category, e.g. 'api' or 'api/routes'"),
+    layer: Optional[str] = Query(None, description="Layer, e.g. 'middleware'"),
+    strategy: Optional[str] = Query(None, description="Strategy, e.g. 'embedded-template'"),
+    tag: Optional[str] = Query(None, description="Tag the blueprint must carry")
+):
+    """Get available blueprints from the metadata index, with filters, projection and pagination"""
+    selected_fields = _parse_fields(fields)
+    after = _decode_cursor(cursor) if cursor else None
+
+    # One snapshot for the hash and the page, so the ETag always matches the body
+    snapshot = get_blueprint_registry().snapshot()
+    index_hash = snapshot.index_hash()
+    summaries, last_id = snapshot.query(
+        category=category,
+        layer=layer,
+        strategy=strategy,
+        tag=tag,
+        after=after,
+        limit=limit
+    )
+
+    headers = {}
+    if last_id is not None:
+        next_cursor = _encode_cursor(last_id)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+
+    # Each distinct query over the same index state gets its own cache entry and ETag
+    query_key = "|".join([index_hash, ",".join(selected_fields), str(request.query_params)])
+    return cached_json_response(
+        request,
+        "index",
+        hashlib.sha256(query_key.encode("utf-8")).hexdigest(),
+        lambda: [{field: summary[field] for field in selected_fields} for summary in summaries],
+        headers
+    )
+
+
+@router.get("/search", response_model=Dict[str, Any])
+async def search_blueprint_index(
+    q: str = Query(..., min_length=1, description="Free-text query, typos allowed"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of results")
+):
+    """Search blueprints by name, description, parameters and template identifiers"""
+    started_at = time.perf_counter()
+    results = search_blueprints(q, limit)
+    return {
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started_at) * 1000, 3)
+    }
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_blueprints(
+    format: str = Query("tar.gz", pattern=r"^(tar\.gz|zip)$", description="Archive format: 'tar.gz' or 'zip'"),
+    category: Optional[str] = Query(None, description="Category or parent category, e.g. 'api' or 'api/routes'"),
+    layer: Optional[str] = Query(None, description="Layer, e.g. 'middleware'"),
+    strategy: Optional[str] = Query(None, description="Strategy, e.g. 'embedded-template'"),
+    tag: Optional[str] = Query(None, description="Tag the blueprint must carry")
+):
+    """
+    Download the blueprint library, or a filtered part of it, as one archive
+
+    Members are laid out as <category>/<id>.json, as in the blueprints
+    directory, so the archive can be passed straight to the import endpoint.
+    """
+    registry = get_blueprint_registry()
+    summaries, _ = registry.snapshot().query(category=category, layer=layer, strategy=strategy, tag=tag)
+    blueprint_ids = [summary["id"] for summary in summaries]
+
+    def entries():
+        # Read lazily so only one document at a time is held while streaming
+        for blueprint_id in blueprint_ids:
+            record = registry.store.get(blueprint_id)
+            if record is not None:  # Deleted since the listing was taken
+                yield posixpath.join(record.category, f"{blueprint_id}.json"), record.content, record.modified
+
+    media_type, extension = ARCHIVE_FORMATS[format]
+    return StreamingResponse(
+        iter_archive(entries(), format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="blueprints{extension}"',
+            # Already compressed: keep the GZip middleware from compressing it again
+            "Content-Encoding": "identity",
+            "X-Blueprint-Count": str(len(blueprint_ids))
+        }
+    )
+
+
+@router.post(
+    "/import",
+    response_model=Dict[str, Any],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"]
+                    }
+                },
+                "application/gzip": {"schema": {"type": "string", "format": "binary"}},
+                "application/zip": {"schema": {"type": "string", "format": "binary"}}
+            }
+        }
+    }
+)
+async def import_blueprints(
+    request: Request,
+    overwrite: bool = Query(False, description="Overwrite blueprints that already exist")
+):
+    """
+    Import a tar.gz or zip archive of blueprints, e.g. one made by the export endpoint
+
+    Every blueprint is validated before any is written; if one fails, nothing
+    changes. The files are then committed together and the registry is
+    rebuilt once. Send the archive as the 'file' field of a multipart form or
+    as the raw request body.
+    """
+    try:
+        with UploadSpool(tempfile.gettempdir(), MAX_IMPORT_ARCHIVE_BYTES, suffix=".archive") as spool:
+            await spool_request_body(request, spool)
+            spool.close()
+            return await run_in_threadpool(_import_archive, spool.path, overwrite)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error importing blueprints: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to import blueprints: {str(e)}")
+
+
+@router.get("/extract", response_model=Dict[str, Any])
+async def list_code_examples():
+    """List the prepared code examples with their size, lines and syntax status"""
+    extracts = get_blueprint_extracts()
+    get_blueprint_registry().ensure_built()
+    return {"extracts": extracts.list_extracts()}
 
 
 @router.get("/{blueprint_id}", response_model=Dict[str, Any])
-async def get_blueprint(blueprint_id: str = Path(..., description="The ID of the blueprint to get")):
+async def get_blueprint(
+    request: Request,
+    blueprint_id: str = Path(..., description="The ID of the blueprint to get")
+):
     """Get a specific blueprint by ID"""
-    blueprint = load_blueprint(blueprint_id)
+    # Body and hash come from the same snapshot, so a concurrent reload cannot
+    # cache one version's body under the other's hash
+    snapshot = get_blueprint_registry().snapshot()
+    blueprint = snapshot.get(blueprint_id)
     if not blueprint:
         raise HTTPException(status_code=404, detail=f"Blueprint with ID '{blueprint_id}' not found")
-    return blueprint
+
+    return cached_json_response(
+        request,
+        "blueprint",
+        snapshot.content_hash(blueprint_id),
+        lambda: blueprint
+    )
 
 
 @router.post("/", response_model=Dict[str, Any])
 async def create_blueprint(blueprint: BlueprintCreate):
     """Create a new blueprint"""
-    blueprints_dir = find_blueprints_dir()
-    blueprint_path = os.path.join(blueprints_dir, f"{blueprint.id}.json")
+    registry = get_blueprint_registry()
     
     # Check if blueprint already exists
-    if os.path.exists(blueprint_path):
+    if await run_in_threadpool(registry.store.exists, blueprint.id):
         raise HTTPException(status_code=409, detail=f"Blueprint with ID '{blueprint.id}' already exists")
     
     try:
-        # Convert to dict for JSON serialization
-        blueprint_dict = blueprint.dict(exclude_none=True)
+        # Serialize once and reuse the bytes for the response body
+        content = dumps_pretty(blueprint.model_dump(exclude_none=True))
         
-        # Write to file
-        with open(blueprint_path, "w", encoding="utf-8") as f:
-            json.dump(blueprint_dict, f, indent=2)
+        await run_in_threadpool(_save_blueprint, blueprint.id, content)
         
-        return {
-            "success": True,
-            "message": f"Blueprint '{blueprint.id}' created successfully",
-            "blueprint": blueprint_dict
-        }
+        return envelope_response(
+            {"success": True, "message": f"Blueprint '{blueprint.id}' created successfully"},
+            "blueprint",
+            content
+        )
     except Exception as e:
         logger.error(f"Error creating blueprint {blueprint.id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create blueprint: {str(e)}")
@@ -132,26 +473,23 @@ async def update_blueprint(
     if blueprint.id != blueprint_id:
         raise HTTPException(status_code=400, detail="Blueprint ID in path must match ID in body")
     
-    blueprints_dir = find_blueprints_dir()
-    blueprint_path = os.path.join(blueprints_dir, f"{blueprint_id}.json")
+    registry = get_blueprint_registry()
     
     # Check if blueprint exists
-    if not os.path.exists(blueprint_path):
+    if not await run_in_threadpool(registry.store.exists, blueprint_id):
         raise HTTPException(status_code=404, detail=f"Blueprint with ID '{blueprint_id}' not found")
     
     try:
-        # Convert to dict for JSON serialization
-        blueprint_dict = blueprint.dict(exclude_none=True)
+        # Serialize once and reuse the bytes for the response body
+        content = dumps_pretty(blueprint.model_dump(exclude_none=True))
         
-        # Write to file
-        with open(blueprint_path, "w", encoding="utf-8") as f:
-            json.dump(blueprint_dict, f, indent=2)
+        await run_in_threadpool(_save_blueprint, blueprint_id, content)
         
-        return {
-            "success": True,
-            "message": f"Blueprint '{blueprint_id}' updated successfully",
-            "blueprint": blueprint_dict
-        }
+        return envelope_response(
+            {"success": True, "message": f"Blueprint '{blueprint_id}' updated successfully"},
+            "blueprint",
+            content
+        )
     except Exception as e:
         logger.error(f"Error updating blueprint {blueprint_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to update blueprint: {str(e)}")
@@ -160,16 +498,14 @@ async def update_blueprint(
 @router.delete("/{blueprint_id}", response_model=Dict[str, Any])
 async def delete_blueprint(blueprint_id: str = Path(..., description="The ID of the blueprint to delete")):
     """Delete a blueprint"""
-    blueprints_dir = find_blueprints_dir()
-    blueprint_path = os.path.join(blueprints_dir, f"{blueprint_id}.json")
+    registry = get_blueprint_registry()
     
     # Check if blueprint exists
-    if not os.path.exists(blueprint_path):
+    if not await run_in_threadpool(registry.store.exists, blueprint_id):
         raise HTTPException(status_code=404, detail=f"Blueprint with ID '{blueprint_id}' not found")
     
     try:
-        # Delete the file
-        os.remove(blueprint_path)
+        await run_in_threadpool(_delete_blueprint, blueprint_id)
         
         return {
             "success": True,
@@ -183,7 +519,9 @@ async def delete_blueprint(blueprint_id: str = Path(..., description="The ID of
 @router.post("/generate", response_model=Dict[str, Any])
 async def generate_code_from_blueprint(request: GenerateFromBlueprintRequest):
     """Generate code from a blueprint"""
-    result = generate_from_blueprint(
+    # Waits for the output sink, so keep it off the event loop
+    result = await run_in_threadpool(
+        generate_from_blueprint,
         request.blueprintId,
         request.parameters,
         request.outputPath
@@ -195,49 +533,148 @@ async def generate_code_from_blueprint(request: GenerateFromBlueprintRequest):
     return result
 
 
-@router.post("/upload", response_model=Dict[str, Any])
+@router.post("/generate/project", response_model=Dict[str, Any])
+async def generate_project_from_blueprints(request: GenerateProjectRequest):
+    """Generate several files from blueprints; either all of them are written or none"""
+    result = await run_in_threadpool(generate_project, [spec.model_dump() for spec in request.files])
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    
+    return result
+
+
+@router.post("/generate/preview", response_model=Dict[str, Any])
+async def preview_project_from_blueprints(
+    request: Request,
+    body: GenerateProjectRequest,
+    content: bool = Query(True, description="Include the content of every file in the manifest")
+):
+    """
+    Dry run: render files from blueprints in memory and return their manifest
+
+    Nothing is written. The preview is kept under its previewId, so it can be
+    downloaded as an archive or committed later without rendering it again.
+    """
+    result = await run_in_threadpool(preview_project, [spec.model_dump() for spec in body.files])
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+    project = result["project"]
+    return cached_json_response(
+        request,
+        "preview" if content else "preview-summary",
+        result["previewId"],
+        lambda: {
+            "success": True,
+            "previewId": result["previewId"],
+            "root": project.root,
+            "files": project.manifest(include_content=content),
+            "size": project.size
+        }
+    )
+
+
+def _get_preview(preview_id: str) -> OutputProject:
+    project = get_preview_cache().get(preview_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail=f"Preview '{preview_id}' not found or expired; render it again")
+    return project
+
+
+@router.get("/generate/preview/{preview_id}/archive", response_class=StreamingResponse)
+async def download_preview(
+    preview_id: str = Path(..., description="previewId returned by the preview endpoint"),
+    format: str = Query("zip", pattern=r"^(tar\.gz|zip)$", description="Archive format: 'tar.gz' or 'zip'")
+):
+    """Download a rendered preview as an archive, laid out relative to its root"""
+    project = _get_preview(preview_id)
+    media_type, extension = ARCHIVE_FORMATS[format]
+    return StreamingResponse(
+        iter_archive(project.archive_entries(), format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="generated{extension}"',
+            # Already compressed: keep the GZip middleware from compressing it again
+            "Content-Encoding": "identity",
+            "X-Generated-Files": str(len(project))
+        }
+    )
+
+
+@router.post("/generate/preview/{preview_id}/commit", response_model=Dict[str, Any])
+async def commit_preview(preview_id: str = Path(..., description="previewId returned by the preview endpoint")):
+    """Write a rendered preview to disk, all files or none"""
+    result = await run_in_threadpool(commit_project, _get_preview(preview_id))
+    if not result["success"]:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
+@router.post(
+    "/upload",
+    response_model=Dict[str, Any],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"]
+                    }
+                },
+                "application/json": {"schema": {"type": "object"}}
+            }
+        }
+    }
+)
 async def upload_blueprint(
-    file: UploadFile = File(...),
+    request: Request,
     overwrite: bool = Query(False, description="Overwrite existing blueprint if it exists")
 ):
-    """Upload a blueprint JSON file"""
-    if not file.filename.endswith(".json"):
-        raise HTTPException(status_code=400, detail="File must be a JSON file")
+    """
+    Upload a blueprint JSON file
+
+    The document is streamed to a temporary file with a size cap and an
+    incremental JSON check, validated, then written to the blueprint store atomically.
+    Send it as the 'file' field of a multipart form or as the raw JSON body.
+    """
+    registry = get_blueprint_registry()
     
     try:
-        # Read file content
-        content = await file.read()
+        with BlueprintUploadSpool(tempfile.gettempdir()) as spool:
+            await spool_request_body(request, spool)
+            if spool.filename is not None and not spool.filename.endswith(".json"):
+                raise HTTPException(status_code=400, detail="File must be a JSON file")
+            content = await run_in_threadpool(spool.finish)
+            
+            # Parse JSON
+            try:
+                blueprint_data = json.loads(content)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail="Invalid JSON file")
+            
+            blueprint_id = _check_blueprint_document(blueprint_data)
+            
+            # Check if blueprint already exists
+            if not overwrite and await run_in_threadpool(registry.store.exists, blueprint_id):
+                raise HTTPException(
+                    status_code=409, 
+                    detail=f"Blueprint with ID '{blueprint_id}' already exists. Use 'overwrite=true' to replace it."
+                )
+            
+            # Store the validated document in one atomic write
+            await run_in_threadpool(_save_blueprint, blueprint_id, content)
         
-        # Parse JSON
-        try:
-            blueprint_data = json.loads(content)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid JSON file")
-        
-        # Check required fields
-        if "id" not in blueprint_data:
-            raise HTTPException(status_code=400, detail="Blueprint must have an 'id' field")
-        
-        blueprint_id = blueprint_data["id"]
-        blueprints_dir = find_blueprints_dir()
-        blueprint_path = os.path.join(blueprints_dir, f"{blueprint_id}.json")
-        
-        # Check if blueprint already exists
-        if os.path.exists(blueprint_path) and not overwrite:
-            raise HTTPException(
-                status_code=409, 
-                detail=f"Blueprint with ID '{blueprint_id}' already exists. Use 'overwrite=true' to replace it."
-            )
-        
-        # Write to file
-        with open(blueprint_path, "wb") as f:
-            f.write(content)
-        
-        return {
-            "success": True,
-            "message": f"Blueprint '{blueprint_id}' uploaded successfully",
-            "blueprint": blueprint_data
-        }
+        return envelope_response(
+            {"success": True, "message": f"Blueprint '{blueprint_id}' uploaded successfully"},
+            "blueprint",
+            content
+        )
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except HTTPException:
         raise
     except Exception as e:
@@ -246,18 +683,99 @@ async def upload_blueprint(
 
 
 @router.get("/extract/{blueprint_id}", response_model=Dict[str, Any])
-async def extract_code_example(blueprint_id: str = Path(..., description="The ID of the blueprint to extract code from")):
-    """Extract code example from Smart Blueprint embedded template"""
-    blueprint = load_blueprint(blueprint_id)
-    if not blueprint:
+async def extract_code_example(
+    request: Request,
+    blueprint_id: str = Path(..., description="The ID of the blueprint to extract code from")
+):
+    """
+    Get the rendered code example of a Smart Blueprint
+
+    Examples are rendered with sample parameters and syntax-checked when the
+    blueprint is indexed or saved, so this never renders anything.
+    """
+    extracts = get_blueprint_extracts()
+    if not get_blueprint_registry().contains(blueprint_id):
         raise HTTPException(status_code=404, detail=f"Blueprint with ID '{blueprint_id}' not found")
 
-    if "codeTemplate" not in blueprint:
+    extract = extracts.get(blueprint_id)
+    if extract is None:
         raise HTTPException(status_code=400, detail=f"Blueprint '{blueprint_id}' does not have an embedded code template")
 
-    return {
-        "success": True,
-        "blueprint_id": blueprint_id,
-        "code_template": blueprint["codeTemplate"],
-        "extracted_code": blueprint["codeTemplate"].get("content", "")
-    }
\ No newline at end of file
+    return cached_json_response(request, "extract", extract["sha256"], lambda: extract)
+
+
+@router.get("/{blueprint_id}/versions", response_model=Dict[str, Any])
+async def list_blueprint_versions(blueprint_id: str = Path(..., description="The ID of the blueprint")):
+    """
+    List the recorded revisions of a blueprint, oldest first
+
+    History starts with the first change made through the API; the version
+    that was on disk before it becomes revision 1.
+    """
+    versions = await run_in_threadpool(get_blueprint_history().list_versions, blueprint_id)
+    if not versions and not get_blueprint_registry().contains(blueprint_id):
+        raise HTTPException(status_code=404, detail=f"Blueprint with ID '{blueprint_id}' not found")
+
+    return {"blueprint_id": blueprint_id, "versions": versions}
+
+
+@router.get("/{blueprint_id}/versions/{revision}", response_model=Dict[str, Any])
+async def get_blueprint_version(
+    request: Request,
+    blueprint_id: str = Path(..., description="The ID of the blueprint"),
+    revision: int = Path(..., ge=1, description="Revision number from the versions listing")
+):
+    """Get a blueprint as it was at a given revision"""
+    history = get_blueprint_history()
+    version = await run_in_threadpool(history.get_version, blueprint_id, revision)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Blueprint '{blueprint_id}' has no revision {revision}")
+    if version["deleted"]:
+        raise HTTPException(status_code=410, detail=f"Revision {revision} of blueprint '{blueprint_id}' is a deletion")
+
+    # Same content hash, same cached body as the live blueprint; on a cache
+    # miss the deltas are replayed in the threadpool, not on the event loop
+    return await run_in_threadpool(
+        cached_json_response,
+        request,
+        "blueprint",
+        version["content_hash"],
+        lambda: json.loads(history.materialize(blueprint_id, revision))
+    )
+
+
+@router.post("/{blueprint_id}/versions/{revision}/rollback", response_model=Dict[str, Any])
+async def rollback_blueprint(
+    blueprint_id: str = Path(..., description="The ID of the blueprint"),
+    revision: int = Path(..., ge=1, description="Revision to restore")
+):
+    """
+    Restore a blueprint to an earlier revision
+
+    The restored content is saved as a new revision, so a rollback can itself
+    be rolled back. Deleted blueprints can be brought back this way too.
+    """
+    history = get_blueprint_history()
+    version = await run_in_threadpool(history.get_version, blueprint_id, revision)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Blueprint '{blueprint_id}' has no revision {revision}")
+    if version["deleted"]:
+        raise HTTPException(status_code=400, detail=f"Revision {revision} of blueprint '{blueprint_id}' is a deletion")
+
+    try:
+        content, current_revision = await run_in_threadpool(
+            _restore_revision, blueprint_id, revision, version["category"]
+        )
+
+        return envelope_response(
+            {
+                "success": True,
+                "message": f"Blueprint '{blueprint_id}' rolled back to revision {revision}",
+                "revision": current_revision
+            },
+            "blueprint",
+            content
+        )
+    except Exception as e:
+        logger.error(f"Error rolling back blueprint {blueprint_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to roll back blueprint: {str(e)}")
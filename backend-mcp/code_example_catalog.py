@@ -0,0 +1,210 @@
+"""
+Code Example Catalog for FastAPI MCP
+
+This module caches the listing of the code-examples directory and the
+contents of loaded examples. The listing is kept per directory and only the
+directories whose mtime changed are rescanned. Contents are stored once per
+SHA-256 in an LRU with a byte budget, so identical examples share memory.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.code-example-catalog")
+
+# Default budget for decoded example contents held in memory
+DEFAULT_CONTENT_CACHE_BYTES = int(os.getenv("MCP_CODE_EXAMPLE_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+
+class _DirectoryEntry:
+    """Cached listing of one directory"""
+
+    __slots__ = ("mtime_ns", "files", "subdirs")
+
+    def __init__(self, mtime_ns: int, files: List[Dict[str, Any]], subdirs: List[str]):
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.subdirs = subdirs
+
+
+class CodeExampleCatalog:
+    """Cached, mtime-invalidated view of the code-examples directory"""
+
+    def __init__(self, root: str, max_content_bytes: int = DEFAULT_CONTENT_CACHE_BYTES):
+        self.root = root
+        self.max_content_bytes = max_content_bytes
+        self._dirs: Dict[str, _DirectoryEntry] = {}
+        self._listing: Optional[List[Dict[str, Any]]] = None
+        # path -> (mtime_ns, size, content hash) as of the last read
+        self._file_hashes: Dict[str, Tuple[int, int, str]] = {}
+        # content hash -> (decoded content, encoded size), least recently used first
+        self._contents: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._content_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def list_examples(self) -> List[Dict[str, Any]]:
+        """
+        List every code example as path, name and type
+
+        Costs one stat per directory when nothing changed. The returned list
+        is shared with the cache and must not be mutated.
+        """
+        with self._lock:
+            changed = self._listing is None
+            if "" not in self._dirs:
+                changed = self._scan_directory("") or changed
+            else:
+                for relative_dir in list(self._dirs):
+                    entry = self._dirs.get(relative_dir)
+                    if entry is None:
+                        continue  # Dropped together with a removed parent
+                    try:
+                        mtime_ns = os.stat(self._full_path(relative_dir)).st_mtime_ns
+                    except FileNotFoundError:
+                        self._drop_directory(relative_dir)
+                        changed = True
+                        continue
+                    if mtime_ns != entry.mtime_ns:
+                        self._scan_directory(relative_dir)
+                        changed = True
+
+            if changed:
+                self._listing = sorted(
+                    (example for entry in self._dirs.values() for example in entry.files),
+                    key=lambda example: example["path"]
+                )
+            return self._listing
+
+    def load(self, relative_path: str) -> Optional[str]:
+        """
+        Load the content of a code example
+
+        Args:
+            relative_path: Path relative to the code-examples directory
+
+        Returns:
+            The decoded content, or None if the file is missing or outside the catalog
+        """
+        full_path = self._full_path(relative_path)
+        root = os.path.realpath(self.root)
+        if os.path.commonpath([root, os.path.realpath(full_path)]) != root:
+            logger.error(f"Code example path escapes the catalog: {relative_path}")
+            return None
+
+        try:
+            stat = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            logger.error(f"Code example not found: {full_path}")
+            return None
+
+        with self._lock:
+            known = self._file_hashes.get(relative_path)
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                cached = self._contents.get(known[2])
+                if cached is not None:
+                    self._contents.move_to_end(known[2])
+                    self.hits += 1
+                    return cached[0]
+            self.misses += 1
+
+        try:
+            with open(full_path, "rb") as f:
+                raw = f.read()
+            content = raw.decode("utf-8")
+        except Exception as e:
+            logger.error(f"Error loading code example {full_path}: {str(e)}")
+            return None
+
+        content_hash = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            self._file_hashes[relative_path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+            self._store_content(content_hash, content, len(raw))
+        return content
+
+    def content_hash(self, relative_path: str) -> Optional[str]:
+        """Get the SHA-256 of an example as of its last load"""
+        known = self._file_hashes.get(relative_path)
+        return known[2] if known else None
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters"""
+        return {
+            "directories": len(self._dirs),
+            "examples": len(self._listing or []),
+            "cached_contents": len(self._contents),
+            "cached_bytes": self._content_bytes,
+            "max_bytes": self.max_content_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _store_content(self, content_hash: str, content: str, size: int) -> None:
+        """Add decoded content to the LRU and evict down to the budget; caller holds the lock"""
+        if content_hash in self._contents:
+            self._contents.move_to_end(content_hash)
+            return
+        if size > self.max_content_bytes:
+            return
+
+        self._contents[content_hash] = (content, size)
+        self._content_bytes += size
+        while self._content_bytes > self.max_content_bytes:
+            _, (_, evicted_size) = self._contents.popitem(last=False)
+            self._content_bytes -= evicted_size
+
+    def _full_path(self, relative_path: str) -> str:
+        return os.path.join(self.root, relative_path) if relative_path else self.root
+
+    def _scan_directory(self, relative_dir: str) -> bool:
+        """(Re)scan one directory and any new subdirectories; caller holds the lock"""
+        full_dir = self._full_path(relative_dir)
+        try:
+            mtime_ns = os.stat(full_dir).st_mtime_ns
+            entries = list(os.scandir(full_dir))
+        except (FileNotFoundError, NotADirectoryError):
+            return self._drop_directory(relative_dir)
+
+        files: List[Dict[str, Any]] = []
+        subdirs: List[str] = []
+        for entry in entries:
+            relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(relative_path)
+                elif entry.is_file():
+                    files.append({
+                        "path": relative_path,
+                        "name": entry.name,
+                        "type": os.path.splitext(entry.name)[1][1:]  # File extension without dot
+                    })
+            except OSError as e:
+                logger.error(f"Error listing code example {entry.name}: {str(e)}")
+
+        previous = self._dirs.get(relative_dir)
+        self._dirs[relative_dir] = _DirectoryEntry(mtime_ns, files, subdirs)
+
+        if previous is not None:
+            for removed in set(previous.subdirs) - set(subdirs):
+                self._drop_directory(removed)
+        for subdir in subdirs:
+            if subdir not in self._dirs:
+                self._scan_directory(subdir)
+        return True
+
+    def _drop_directory(self, relative_dir: str) -> bool:
+        """Forget a directory and everything below it; caller holds the lock"""
+        entry = self._dirs.pop(relative_dir, None)
+        if entry is None:
+            return False
+        for example in entry.files:
+            self._file_hashes.pop(example["path"], None)
+        for subdir in entry.subdirs:
+            self._drop_directory(subdir)
+        return True
@@ -0,0 +1,486 @@
+"""
+Generation Output for FastAPI MCP
+
+This module writes generated files behind the request path. A render adds
+its files to an OutputProject and hands the project to the shared
+OutputSink, whose writer thread commits queued projects in batches, so the
+files of many concurrent renders share one pass of syncs.
+
+Every project is all-or-nothing: its files are staged next to their
+targets and only renamed into place once all of them were written (and
+synced, depending on the durability policy). Files it replaces are kept as
+backups until every rename succeeded, so a failed project leaves no file
+behind, restores the ones it had already replaced, and does not affect the
+other projects in its batch.
+
+A project is also an in-memory filesystem: a dry run renders into one and
+returns its manifest instead of writing it. Rendered projects are kept in a
+byte-bounded PreviewCache, so a preview can later be streamed as an
+archive or committed through the sink without rendering it again.
+
+Durability policies (MCP_OUTPUT_DURABILITY):
+    none:  no fsync; fastest, recent files can be lost on a power failure
+    file:  fsync every file as soon as it is staged
+    batch: stage the whole batch, then fsync it in one pass before any
+           rename (default)
+"""
+
+import os
+import time
+import queue
+import hashlib
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Configure logging
+logger = logging.getLogger("mcp-fastapi.generation-output")
+
+DURABILITY_NONE = "none"
+DURABILITY_FILE = "file"
+DURABILITY_BATCH = "batch"
+DURABILITY_POLICIES = (DURABILITY_NONE, DURABILITY_FILE, DURABILITY_BATCH)
+
+# Durability of generated files
+OUTPUT_DURABILITY = os.getenv("MCP_OUTPUT_DURABILITY", DURABILITY_BATCH)
+
+# Most files committed in one batch; a larger project is still committed whole
+OUTPUT_BATCH_MAX_FILES = int(os.getenv("MCP_OUTPUT_BATCH_MAX_FILES", "512"))
+
+# How long the writer waits for more projects before committing a batch
+OUTPUT_BATCH_LINGER_SECONDS = float(os.getenv("MCP_OUTPUT_BATCH_LINGER_MS", "2")) / 1000
+
+# Bytes of rendered previews kept for later archive downloads and commits
+PREVIEW_CACHE_BYTES = int(os.getenv("MCP_PREVIEW_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+# Staged files kept open for the batch fsync; beyond this they are synced as they are written
+MAX_OPEN_STAGED_FILES = 256
+
+_STAGE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0)
+_temp_names = itertools.count()
+
+
+class OutputProject:
+    """Generated files that are written together or not at all"""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        # Absolute target path -> content, in the order the files were added
+        self.files: Dict[str, bytes] = {}
+        self.created = time.time()
+
+    def __repr__(self) -> str:
+        return f"OutputProject({self.name!r}, {len(self.files)} files)"
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    @property
+    def size(self) -> int:
+        """Total bytes of all files"""
+        return sum(len(content) for content in self.files.values())
+
+    def add(self, path: str, content: Union[str, bytes]) -> str:
+        """
+        Add a file; adding the same path again replaces its content
+
+        Returns:
+            The absolute target path
+        """
+        target_path = os.path.abspath(path)
+        self.files[target_path] = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        return target_path
+
+    @property
+    def root(self) -> str:
+        """Deepest directory that contains every file"""
+        if not self.files:
+            return ""
+        return os.path.commonpath([os.path.dirname(path) for path in self.files])
+
+    def digest(self) -> str:
+        """Hash of every path and content, e.g. for ETags"""
+        digest = hashlib.sha256()
+        for path in sorted(self.files):
+            digest.update(path.encode("utf-8", "surrogateescape") + b"\0")
+            digest.update(hashlib.sha256(self.files[path]).digest())
+        return digest.hexdigest()
+
+    def manifest(self, include_content: bool = True) -> List[Dict[str, Any]]:
+        """
+        Describe every file of the project
+
+        Returns:
+            path, path relative to the project root, size and sha256 of each
+            file, plus the content decoded as UTF-8 if include_content is set
+        """
+        root = self.root
+        entries = []
+        for path, content in self.files.items():
+            entry = {
+                "path": path,
+                "relativePath": os.path.relpath(path, root).replace(os.sep, "/"),
+                "size": len(content),
+                "sha256": hashlib.sha256(content).hexdigest()
+            }
+            if include_content:
+                entry["content"] = content.decode("utf-8", "replace")
+            entries.append(entry)
+        return entries
+
+    def archive_entries(self) -> Iterator[Tuple[str, bytes, float]]:
+        """Files as (name relative to the root, content, mtime) for blueprint_archive.iter_archive"""
+        root = self.root
+        for path, content in self.files.items():
+            # The stored bytes are handed over as they are, without a copy
+            yield os.path.relpath(path, root).replace(os.sep, "/"), content, self.created
+
+
+class PreviewCache:
+    """LRU of rendered projects with a byte budget"""
+
+    def __init__(self, max_bytes: int = PREVIEW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, OutputProject]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[OutputProject]:
+        """Get a cached project; shared, must not be modified"""
+        with self._lock:
+            project = self._entries.get(key)
+            if project is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return project
+
+    def put(self, key: str, project: OutputProject) -> None:
+        """Store a project, evicting the least recently used ones past the budget"""
+        size = project.size
+        with self._lock:
+            if key in self._entries or size > self.max_bytes:
+                return
+            self._entries[key] = project
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+class _StagedProject:
+    """A queued project and the temporary files it was staged to"""
+
+    __slots__ = ("project", "future", "staged")
+
+    def __init__(self, project: OutputProject, future: Future):
+        self.project = project
+        self.future = future
+        # (temporary path, target path, descriptor kept open for the batch fsync or None)
+        self.staged: List[Tuple[str, str, Optional[int]]] = []
+
+    def sync(self) -> None:
+        """Fsync and close the descriptors kept open for the batch fsync"""
+        for index, (temp_path, target_path, fd) in enumerate(self.staged):
+            if fd is not None:
+                os.fsync(fd)
+                os.close(fd)
+                self.staged[index] = (temp_path, target_path, None)
+
+    def commit(self) -> List[str]:
+        """
+        Rename every staged file into place, or none of them
+
+        Existing targets are hard-linked to backups first (moved aside where
+        links are not supported); if a rename fails, the files renamed so far
+        are removed or restored from their backups and the error is raised.
+
+        Returns:
+            Directories that received files
+        """
+        replaced: List[Tuple[str, Optional[str]]] = []
+        try:
+            for temp_path, target_path, _ in self.staged:
+                replaced.append((target_path, _backup(target_path)))
+                os.replace(temp_path, target_path)
+        except OSError:
+            for target_path, backup_path in reversed(replaced):
+                try:
+                    if backup_path is not None:
+                        os.replace(backup_path, target_path)
+                        # A rename between two links to the same file does nothing
+                        if os.path.lexists(backup_path):
+                            os.remove(backup_path)
+                    else:
+                        os.remove(target_path)
+                except OSError as e:
+                    logger.error(f"Failed to restore {target_path}: {str(e)}")
+            self.discard()
+            raise
+
+        for _, backup_path in replaced:
+            if backup_path is not None:
+                try:
+                    os.remove(backup_path)
+                except OSError:
+                    pass
+        self.staged = []
+        return sorted({os.path.dirname(target_path) for target_path, _ in replaced})
+
+    def discard(self) -> None:
+        for temp_path, _, fd in self.staged:
+            if fd is not None:
+                os.close(fd)
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+        self.staged = []
+
+
+class OutputSink:
+    """Write-behind writer that commits generated projects in batches"""
+
+    def __init__(
+        self,
+        durability: str = OUTPUT_DURABILITY,
+        max_batch_files: int = OUTPUT_BATCH_MAX_FILES,
+        linger_seconds: float = OUTPUT_BATCH_LINGER_SECONDS
+    ):
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(
+                f"Unknown output durability '{durability}', expected one of: {', '.join(DURABILITY_POLICIES)}"
+            )
+        self.durability = durability
+        self.max_batch_files = max(1, max_batch_files)
+        self.linger_seconds = max(0.0, linger_seconds)
+        self.batches = 0
+        self.projects = 0
+        self.files = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_StagedProject]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"OutputSink(durability={self.durability!r})"
+
+    def submit(self, project: OutputProject) -> Future:
+        """
+        Queue a project for writing
+
+        Returns:
+            Future that resolves to the number of files written once the
+            project is committed (and synced per the durability policy), or
+            fails with the error that kept it from being written
+        """
+        future: Future = Future()
+        if not project.files:
+            future.set_result(0)
+            return future
+        self._ensure_writer()
+        self._queue.put(_StagedProject(project, future))
+        return future
+
+    def write(self, project: OutputProject, timeout: Optional[float] = None) -> int:
+        """Queue a project and wait until it is committed"""
+        return self.submit(project).result(timeout)
+
+    def close(self) -> None:
+        """Commit everything queued so far and stop the writer"""
+        with self._lock:
+            thread = self._thread if self._pid == os.getpid() else None
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of committed batches, projects and files"""
+        return {
+            "durability": self.durability,
+            "batches": self.batches,
+            "projects": self.projects,
+            "files": self.files
+        }
+
+    def _ensure_writer(self) -> None:
+        # The writer thread does not survive a fork (e.g. gunicorn preload)
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name="mcp-output-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        work = self._queue
+        stopping = False
+        while not stopping:
+            item = work.get()
+            if item is None:
+                break
+
+            batch = [item]
+            files = len(item.project)
+            while files < self.max_batch_files:
+                try:
+                    item = work.get(timeout=self.linger_seconds) if self.linger_seconds else work.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                files += len(item.project)
+
+            try:
+                self._commit_batch(batch)
+            except Exception as e:  # pragma: no cover - _commit_batch settles every future itself
+                logger.error(f"Output batch failed: {str(e)}")
+                for entry in batch:
+                    if not entry.future.done():
+                        entry.future.set_exception(e)
+
+    def _commit_batch(self, batch: List[_StagedProject]) -> None:
+        """Stage, sync and rename the files of every project in the batch"""
+        self.batches += 1
+        open_budget = MAX_OPEN_STAGED_FILES if self.durability == DURABILITY_BATCH else 0
+        ready: List[_StagedProject] = []
+        for entry in batch:
+            if not entry.future.set_running_or_notify_cancel():
+                continue
+            try:
+                open_budget = self._stage(entry, self.durability != DURABILITY_NONE, open_budget)
+            except Exception as e:
+                entry.discard()
+                entry.future.set_exception(e)
+                continue
+            ready.append(entry)
+
+        if self.durability == DURABILITY_BATCH:
+            synced: List[_StagedProject] = []
+            for entry in ready:
+                try:
+                    entry.sync()
+                except OSError as e:
+                    entry.discard()
+                    entry.future.set_exception(e)
+                    continue
+                synced.append(entry)
+            ready = synced
+
+        directories = set()
+        committed: List[_StagedProject] = []
+        for entry in ready:
+            try:
+                directories.update(entry.commit())
+            except OSError as e:
+                logger.error(f"Failed to commit generated files of {entry.project!r}: {str(e)}")
+                entry.future.set_exception(e)
+                continue
+            committed.append(entry)
+
+        # Persist the renames themselves, once per directory per batch
+        if self.durability != DURABILITY_NONE:
+            for directory in directories:
+                try:
+                    _fsync_path(directory, os.O_RDONLY)
+                except OSError:
+                    pass
+
+        for entry in committed:
+            self.projects += 1
+            self.files += len(entry.project)
+            entry.future.set_result(len(entry.project))
+
+    @staticmethod
+    def _stage(entry: _StagedProject, durable: bool, open_budget: int) -> int:
+        """
+        Write every file of a project to a temporary file next to its target
+
+        Up to open_budget files are left open for the batch fsync; the others
+        are synced right away if the policy is durable.
+
+        Returns:
+            The open budget left
+        """
+        created = set()
+        for target_path, content in entry.project.files.items():
+            directory = os.path.dirname(target_path)
+            if directory not in created:
+                os.makedirs(directory, exist_ok=True)
+                created.add(directory)
+            while True:
+                temp_path = os.path.join(directory, f".generate-{os.getpid()}-{next(_temp_names)}.tmp")
+                try:
+                    fd = os.open(temp_path, _STAGE_FLAGS, 0o666)  # Mode is subject to the umask
+                    break
+                except FileExistsError:
+                    continue  # Left behind by an earlier process with the same PID
+
+            keep_open = open_budget > 0
+            entry.staged.append((temp_path, target_path, fd if keep_open else None))
+            try:
+                _write_all(fd, content)
+                if durable and not keep_open:
+                    os.fsync(fd)
+            finally:
+                if not keep_open:
+                    os.close(fd)
+            if keep_open:
+                open_budget -= 1
+        return open_budget
+
+
+def _backup(path: str) -> Optional[str]:
+    """Keep the current file at path under a backup name; None if there is none"""
+    directory = os.path.dirname(path)
+    while True:
+        backup_path = os.path.join(directory, f".generate-{os.getpid()}-{next(_temp_names)}.bak")
+        try:
+            os.link(path, backup_path)
+            return backup_path
+        except FileNotFoundError:
+            return None
+        except FileExistsError:
+            continue  # Left behind by an earlier process with the same PID
+        except OSError:
+            if not os.path.isfile(path):
+                return None  # Directories and the like make the rename itself fail
+            # No hard links here: move the file aside until the rename succeeds
+            try:
+                os.replace(path, backup_path)
+            except FileNotFoundError:
+                return None
+            return backup_path
+
+
+def _write_all(fd: int, content: bytes) -> None:
+    view = memoryview(content)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _fsync_path(path: str, flags: int) -> None:
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
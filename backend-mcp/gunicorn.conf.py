@@ -0,0 +1,63 @@
+"""
+Gunicorn configuration for running the FastAPI MCP server in production
+
+Usage (from the repository root):
+    gunicorn -c backend-mcp/gunicorn.conf.py
+
+The app is imported and the blueprint index is built once in the master
+process, then shared with every uvicorn worker through copy-on-write after
+fork. Workers tell each other about blueprint writes through a change feed
+file so their caches never serve stale blueprints.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_changes import CHANGE_FEED_ENV  # noqa: E402
+
+# Server socket and workers
+bind = os.getenv("MCP_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("MCP_WORKERS", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+wsgi_app = "main:app"
+chdir = str(BACKEND_DIR)
+
+# Load the app in the master so the parsed index is shared by all workers
+preload_app = True
+
+# Logging
+loglevel = os.getenv("MCP_LOG_LEVEL", "info").lower()
+accesslog = "-"
+
+# A fresh change feed for this master; it must be set before the app is
+# preloaded, which happens before any server hook runs
+_change_feed_path = os.path.join(tempfile.gettempdir(), f"mcp-blueprint-changes-{os.getpid()}.log")
+open(_change_feed_path, "w").close()
+os.environ[CHANGE_FEED_ENV] = _change_feed_path
+
+
+def when_ready(server):
+    """Build the blueprint index in the master before any worker is forked"""
+    import main
+
+    count = main.bootstrap(main.app)
+
+    # Move everything allocated so far out of the GC's reach so collections in
+    # the workers do not touch, and therefore copy, the shared pages
+    gc.freeze()
+    server.log.info(f"Pre-fork blueprint index ready ({count} blueprints)")
+
+
+def on_exit(server):
+    """Remove the change feed and its lock file"""
+    for path in (_change_feed_path, _change_feed_path + ".lock"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
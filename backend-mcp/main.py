@@ -1,18 +1,28 @@
-from fastapi import FastAPI, HTTPException, Body, Depends, Request
+import time
+
+# Process start reference for the import-to-ready measurement
+IMPORT_STARTED_AT = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from contextlib import asynccontextmanager
 from pathlib import Path
+import importlib
 import os
 import logging
-import json
-from typing import Dict, List, Any, Optional
-import uvicorn
-
-# Import routers
-from blueprints_router import router as blueprints_router
-from code_examples_router import router as code_examples_router
+from typing import List, Tuple
+
+from template_engine import (
+    ensure_directories,
+    find_static_dir,
+    find_templates_dir,
+    get_blueprint_extracts,
+    get_blueprint_registry,
+    get_blueprint_search_index
+)
+from blueprint_responses import COMPRESSION_MIN_SIZE
 
 # Configure logging
 logging.basicConfig(
@@ -21,12 +31,100 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp-fastapi")
 
+# Project root
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Environment settings
+MCP_ENVIRONMENT = os.getenv("MCP_ENVIRONMENT", "development")
+MCP_LOG_LEVEL = os.getenv("MCP_LOG_LEVEL", "INFO")
+
+# Routers included at startup as (module name, required)
+ROUTERS: List[Tuple[str, bool]] = [
+    ("blueprints_router", True),
+    ("code_examples_router", False),
+]
+
+# Template used by the dashboard, compiled during startup
+DASHBOARD_TEMPLATE = "dashboard.html"
+
+
+def include_routers(app: FastAPI) -> None:
+    """Import and include routers, skipping optional ones that are not installed"""
+    included = app.state.included_routers
+    for module_name, required in ROUTERS:
+        if module_name in included:
+            continue
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if required or e.name != module_name:
+                raise
+            logger.warning(f"Optional router '{module_name}' not found, skipping")
+            continue
+        app.include_router(module.router)
+        included.append(module_name)
+
+
+def mount_static_and_templates(app: FastAPI) -> None:
+    """Mount static files and compile the dashboard template"""
+    from fastapi.staticfiles import StaticFiles
+    from fastapi.templating import Jinja2Templates
+
+    if app.state.templates is None:
+        app.mount("/static", StaticFiles(directory=find_static_dir()), name="static")
+        app.state.templates = Jinja2Templates(directory=find_templates_dir())
+
+    # Warm the Jinja2 cache so the first dashboard request does not compile
+    app.state.templates.get_template(DASHBOARD_TEMPLATE)
+
+
+def bootstrap(app: FastAPI) -> int:
+    """
+    Bootstrap directories, routers, templates, the blueprint index, search index and extracts
+
+    Safe to call more than once: under gunicorn with preload_app the master
+    runs it before fork and each worker's lifespan finds everything ready.
+
+    Returns:
+        Number of indexed blueprints
+    """
+    ensure_directories()
+    include_routers(app)
+    mount_static_and_templates(app)
+    registry = get_blueprint_registry()
+    get_blueprint_search_index()
+    get_blueprint_extracts()
+    registry.ensure_built()
+    return len(registry.list_metadata())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the bootstrap and record how long the app took to become ready"""
+    started_at = time.perf_counter()
+    blueprint_count = bootstrap(app)
+
+    ready_at = time.perf_counter()
+    app.state.startup_ms = round((ready_at - started_at) * 1000, 2)
+    app.state.import_to_ready_ms = round((ready_at - IMPORT_STARTED_AT) * 1000, 2)
+    logger.info(
+        f"Startup complete in {app.state.startup_ms}ms "
+        f"({blueprint_count} blueprints, import-to-ready {app.state.import_to_ready_ms}ms)"
+    )
+    yield
+
+
 # Create FastAPI app
 app = FastAPI(
     title="FastAPI MCP Server",
     description="Model Context Protocol server for backend development",
     version="1.0.0",
+    lifespan=lifespan,
 )
+app.state.included_routers = []
+app.state.templates = None
+app.state.startup_ms = None
+app.state.import_to_ready_ms = None
 
 # Add CORS middleware
 app.add_middleware(
@@ -37,46 +135,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create template engine
-templates = Jinja2Templates(directory="backend-mcp/templates")
-
-# Project root
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-# Mount static files
-app.mount("/static", StaticFiles(directory=f"{BASE_DIR}/backend-mcp/static"), name="static")
-
-# Environment settings
-MCP_ENVIRONMENT = os.getenv("MCP_ENVIRONMENT", "development")
-MCP_LOG_LEVEL = os.getenv("MCP_LOG_LEVEL", "INFO")
-
-# Data directories
-BLUEPRINTS_DIR = f"{BASE_DIR}/backend-mcp/blueprints"
-CODE_EXAMPLES_DIR = f"{BASE_DIR}/backend-mcp/code-examples"
-TEMPLATES_DIR = f"{BASE_DIR}/backend-mcp/templates"
-
-# Ensure directories exist
-os.makedirs(BLUEPRINTS_DIR, exist_ok=True)
-os.makedirs(CODE_EXAMPLES_DIR, exist_ok=True)
-os.makedirs(TEMPLATES_DIR, exist_ok=True)
-os.makedirs(f"{BASE_DIR}/backend-mcp/static", exist_ok=True)
-
-# Include routers
-app.include_router(blueprints_router)
-app.include_router(code_examples_router)
+# Compress other large responses; blueprint reads arrive pre-compressed from the body cache
+app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "environment": MCP_ENVIRONMENT}
+    return {
+        "status": "healthy",
+        "environment": MCP_ENVIRONMENT,
+        "startup_ms": app.state.startup_ms,
+        "import_to_ready_ms": app.state.import_to_ready_ms
+    }
 
 # Root endpoint
 @app.get("/")
 async def root(request: Request):
     """Root endpoint - returns dashboard template"""
-    return templates.TemplateResponse(
-        "dashboard.html", 
+    return app.state.templates.TemplateResponse(
+        DASHBOARD_TEMPLATE,
         {"request": request, "title": "FastAPI MCP Server"}
     )
 
@@ -99,4 +177,6 @@ async def server_error_handler(request: Request, exc: Exception):
     )
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    import uvicorn
+
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
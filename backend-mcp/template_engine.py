@@ -7,70 +7,173 @@ from templates using variable substitution.
 
 import os
 import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+from blueprint_changes import BlueprintChangeFeed
+from blueprint_extracts import BlueprintExtractCache
+from blueprint_registry import BlueprintRegistry
+from blueprint_search import BlueprintSearchIndex
+from blueprint_store import open_blueprint_store
+from blueprint_versions import BlueprintHistory, VersionedBlueprintStore, open_blueprint_history
+from code_example_catalog import CodeExampleCatalog
+from generation_output import OutputProject, OutputSink, PreviewCache
+
 # Configure logging
 logger = logging.getLogger("mcp-fastapi.template-engine")
 
 # Get the project root directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Shared blueprint index, history, search index and extracts, created on first use
+_blueprint_registry: Optional[BlueprintRegistry] = None
+_blueprint_history: Optional[BlueprintHistory] = None
+_blueprint_search_index: Optional[BlueprintSearchIndex] = None
+_blueprint_extracts: Optional[BlueprintExtractCache] = None
+
+# Shared code example catalog, created on first use
+_code_example_catalog: Optional[CodeExampleCatalog] = None
+
+# Shared write-behind sink and preview cache for generated files, created on first use
+_output_sink: Optional[OutputSink] = None
+_preview_cache: Optional[PreviewCache] = None
+
 
 def find_blueprints_dir() -> str:
     """Find the blueprints directory"""
-    blueprints_dir = os.path.join(BASE_DIR, "backend-mcp", "blueprints")
-    os.makedirs(blueprints_dir, exist_ok=True)
-    return blueprints_dir
+    return os.path.join(BASE_DIR, "backend-mcp", "blueprints")
 
 
 def find_code_examples_dir() -> str:
     """Find the code examples directory"""
-    code_examples_dir = os.path.join(BASE_DIR, "backend-mcp", "code-examples")
-    os.makedirs(code_examples_dir, exist_ok=True)
-    return code_examples_dir
+    return os.path.join(BASE_DIR, "backend-mcp", "code-examples")
 
 
 def find_templates_dir() -> str:
     """Find the templates directory"""
-    templates_dir = os.path.join(BASE_DIR, "backend-mcp", "templates")
-    os.makedirs(templates_dir, exist_ok=True)
-    return templates_dir
+    return os.path.join(BASE_DIR, "backend-mcp", "templates")
+
+
+def find_static_dir() -> str:
+    """Find the static files directory"""
+    return os.path.join(BASE_DIR, "backend-mcp", "static")
+
+
+def ensure_directories() -> None:
+    """Create the data directories if they do not exist yet"""
+    for directory in (find_blueprints_dir(), find_code_examples_dir(), find_templates_dir(), find_static_dir()):
+        os.makedirs(directory, exist_ok=True)
+
+
+def get_blueprint_registry() -> BlueprintRegistry:
+    """Get the shared blueprint registry, whose store records every write in the history"""
+    global _blueprint_registry, _blueprint_history
+    if _blueprint_registry is None:
+        store = open_blueprint_store(find_blueprints_dir())
+        _blueprint_history = open_blueprint_history(find_blueprints_dir(), store)
+        _blueprint_registry = BlueprintRegistry(
+            VersionedBlueprintStore(store, _blueprint_history),
+            BlueprintChangeFeed.from_env()
+        )
+    return _blueprint_registry
+
+
+def get_blueprint_history() -> BlueprintHistory:
+    """Get the shared blueprint revision history"""
+    get_blueprint_registry()
+    return _blueprint_history
+
+
+def get_blueprint_search_index() -> BlueprintSearchIndex:
+    """Get the shared search index, kept in sync with the blueprint registry"""
+    global _blueprint_search_index
+    if _blueprint_search_index is None:
+        _blueprint_search_index = BlueprintSearchIndex()
+        get_blueprint_registry().add_listener(_blueprint_search_index)
+    return _blueprint_search_index
+
+
+def get_blueprint_extracts() -> BlueprintExtractCache:
+    """Get the shared rendered examples, kept in sync with the blueprint registry"""
+    global _blueprint_extracts
+    if _blueprint_extracts is None:
+        _blueprint_extracts = BlueprintExtractCache()
+        get_blueprint_registry().add_listener(_blueprint_extracts)
+    return _blueprint_extracts
+
+
+def get_code_example_catalog() -> CodeExampleCatalog:
+    """Get the shared code example catalog"""
+    global _code_example_catalog
+    if _code_example_catalog is None:
+        _code_example_catalog = CodeExampleCatalog(find_code_examples_dir())
+    return _code_example_catalog
+
+
+def get_output_sink() -> OutputSink:
+    """Get the shared sink that writes generated files"""
+    global _output_sink
+    if _output_sink is None:
+        _output_sink = OutputSink()
+    return _output_sink
+
+
+def get_preview_cache() -> PreviewCache:
+    """Get the shared cache of rendered previews"""
+    global _preview_cache
+    if _preview_cache is None:
+        _preview_cache = PreviewCache()
+    return _preview_cache
+
+
+def write_output(output_path: str, content: str, output: Optional[OutputProject]) -> None:
+    """Add a generated file to a project, or write it on its own through the sink"""
+    if output is not None:
+        output.add(output_path, content)
+        return
+    project = OutputProject(output_path)
+    project.add(output_path, content)
+    get_output_sink().write(project)
+
+
+def search_blueprints(query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Search blueprints by name, description, parameters and template identifiers
+    
+    Args:
+        query: Free-text query
+        limit: Maximum number of results
+        
+    Returns:
+        List of matches ordered by relevance
+    """
+    search_index = get_blueprint_search_index()
+    get_blueprint_registry().ensure_built()
+    return search_index.search(query, limit)
 
 
 def load_blueprint(blueprint_id: str) -> Optional[Dict[str, Any]]:
     """
-    Load a blueprint JSON file by ID
+    Load a blueprint by ID from the blueprint registry
     
     Args:
         blueprint_id: The ID of the blueprint to load
         
     Returns:
-        Dictionary containing the blueprint data or None if not found
+        Dictionary containing the blueprint data or None if not found.
+        The dictionary is shared with the registry cache and must not be mutated.
     """
-    blueprints_dir = find_blueprints_dir()
-    blueprint_path = os.path.join(blueprints_dir, f"{blueprint_id}.json")
-    
-    if not os.path.exists(blueprint_path):
-        logger.error(f"Blueprint not found: {blueprint_path}")
-        return None
-    
-    try:
-        with open(blueprint_path, "r", encoding="utf-8") as f:
-            blueprint = json.load(f)
-        return blueprint
-    except json.JSONDecodeError:
-        logger.error(f"Failed to parse blueprint JSON: {blueprint_path}")
-        return None
-    except Exception as e:
-        logger.error(f"Error loading blueprint {blueprint_path}: {str(e)}")
-        return None
+    blueprint = get_blueprint_registry().get(blueprint_id)
+    if blueprint is None:
+        logger.error(f"Blueprint not found: {blueprint_id}")
+    return blueprint
 
 
 def load_code_example(code_example_path: str) -> Optional[str]:
     """
-    Load a code example file
+    Load a code example file through the cached catalog
     
     Args:
         code_example_path: Path to the code example file, relative to code_examples_dir
@@ -78,23 +181,15 @@ def load_code_example(code_example_path: str) -> Optional[str]:
     Returns:
         String containing the code example content or None if not found
     """
-    code_examples_dir = find_code_examples_dir()
-    full_path = os.path.join(code_examples_dir, code_example_path)
-    
-    if not os.path.exists(full_path):
-        logger.error(f"Code example not found: {full_path}")
-        return None
-    
-    try:
-        with open(full_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logger.error(f"Error loading code example {full_path}: {str(e)}")
-        return None
+    return get_code_example_catalog().load(code_example_path)
 
 
-def generate_from_template(template_path: str, parameters: Dict[str, Any], output_path: str) -> Dict[str, Any]:
+def generate_from_template(
+    template_path: str,
+    parameters: Dict[str, Any],
+    output_path: str,
+    output: Optional[OutputProject] = None
+) -> Dict[str, Any]:
     """
     Generate a file from a template by substituting parameters
     
@@ -102,6 +197,7 @@ def generate_from_template(template_path: str, parameters: Dict[str, Any], outpu
         template_path: Path to the template file
         parameters: Dictionary of parameters to substitute in the template
         output_path: Path where the generated file should be saved
+        output: Project to add the file to instead of writing it right away
         
     Returns:
         Dictionary with success status and additional information
@@ -122,12 +218,8 @@ def generate_from_template(template_path: str, parameters: Dict[str, Any], outpu
         str_params = {k: str(v) for k, v in parameters.items()}
         output_content = template_content.format(**str_params)
         
-        # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-        
         # Write to output file
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(output_content)
+        write_output(output_path, output_content, output)
         
         return {
             "success": True,
@@ -147,7 +239,12 @@ def generate_from_template(template_path: str, parameters: Dict[str, Any], outpu
         }
 
 
-def generate_from_blueprint(blueprint_id: str, parameters: Dict[str, Any], output_path: str) -> Dict[str, Any]:
+def generate_from_blueprint(
+    blueprint_id: str,
+    parameters: Dict[str, Any],
+    output_path: str,
+    output: Optional[OutputProject] = None
+) -> Dict[str, Any]:
     """
     Generate a file from a blueprint
     
@@ -155,12 +252,16 @@ def generate_from_blueprint(blueprint_id: str, parameters: Dict[str, Any], outpu
         blueprint_id: ID of the blueprint to use
         parameters: Dictionary of parameters to substitute
         output_path: Path where the generated file should be saved
+        output: Project to add the file to instead of writing it right away
         
     Returns:
         Dictionary with success status and additional information
     """
-    blueprint = load_blueprint(blueprint_id)
+    # The render works from one registry snapshot; blueprints reloaded while
+    # it runs are published as new snapshots and do not affect it
+    blueprint = get_blueprint_registry().snapshot().get(blueprint_id)
     if not blueprint:
+        logger.error(f"Blueprint not found: {blueprint_id}")
         return {
             "success": False,
             "error": f"Blueprint not found: {blueprint_id}"
@@ -194,7 +295,7 @@ def generate_from_blueprint(blueprint_id: str, parameters: Dict[str, Any], outpu
         templates_dir = find_templates_dir()
         template_path = os.path.join(templates_dir, blueprint["template"])
         
-        return generate_from_template(template_path, parameters, output_path)
+        return generate_from_template(template_path, parameters, output_path, output)
     
     # If no template specified, use code example directly
     elif code_example_content:
@@ -207,12 +308,8 @@ def generate_from_blueprint(blueprint_id: str, parameters: Dict[str, Any], outpu
                     placeholder = "{" + key + "}"
                     output_content = output_content.replace(placeholder, value)
             
-            # Create output directory if it doesn't exist
-            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-            
             # Write to output file
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(output_content)
+            write_output(output_path, output_content, output)
             
             return {
                 "success": True,
@@ -232,6 +329,137 @@ def generate_from_blueprint(blueprint_id: str, parameters: Dict[str, Any], outpu
     }
 
 
+def render_project(files: List[Dict[str, Any]]) -> Tuple[Optional[OutputProject], Optional[str]]:
+    """
+    Render several files from blueprints into memory, without writing anything
+    
+    Args:
+        files: One entry per file, each with blueprintId, parameters and outputPath
+        
+    Returns:
+        The rendered project, or None and the error of the first file that
+        could not be generated
+    """
+    project = OutputProject()
+    for index, spec in enumerate(files):
+        # Rendering adds codeExampleContent to the parameters; keep the caller's dict intact
+        result = generate_from_blueprint(spec["blueprintId"], dict(spec["parameters"]), spec["outputPath"], project)
+        if not result["success"]:
+            return None, f"File {index} ({spec['outputPath']}): {result['error']}"
+    return project, None
+
+
+def commit_project(project: OutputProject) -> Dict[str, Any]:
+    """
+    Write a rendered project through the output sink, all or nothing
+    
+    Returns:
+        Dictionary with success status and the written paths
+    """
+    try:
+        get_output_sink().write(project)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Error writing generated files: {str(e)}"
+        }
+    
+    return {
+        "success": True,
+        "outputPaths": list(project.files),
+        "files": len(project),
+        "size": project.size
+    }
+
+
+def generate_project(files: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Generate several files from blueprints and write them all or not at all
+    
+    Args:
+        files: One entry per file, each with blueprintId, parameters and outputPath
+        
+    Returns:
+        Dictionary with success status and the generated paths, or the error
+        of the first file that could not be generated (nothing is written then)
+    """
+    project, error = render_project(files)
+    if project is None:
+        return {
+            "success": False,
+            "error": error
+        }
+    return commit_project(project)
+
+
+def preview_project(files: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Dry run: render several files into memory and keep the result for later
+    
+    Identical requests against the same blueprints and code examples are
+    served from the preview cache without rendering again.
+    
+    Args:
+        files: One entry per file, each with blueprintId, parameters and outputPath
+        
+    Returns:
+        Dictionary with success status, the preview ID and the rendered
+        project, or the error of the first file that could not be generated
+    """
+    preview_id = _preview_key(files)
+    cache = get_preview_cache()
+    project = cache.get(preview_id)
+    if project is None:
+        project, error = render_project(files)
+        if project is None:
+            return {
+                "success": False,
+                "error": error
+            }
+        cache.put(preview_id, project)
+    
+    return {
+        "success": True,
+        "previewId": preview_id,
+        "project": project
+    }
+
+
+def _preview_key(files: List[Dict[str, Any]]) -> str:
+    """Hash of everything a rendered preview depends on"""
+    snapshot = get_blueprint_registry().snapshot()
+    catalog = get_code_example_catalog()
+    templates_dir = find_templates_dir()
+    code_examples = []
+    templates = []
+    for spec in files:
+        code_example = spec["parameters"].get("codeExample")
+        # Loading revalidates the catalog entry, so the hash is current
+        if isinstance(code_example, str) and catalog.load(code_example) is not None:
+            code_examples.append(catalog.content_hash(code_example))
+        else:
+            code_examples.append(None)
+
+        blueprint = snapshot.get(spec["blueprintId"])
+        template = blueprint.get("template") if blueprint else None
+        templates.append(_file_stamp(os.path.join(templates_dir, template)) if isinstance(template, str) else None)
+    source = json.dumps(
+        [snapshot.index_hash(), code_examples, templates, files],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _file_stamp(path: str) -> Optional[List[int]]:
+    """Modification time and size of a file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
 def list_available_blueprints() -> List[Dict[str, Any]]:
     """
     List all available blueprints
@@ -239,25 +467,7 @@ def list_available_blueprints() -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries containing blueprint metadata
     """
-    blueprints_dir = find_blueprints_dir()
-    blueprints = []
-    
-    for filename in os.listdir(blueprints_dir):
-        if filename.endswith(".json"):
-            try:
-                blueprint_id = filename[:-5]  # Remove .json extension
-                blueprint = load_blueprint(blueprint_id)
-                if blueprint:
-                    blueprints.append({
-                        "id": blueprint_id,
-                        "name": blueprint.get("name", blueprint_id),
-                        "description": blueprint.get("description", ""),
-                        "version": blueprint.get("version", "1.0.0")
-                    })
-            except Exception as e:
-                logger.error(f"Error loading blueprint {filename}: {str(e)}")
-    
-    return blueprints
+    return get_blueprint_registry().list_metadata()
 
 
 def list_available_code_examples() -> List[Dict[str, Any]]:
@@ -267,19 +477,4 @@ def list_available_code_examples() -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries containing code example metadata
     """
-    code_examples_dir = find_code_examples_dir()
-    examples = []
-    
-    for root, _, files in os.walk(code_examples_dir):
-        for filename in files:
-            try:
-                relative_path = os.path.relpath(os.path.join(root, filename), code_examples_dir)
-                examples.append({
-                    "path": relative_path,
-                    "name": os.path.basename(filename),
-                    "type": os.path.splitext(filename)[1][1:]  # File extension without dot
-                })
-            except Exception as e:
-                logger.error(f"Error listing code example {filename}: {str(e)}")
-    
-    return examples 
\ No newline at end of file
+    return get_code_example_catalog().list_examples() 
\ No newline at end of file
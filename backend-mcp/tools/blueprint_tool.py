@@ -1,2 +1,49 @@
-"""Blueprint Tool - TO BE IMPLEMENTED"""
-print("Blueprint Tool - placeholder implementation")
+"""Blueprint Tool - MCP tools for discovering Smart Blueprints"""
+from typing import Any, Dict
+
+from template_engine import search_blueprints
+
+# MCP tool definition for blueprint search
+SEARCH_BLUEPRINTS_TOOL: Dict[str, Any] = {
+    "name": "search_blueprints",
+    "description": (
+        "Search Smart Blueprints by name, description, parameter descriptions "
+        "and template identifiers. Tolerates typos. Returns the best matching "
+        "blueprint IDs to pass to generate_from_smart_blueprint."
+    ),
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Free-text query, e.g. 'jwt auth middleware'"
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of results",
+                "default": 10,
+                "minimum": 1,
+                "maximum": 100
+            }
+        },
+        "required": ["query"]
+    }
+}
+
+
+def handle_search_blueprints(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the search_blueprints tool with MCP call arguments"""
+    query = str(arguments.get("query", "")).strip()
+    if not query:
+        return {"success": False, "error": "Argument 'query' is required"}
+
+    limit = arguments.get("limit", 10)
+    if isinstance(limit, bool):
+        return {"success": False, "error": "Argument 'limit' must be an integer"}
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return {"success": False, "error": "Argument 'limit' must be an integer"}
+
+    limit = max(1, min(limit, 100))
+    return {"success": True, "query": query, "results": search_blueprints(query, limit)}
@@ -0,0 +1,102 @@
+"""
+Blueprint response benchmark for the FastAPI MCP server.
+
+Compares the bytes on the wire and the CPU spent per request when every
+blueprint is served through FastAPI's default JSON path versus the orjson
+serializer with cached gzip/brotli bodies from blueprint_responses.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+import blueprint_responses  # noqa: E402
+from template_engine import get_blueprint_registry  # noqa: E402
+
+
+def _time_per_call(func: Callable[[], Any], rounds: int) -> float:
+    """Average wall time of a call in microseconds."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1_000_000
+
+
+def _default_render(blueprint: Dict[str, Any]) -> bytes:
+    """What FastAPI's default JSONResponse does for a Dict[str, Any] route."""
+    return json.dumps(
+        jsonable_encoder(blueprint),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def run_benchmark(rounds: int) -> Dict[str, Any]:
+    """Serialize and compress every indexed blueprint and collect totals."""
+    registry = get_blueprint_registry()
+    registry.build()
+    encodings = ['gzip'] + (['br'] if blueprint_responses.brotli is not None else [])
+
+    totals: Dict[str, float] = {
+        'identity_bytes': 0,
+        'default_us': 0.0,
+        'orjson_us': 0.0,
+        'cached_us': 0.0,
+    }
+    for encoding in encodings:
+        totals[f'{encoding}_bytes'] = 0
+        totals[f'{encoding}_compress_us'] = 0.0
+
+    cache = blueprint_responses.SerializedBodyCache(blueprint_responses.BODY_CACHE_MAX_BYTES)
+    metadata = registry.list_metadata()
+
+    for entry in metadata:
+        blueprint = registry.get(entry['id'])
+        content_hash = registry.content_hash(entry['id'])
+        body = blueprint_responses.dumps(blueprint)
+
+        totals['identity_bytes'] += len(body)
+        totals['default_us'] += _time_per_call(lambda: _default_render(blueprint), rounds)
+        totals['orjson_us'] += _time_per_call(lambda: blueprint_responses.dumps(blueprint), rounds)
+
+        for encoding in encodings:
+            compressed = blueprint_responses.compress(body, encoding)
+            totals[f'{encoding}_bytes'] += len(compressed)
+            totals[f'{encoding}_compress_us'] += _time_per_call(
+                lambda: blueprint_responses.compress(body, encoding), max(1, rounds // 10)
+            )
+            cache.get_or_create(('blueprint', content_hash, encoding), lambda: compressed)
+
+        key = ('blueprint', content_hash, encodings[-1])
+        totals['cached_us'] += _time_per_call(lambda: cache.get_or_create(key, lambda: b''), rounds)
+
+    result: Dict[str, Any] = {
+        'blueprints': len(metadata),
+        'orjson': blueprint_responses.orjson is not None,
+        'encodings': encodings,
+    }
+    result.update({key: round(value, 1) for key, value in totals.items()})
+    for encoding in encodings:
+        result[f'{encoding}_saved_pct'] = round(
+            100 * (1 - totals[f'{encoding}_bytes'] / totals['identity_bytes']), 1
+        )
+    result['serialize_speedup'] = round(totals['default_us'] / totals['orjson_us'], 1)
+    result['cached_speedup'] = round(totals['default_us'] / totals['cached_us'], 1)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark blueprint response encoding")
+    parser.add_argument('--rounds', type=int, default=50, help="Calls per blueprint per measurement")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.rounds), indent=2))
@@ -0,0 +1,107 @@
+"""
+Generation output benchmark for the FastAPI MCP server.
+
+Scaffolds hundreds of generated files into a scratch directory and compares
+the previous write path (open, write and close every file on the request
+path) with the write-behind OutputSink under each durability policy.
+Renders are submitted from several threads, as concurrent requests would.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from generation_output import DURABILITY_POLICIES, OutputProject, OutputSink  # noqa: E402
+
+
+def _project_files(root: str, project: int, files: int, size: int) -> List[tuple]:
+    """Paths and contents of one scaffolded project."""
+    content = ("# generated\n" + "x = 1\n" * (size // 6))[:size]
+    return [
+        (os.path.join(root, f"project-{project}", f"pkg{index % 8}", f"module_{index}.py"), content)
+        for index in range(files)
+    ]
+
+
+def _direct_writer(fsync: bool) -> Callable[[List[tuple]], None]:
+    """The write path generate_from_template used before the sink."""
+    def write(files: List[tuple]) -> None:
+        for path, content in files:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+    return write
+
+
+def _sink_writer(sink: OutputSink) -> Callable[[List[tuple]], None]:
+    """Write one project through the sink and wait for its commit."""
+    def write(files: List[tuple]) -> None:
+        project = OutputProject()
+        for path, content in files:
+            project.add(path, content)
+        sink.write(project)
+    return write
+
+
+def _run(write: Callable[[List[tuple]], None], args: argparse.Namespace) -> Dict[str, Any]:
+    """Scaffold every project with `write` from a pool of threads."""
+    root = tempfile.mkdtemp(prefix="mcp-generation-bench-", dir=args.directory)
+    try:
+        projects = [_project_files(root, index, args.files, args.size) for index in range(args.projects)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(write, projects))
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    total = args.projects * args.files
+    return {
+        "files": total,
+        "seconds": round(elapsed, 3),
+        "files_per_second": round(total / elapsed, 1),
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Measure each write path and collect the results."""
+    results: Dict[str, Any] = {
+        "projects": args.projects,
+        "files_per_project": args.files,
+        "file_bytes": args.size,
+        "concurrency": args.concurrency,
+    }
+    results["direct"] = _run(_direct_writer(fsync=False), args)
+    results["direct_fsync"] = _run(_direct_writer(fsync=True), args)
+    for durability in DURABILITY_POLICIES:
+        sink = OutputSink(durability)
+        try:
+            results[f"sink_{durability}"] = _run(_sink_writer(sink), args)
+        finally:
+            sink.close()
+        results[f"sink_{durability}"].update(batches=sink.batches)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark writing generated files")
+    parser.add_argument('--projects', type=int, default=20, help="Projects to scaffold")
+    parser.add_argument('--files', type=int, default=25, help="Files per project")
+    parser.add_argument('--size', type=int, default=2048, help="Bytes per file")
+    parser.add_argument('--concurrency', type=int, default=8, help="Threads submitting renders")
+    parser.add_argument('--directory', default=None, help="Scratch directory (default: system temp)")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args), indent=2))
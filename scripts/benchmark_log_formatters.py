@@ -0,0 +1,144 @@
+"""
+JSON log formatter benchmark for the generated logging blueprints.
+
+Renders the smart-logging-middleware and smart-logging-system blueprints
+with and without enableFastJSONLogging and measures records per second for
+the json.dumps formatters and the orjson-backed FastJSONFormatter on a
+typical "Request started" record. Also times the middleware's request
+logging end to end, with INFO enabled and with it disabled.
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+BLUEPRINTS = {
+    "smart-logging-middleware": BACKEND_DIR / "blueprints" / "api" / "middleware" / "smart-logging-middleware.json",
+    "smart-logging-system": BACKEND_DIR / "blueprints" / "utils" / "smart-logging-system.json",
+}
+STATIC_FIELDS = {"service": "orders", "environment": "production"}
+
+
+def _load(blueprint_id: str, fast: bool, directory: str) -> Any:
+    """Render one blueprint with its defaults and import it."""
+    blueprint = json.loads(BLUEPRINTS[blueprint_id].read_text(encoding="utf-8"))
+    params = {name: spec.get("default", name) for name, spec in blueprint["parameters"].items()}
+    params.update(resourceName="orders", enableDetailedLogging=False, enableFastJSONLogging=fast)
+    module_name = f"{blueprint_id.replace('-', '_')}_{'fast' if fast else 'json'}"
+    path = Path(directory) / f"{module_name}.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _record() -> logging.LogRecord:
+    """A record shaped like the middleware's "Request started" entry."""
+    record = logging.LogRecord("mcp-fastapi.orders-logging", logging.INFO, __file__, 42, "Request started", None, None)
+    record.__dict__.update({
+        "event": "request_started",
+        "request_id": "7d0c6a5e-2c1b-4d53-9a0e-6f1b0f9d2a11",
+        "method": "GET",
+        "path": "/api/v1/orders/42",
+        "query_params": {"expand": "items"},
+        "headers": {"host": "api.example.com", "accept": "application/json", "user-agent": "benchmark"},
+        "client_ip": "10.0.0.7",
+        "user_agent": "benchmark",
+        "user_id": "user-1",
+        "user_role": "user",
+    })
+    return record
+
+
+def _rate(function: Callable[[], Any], number: int) -> float:
+    """Best-of-five calls per second."""
+    return round(number / min(timeit.repeat(function, number=number, repeat=5)), 1)
+
+
+def _request() -> Any:
+    """A Starlette request matching the record above."""
+    from starlette.requests import Request
+
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/orders/42",
+        "query_string": b"expand=items",
+        "headers": [(b"host", b"api.example.com"), (b"user-agent", b"benchmark")],
+        "client": ("10.0.0.7", 50000),
+        "server": ("api.example.com", 443),
+        "scheme": "https",
+    })
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Compare both formatters in both blueprints."""
+    results: Dict[str, Any] = {"unit": "records per second"}
+    record = _record()
+    with tempfile.TemporaryDirectory(prefix="mcp-formatter-bench-") as directory:
+        middleware = {fast: _load("smart-logging-middleware", fast, directory) for fast in (False, True)}
+        system = {fast: _load("smart-logging-system", fast, directory) for fast in (False, True)}
+    results["orjson_installed"] = system[True].orjson is not None
+    if not results["orjson_installed"]:
+        raise SystemExit("orjson is not installed; FastJSONFormatter needs it")
+
+    # Separate logger names: each request logger replaces its logger's handlers
+    instances = {
+        False: middleware[False].RequestLogger(
+            logger_name="benchmark.json", log_level=middleware[False].LogLevel.ERROR
+        ),
+        True: middleware[True].RequestLogger(
+            logger_name="benchmark.fast", log_level=middleware[True].LogLevel.ERROR, static_fields=STATIC_FIELDS
+        ),
+    }
+    formatters = {
+        "smart-logging-middleware": (instances[False]._create_json_formatter(), instances[True]._create_json_formatter()),
+        "smart-logging-system": (system[False].JSONFormatter(), system[True].FastJSONFormatter(STATIC_FIELDS)),
+    }
+    for blueprint_id, (json_formatter, fast_formatter) in formatters.items():
+        assert type(fast_formatter).__name__ == "FastJSONFormatter"
+        assert json.loads(fast_formatter.format(record))["request_id"] == record.request_id
+        json_rate = _rate(lambda: json_formatter.format(record), args.number)
+        fast_rate = _rate(lambda: fast_formatter.format(record), args.number)
+        results[blueprint_id] = {
+            "json_formatter": json_rate,
+            "fast_formatter": fast_rate,
+            "speedup": round(fast_rate / json_rate, 2),
+        }
+
+    # Whole log_request_started call, writing to /dev/null
+    request = _request()
+    user_info = {"user_id": "user-1", "user_role": "user"}
+    with open(os.devnull, "w") as devnull:
+        results["middleware_request_logging"] = {}
+        for label, fast, level in (("json_info", False, logging.INFO), ("fast_info", True, logging.INFO),
+                                   ("info_disabled", True, logging.WARNING)):
+            instance = instances[fast]
+            instance.logger.setLevel(level)
+            for handler in instance.logger.handlers:
+                handler.setStream(devnull)
+            results["middleware_request_logging"][label] = _rate(
+                lambda: instance.log_request_started(request, "request-1", user_info, None), args.number
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the JSON and orjson log formatters")
+    parser.add_argument('--number', type=int, default=20000, help="Records per timing run")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args), indent=2))
@@ -0,0 +1,211 @@
+"""
+Middleware style benchmark for the generated FastAPI middleware.
+
+Renders the logging, auth and CORS middleware blueprints, stacks them on a
+small FastAPI app and drives it with raw ASGI calls, once with the
+BaseHTTPMiddleware classes and once with their pure ASGI variants. Reports
+throughput and latency percentiles for a JSON endpoint and a streaming one.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+MIDDLEWARE_DIR = BACKEND_DIR / "blueprints" / "api" / "middleware"
+BLUEPRINTS = ("smart-logging-middleware", "smart-auth-middleware", "smart-cors-middleware")
+ORIGIN = "https://app.example.com"
+SECRET_KEY = "benchmark-secret"
+
+
+def _load_middleware(blueprint_id: str, directory: str) -> Any:
+    """Render one middleware blueprint with its defaults and import it."""
+    blueprint = json.loads((MIDDLEWARE_DIR / f"{blueprint_id}.json").read_text(encoding="utf-8"))
+    params = {name: spec.get("default", name) for name, spec in blueprint["parameters"].items()}
+    params.update(enableDetailedLogging=False, enablePureASGI=True)
+    module_name = blueprint_id.replace("-", "_")
+    path = Path(directory) / f"{module_name}.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _build_app(modules: Dict[str, Any], style: str, chunks: int) -> Any:
+    """FastAPI app with the three middleware in the given style."""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    logging_module = modules["smart-logging-middleware"]
+    auth_module = modules["smart-auth-middleware"]
+    cors_module = modules["smart-cors-middleware"]
+    pure = style == "asgi"
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int) -> Dict[str, Any]:
+        return {"id": item_id, "name": f"item-{item_id}", "tags": ["a", "b", "c"]}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def body():
+            for index in range(chunks):
+                yield b"x" * 1024
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    # Added innermost first: requests pass CORS, then logging, then auth
+    app.add_middleware(
+        auth_module.SmartAuthASGIMiddleware if pure else auth_module.SmartAuthMiddleware,
+        secret_key=SECRET_KEY,
+        enable_logging=False
+    )
+    app.add_middleware(
+        logging_module.SmartLoggingASGIMiddleware if pure else logging_module.SmartLoggingMiddleware,
+        log_level=logging_module.LogLevel.ERROR
+    )
+    app.add_middleware(
+        cors_module.SmartCORSASGIMiddleware if pure else cors_module.SmartCORSMiddleware,
+        allowed_origins=[ORIGIN],
+        enable_logging=False
+    )
+    return app
+
+
+def _token() -> str:
+    """A valid HS256 access token for the auth middleware."""
+    from jose import jwt
+
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": "user-1", "role": "user", "iat": now, "exp": now + 3600},
+        SECRET_KEY,
+        algorithm="HS256"
+    )
+
+
+async def _call(app: Any, path: str, headers: List[Tuple[bytes, bytes]]) -> Tuple[int, Dict[str, str], int, float]:
+    """One GET through the ASGI app; returns status, headers, body size and latency."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    sent_request = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    result: Dict[str, Any] = {"size": 0}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = {k.decode("latin-1"): v.decode("latin-1") for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            result["size"] += len(message.get("body", b""))
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    return result["status"], result["headers"], result["size"], time.perf_counter() - started
+
+
+def _check(app: Any, headers: List[Tuple[bytes, bytes]], chunks: int) -> None:
+    """Both styles must produce the same observable responses."""
+    loop = asyncio.get_event_loop()
+    status, response_headers, size, _ = loop.run_until_complete(_call(app, "/items/1", headers))
+    assert status == 200, status
+    assert response_headers.get("access-control-allow-origin") == ORIGIN, response_headers
+    assert response_headers.get("x-frame-options") == "DENY", response_headers
+
+    status, _, size, _ = loop.run_until_complete(_call(app, "/stream", headers))
+    assert status == 200 and size == chunks * 1024, (status, size)
+
+    anonymous = [h for h in headers if h[0] != b"authorization"]
+    status, _, _, _ = loop.run_until_complete(_call(app, "/items/1", anonymous))
+    assert status == 401, status
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def _measure(app: Any, path: str, headers: List[Tuple[bytes, bytes]], args: argparse.Namespace) -> Dict[str, Any]:
+    """Run `requests` calls, `concurrency` at a time, and summarize them."""
+    async def run() -> Tuple[float, List[float]]:
+        latencies: List[float] = []
+        started = time.perf_counter()
+        for _ in range(args.requests // args.concurrency):
+            results = await asyncio.gather(*(_call(app, path, headers) for _ in range(args.concurrency)))
+            latencies.extend(result[3] for result in results)
+        return time.perf_counter() - started, latencies
+
+    elapsed, latencies = asyncio.get_event_loop().run_until_complete(run())
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Measure both middleware styles on both endpoints."""
+    headers = [
+        (b"host", b"testserver"),
+        (b"origin", ORIGIN.encode()),
+        (b"authorization", f"Bearer {_token()}".encode()),
+        (b"user-agent", b"benchmark"),
+    ]
+    results: Dict[str, Any] = {"requests": args.requests, "concurrency": args.concurrency}
+    with tempfile.TemporaryDirectory(prefix="mcp-middleware-bench-") as directory:
+        modules = {blueprint_id: _load_middleware(blueprint_id, directory) for blueprint_id in BLUEPRINTS}
+        for style in ("base_http", "asgi"):
+            app = _build_app(modules, style, args.chunks)
+            _check(app, headers, args.chunks)
+            # Warm up routing and the middleware stack before timing
+            _measure(app, "/items/1", headers, argparse.Namespace(requests=args.concurrency, concurrency=args.concurrency))
+            results[style] = {
+                "json": _measure(app, "/items/1", headers, args),
+                "stream": _measure(app, "/stream", headers, args),
+            }
+    for endpoint in ("json", "stream"):
+        results[f"{endpoint}_speedup"] = round(
+            results["asgi"][endpoint]["requests_per_second"] / results["base_http"][endpoint]["requests_per_second"], 2
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BaseHTTPMiddleware against pure ASGI middleware")
+    parser.add_argument('--requests', type=int, default=4000, help="Requests per endpoint and style")
+    parser.add_argument('--concurrency', type=int, default=50, help="Requests in flight at once")
+    parser.add_argument('--chunks', type=int, default=32, help="1KB chunks in each streamed response")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args), indent=2))
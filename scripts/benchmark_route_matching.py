@@ -0,0 +1,129 @@
+"""
+Route matching microbenchmark for the generated auth and logging middleware.
+
+Renders the smart-auth-middleware and smart-logging-middleware blueprints
+and times path exclusion and route-permission lookups against a rule set of
+the given size (500 by default), comparing the compiled matchers with the
+per-request list scans they replace.
+"""
+import argparse
+import importlib.util
+import json
+import re
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+MIDDLEWARE_DIR = BACKEND_DIR / "blueprints" / "api" / "middleware"
+
+
+def _load_middleware(blueprint_id: str, directory: str) -> Any:
+    """Render one middleware blueprint with every option enabled and import it."""
+    blueprint = json.loads((MIDDLEWARE_DIR / f"{blueprint_id}.json").read_text(encoding="utf-8"))
+    params = {
+        name: (spec.get("type") == "boolean" or spec.get("default", name))
+        for name, spec in blueprint["parameters"].items()
+    }
+    params["enableDetailedLogging"] = False
+    module_name = blueprint_id.replace("-", "_")
+    path = Path(directory) / f"{module_name}.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _exclusions(rules: int) -> List[str]:
+    return [f"/internal/service-{index}/" for index in range(rules)]
+
+
+def _permission_rules(rules: int) -> Dict[str, List[str]]:
+    """Half plain "METHOD /path" rules, half with {param} and trailing * segments."""
+    permissions: Dict[str, List[str]] = {}
+    for index in range(rules):
+        if index % 2:
+            permissions[f"GET /api/v1/resource-{index}/{{item_id}}/history"] = [f"resource-{index}:read"]
+        elif index % 4:
+            permissions[f"* /admin/area-{index}/*"] = ["admin"]
+        else:
+            permissions[f"POST /reports/report-{index}"] = [f"report-{index}:write"]
+    return permissions
+
+
+def _linear_permissions(rules: Dict[str, List[str]]) -> Callable[[str, str], List[str]]:
+    """Per-request scan over every rule, each as its own regex."""
+    compiled = []
+    for rule, permissions in rules.items():
+        method, _, path = rule.partition(" ")
+        pattern = re.escape(path.rstrip("*")).replace(r"\{item_id\}", "[^/]+")
+        compiled.append((method, re.compile(pattern + (".*" if path.endswith("*") else "") + "$"), permissions))
+
+    def required(method: str, path: str) -> List[str]:
+        for rule_method, pattern, permissions in compiled:
+            if rule_method in (method, "*") and pattern.match(path):
+                return permissions
+        return []
+    return required
+
+
+def _time(function: Callable[[], Any], number: int) -> float:
+    """Best-of-five microseconds per call."""
+    return round(min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6, 3)
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Time exclusion and permission lookups for hits and misses."""
+    with tempfile.TemporaryDirectory(prefix="mcp-route-bench-") as directory:
+        auth = _load_middleware("smart-auth-middleware", directory)
+        logging_module = _load_middleware("smart-logging-middleware", directory)
+
+    exclusions = _exclusions(args.rules)
+    rules = _permission_rules(args.rules)
+    authenticator = auth.RequestAuthenticator(
+        secret_key="benchmark", excluded_paths=exclusions, required_permissions=rules, enable_logging=False
+    )
+    request_logger = logging_module.RequestLogger(excluded_paths=exclusions, log_level=logging_module.LogLevel.ERROR)
+    linear_required = _linear_permissions(rules)
+
+    excluded_path = f"/internal/service-{args.rules - 1}/status"
+    included_path = "/api/v1/items/42"
+    lookups = {
+        "exact_hit": ("POST", f"/reports/report-{(args.rules - 1) // 4 * 4}"),
+        "param_hit": ("GET", f"/api/v1/resource-{args.rules - 1}/42/history"),
+        "wildcard_hit": ("DELETE", f"/admin/area-{args.rules - 2}/users/7"),
+        "miss": ("GET", "/api/v1/items/42"),
+    }
+
+    results: Dict[str, Any] = {"rules": args.rules, "unit": "microseconds per lookup"}
+    for name, path in (("excluded", excluded_path), ("not_excluded", included_path)):
+        assert authenticator.is_path_excluded(path) == any(path.startswith(p) for p in exclusions)
+        results[f"exclusion_{name}"] = {
+            "list_scan": _time(lambda: any(path.startswith(p) for p in exclusions), args.number),
+            "auth_trie": _time(lambda: authenticator.is_path_excluded(path), args.number),
+            "logging_trie": _time(lambda: request_logger.is_path_excluded(path), args.number),
+        }
+    for name, (method, path) in lookups.items():
+        assert set(authenticator.permission_matcher.required(method, path)) == set(linear_required(method, path))
+        results[f"permission_{name}"] = {
+            "rule_scan": _time(lambda: linear_required(method, path), args.number),
+            "compiled": _time(lambda: authenticator.permission_matcher.required(method, path), args.number),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark compiled route matching in the generated middleware")
+    parser.add_argument('--rules', type=int, default=500, help="Exclusion prefixes and permission rules")
+    parser.add_argument('--number', type=int, default=20000, help="Lookups per timing run")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args), indent=2))
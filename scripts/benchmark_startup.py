@@ -0,0 +1,57 @@
+"""
+Startup benchmark for the FastAPI MCP server.
+
+Measures import time of backend-mcp/main.py and the time the lifespan hook
+takes to become ready, and optionally appends the result to a JSONL file so
+the numbers can be tracked over time.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend-mcp"
+
+
+async def _run_lifespan(app) -> None:
+    """Enter and exit the application lifespan once."""
+    async with app.router.lifespan_context(app):
+        pass
+
+
+def measure_startup() -> Dict[str, Any]:
+    """Import the app and run its startup, returning timings in ms."""
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    import_started = time.perf_counter()
+    import main  # noqa: E402
+    imported = time.perf_counter()
+
+    asyncio.run(_run_lifespan(main.app))
+    ready = time.perf_counter()
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'import_ms': round((imported - import_started) * 1000, 2),
+        'startup_ms': round((ready - imported) * 1000, 2),
+        'import_to_ready_ms': round((ready - import_started) * 1000, 2),
+        'blueprints': len(main.get_blueprint_registry().list_metadata()),
+        'routers': list(main.app.state.included_routers),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure FastAPI MCP import-to-ready time")
+    parser.add_argument('--output', help="Append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    result = measure_startup()
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(result) + "\n")
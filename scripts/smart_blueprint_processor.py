@@ -3,12 +3,18 @@ Smart Blueprint Processor for AI-first code generation.
 Handles embedded templates with validation and testing.
 """
 import json
-import re
+import sys
 from typing import Dict, Any, Optional
 from pathlib import Path
 import tempfile
 import subprocess
 
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# The backend renders the same examples for the extract endpoint
+from blueprint_extracts import build_extract, render_template, sample_parameters  # noqa: E402
+
 
 class SmartBlueprintProcessor:
     """Process smart blueprints with embedded code templates."""
@@ -16,6 +22,7 @@ class SmartBlueprintProcessor:
     def __init__(self, blueprint_path: str):
         self.blueprint_path = Path(blueprint_path)
         self.blueprint = self._load_blueprint()
+        self._extract: Optional[Dict[str, Any]] = None
     
     def _load_blueprint(self) -> Dict[str, Any]:
         """Load and validate blueprint file."""
@@ -31,32 +38,7 @@ class SmartBlueprintProcessor:
     
     def generate_code(self, parameters: Dict[str, Any]) -> str:
         """Generate code from template with parameters."""
-        template = self.blueprint['codeTemplate']['content']
-        
-        # Simple template variable replacement
-        # In production, use a proper template engine like Jinja2
-        for key, value in parameters.items():
-            # Handle boolean conditionals
-            if isinstance(value, bool):
-                template = self._process_conditionals(template, key, value)
-            else:
-                template = template.replace(f"{{{{{key}}}}}", str(value))
-        
-        return template
-    
-    def _process_conditionals(self, template: str, key: str, value: bool) -> str:
-        """Process conditional blocks in template."""
-        # Handle {{#if key}} ... {{/if}} blocks
-        if_pattern = rf'{{\{{#if {key}\}}\}}(.*?){{\{{/if\}}\}}'
-        
-        if value:
-            # Keep content inside if block
-            template = re.sub(if_pattern, r'\1', template, flags=re.DOTALL)
-        else:
-            # Remove entire if block
-            template = re.sub(if_pattern, '', template, flags=re.DOTALL)
-        
-        return template
+        return render_template(self.blueprint['codeTemplate']['content'], parameters)
     
     def validate_template(self) -> bool:
         """Validate the embedded template syntax."""
@@ -71,59 +53,24 @@ class SmartBlueprintProcessor:
     def _validate_python_template(self, template: str) -> bool:
         """Validate Python template syntax."""
         try:
-            # Create a temporary file with sample parameters
-            sample_params = self._generate_sample_parameters()
-            code = self.generate_code(sample_params)
-            
-            # Write to temp file and check syntax
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_path = f.name
-            
-            # Check syntax with Python AST
-            result = subprocess.run(
-                ['python', '-m', 'py_compile', temp_path],
-                capture_output=True,
-                text=True
-            )
-            
-            Path(temp_path).unlink()  # Clean up
-            
-            return result.returncode == 0
-            
+            return self._sample_extract()['syntax_valid']
         except Exception as e:
             print(f"Template validation error: {e}")
             return False
     
     def _generate_sample_parameters(self) -> Dict[str, Any]:
         """Generate sample parameters for testing."""
-        params = {}
-        
-        for param_name, param_config in self.blueprint['parameters'].items():
-            param_type = param_config.get('type', 'string')
-            
-            if param_type == 'string':
-                if 'pattern' in param_config:
-                    # Generate based on pattern
-                    if 'snake_case' in param_config.get('description', ''):
-                        params[param_name] = 'sample_resource'
-                    elif 'PascalCase' in param_config.get('description', ''):
-                        params[param_name] = 'SampleResource'
-                    else:
-                        params[param_name] = 'sample'
-                else:
-                    params[param_name] = param_config.get('default', 'sample')
-            elif param_type == 'boolean':
-                params[param_name] = param_config.get('default', True)
-            elif param_type == 'integer':
-                params[param_name] = param_config.get('default', 1)
-        
-        return params
+        return sample_parameters(self.blueprint['parameters'])
+    
+    def _sample_extract(self) -> Dict[str, Any]:
+        """Render and syntax-check the template with sample parameters, once."""
+        if self._extract is None:
+            self._extract = build_extract(self.blueprint['id'], self.blueprint)
+        return self._extract
     
     def extract_example(self, output_path: Optional[str] = None) -> str:
         """Extract a clean code example from the template."""
-        sample_params = self._generate_sample_parameters()
-        code = self.generate_code(sample_params)
+        code = self._sample_extract()['extracted_code']
         
         if output_path:
             with open(output_path, 'w') as f:
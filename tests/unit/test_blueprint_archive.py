@@ -0,0 +1,117 @@
+"""
+Tests for blueprint archive export and import.
+"""
+import io
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import blueprint_archive  # noqa: E402
+from blueprint_archive import _member_name, iter_archive, read_archive, validate_members  # noqa: E402
+from blueprint_upload import UploadRejected  # noqa: E402
+
+
+def _write_tar(path: Path, members) -> str:
+    with tarfile.open(path, mode="w:gz") as archive:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+def _write_zip(path: Path, members) -> str:
+    with zipfile.ZipFile(path, mode="w") as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    return str(path)
+
+
+@pytest.mark.parametrize("archive_format", ["tar.gz", "zip"])
+def test_export_round_trips_through_import(tmp_path, archive_format):
+    entries = [("api/alpha.json", b'{"id": "alpha"}', 1.7e9), ("beta.json", b'{"id": "beta"}', 1.7e9)]
+    path = tmp_path / f"library.{archive_format}"
+    path.write_bytes(b"".join(iter_archive(iter(entries), archive_format)))
+
+    members, skipped = read_archive(str(path))
+    assert members == [(name, data) for name, data, _ in entries]
+    assert skipped == []
+
+
+@pytest.mark.parametrize("name", ["../evil.json", "/etc/evil.json", "api/../../evil.json", "..\\evil.json"])
+def test_member_names_cannot_escape_the_library(name):
+    with pytest.raises(UploadRejected) as excinfo:
+        _member_name(name)
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize("write", [_write_tar, _write_zip])
+def test_traversing_member_rejects_the_archive(tmp_path, write):
+    path = write(tmp_path / "archive", [("ok.json", b"{}"), ("../evil.json", b"{}")])
+    with pytest.raises(UploadRejected, match="escapes"):
+        read_archive(path)
+
+
+def test_non_blueprint_members_are_skipped(tmp_path):
+    path = _write_zip(tmp_path / "archive.zip", [
+        ("api/alpha.json", b"{}"), ("README.md", b"#"), ("api/.hidden.json", b"{}")
+    ])
+    members, skipped = read_archive(path)
+    assert [name for name, _ in members] == ["api/alpha.json"]
+    assert skipped == ["README.md", "api/.hidden.json"]
+
+
+@pytest.mark.parametrize("write", [_write_tar, _write_zip])
+def test_member_size_cap(tmp_path, write):
+    path = write(tmp_path / "archive", [("big.json", b"{" + b" " * 100 + b"}")])
+    with pytest.raises(UploadRejected) as excinfo:
+        read_archive(path, max_member_bytes=64)
+    assert excinfo.value.status_code == 413
+
+
+def test_member_count_and_total_size_caps(tmp_path, monkeypatch):
+    path = _write_zip(tmp_path / "archive.zip", [(f"{index}.json", b"{}" * 10) for index in range(5)])
+
+    monkeypatch.setattr(blueprint_archive, "MAX_IMPORT_MEMBERS", 4)
+    with pytest.raises(UploadRejected, match="more than 4 members"):
+        read_archive(path)
+
+    monkeypatch.setattr(blueprint_archive, "MAX_IMPORT_MEMBERS", 10)
+    monkeypatch.setattr(blueprint_archive, "MAX_IMPORT_TOTAL_BYTES", 50)
+    with pytest.raises(UploadRejected, match="expands to more than 50 bytes"):
+        read_archive(path)
+
+
+def test_unknown_and_corrupt_archives_are_rejected(tmp_path):
+    plain = tmp_path / "plain.json"
+    plain.write_bytes(b"{}")
+    with pytest.raises(UploadRejected, match="tar.gz or zip"):
+        read_archive(str(plain))
+
+    truncated = tmp_path / "truncated.tar.gz"
+    data = Path(_write_tar(tmp_path / "full.tar.gz", [("alpha.json", b"{}" * 5000)])).read_bytes()
+    truncated.write_bytes(data[:len(data) // 2])
+    with pytest.raises(UploadRejected, match="Invalid archive"):
+        read_archive(str(truncated))
+
+
+def test_large_imports_are_validated_in_spawned_workers(monkeypatch):
+    monkeypatch.setattr(blueprint_archive, "PARALLEL_VALIDATION_MIN_MEMBERS", 4)
+    monkeypatch.setattr(blueprint_archive, "_validation_pool", blueprint_archive._ValidationPool())
+    members = [(f"bp-{index}.json", b"x" * index) for index in range(8)]
+
+    # A builtin check can be pickled by reference in the spawned workers
+    assert validate_members(members, len, workers=2) == [2] * 8
+    executor = blueprint_archive._validation_pool.get(2)
+    try:
+        assert executor._mp_context.get_start_method() == "spawn"
+        assert validate_members(members[:3], len, workers=2) == [2] * 3
+    finally:
+        executor.shutdown()
+
@@ -0,0 +1,62 @@
+"""
+Tests for the cross-process blueprint change feed.
+"""
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_changes import REBUILD_ALL, BlueprintChangeFeed  # noqa: E402
+
+
+def _publish_from_other_process(path: str, blueprint_ids, max_bytes: int = 1024 * 1024) -> None:
+    """Publish from a forked child, as another gunicorn worker would"""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            feed = BlueprintChangeFeed(path, max_bytes)
+            for blueprint_id in blueprint_ids:
+                feed.publish(blueprint_id)
+            feed.close()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+
+def test_changes_from_other_processes_are_polled_once(tmp_path):
+    path = str(tmp_path / "changes.log")
+    feed = BlueprintChangeFeed(path)
+    feed.publish("mine")
+
+    _publish_from_other_process(path, ["alpha", "beta", "alpha"])
+    assert feed.poll() == ["alpha", "beta"]
+    assert feed.poll() == []
+    feed.close()
+
+
+def test_journal_is_rotated_past_its_size_cap(tmp_path):
+    path = str(tmp_path / "changes.log")
+    reader = BlueprintChangeFeed(path, max_bytes=200)
+    blueprint_ids = [f"blueprint-{index:02d}" for index in range(12)]
+
+    _publish_from_other_process(path, blueprint_ids, max_bytes=200)
+    assert os.path.getsize(path) < 200
+    assert reader.poll() == blueprint_ids
+    assert reader.poll() == []
+
+    _publish_from_other_process(path, ["late"], max_bytes=200)
+    assert reader.poll() == ["late"]
+    reader.close()
+
+
+def test_reader_that_missed_a_whole_journal_rebuilds(tmp_path):
+    path = str(tmp_path / "changes.log")
+    reader = BlueprintChangeFeed(path, max_bytes=100)
+
+    _publish_from_other_process(path, [f"blueprint-{index:02d}" for index in range(20)], max_bytes=100)
+    changed = reader.poll()
+    assert changed[-1] == REBUILD_ALL
+    assert reader.poll() == []
+    reader.close()
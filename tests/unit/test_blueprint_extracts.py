@@ -0,0 +1,121 @@
+"""
+Tests for the rendered blueprint examples kept by the extract cache.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import blueprints_router  # noqa: E402
+from blueprint_extracts import BlueprintExtractCache, build_extract, render_template  # noqa: E402
+from blueprint_registry import BlueprintRegistry  # noqa: E402
+from blueprint_store import FilesystemBlueprintStore  # noqa: E402
+
+TEMPLATE = (
+    "class {{resourceName}}:\n"
+    "    limit = {{pageSize}}\n"
+    "{{#if enableCache}}\n"
+    "    cached = True\n"
+    "{{/if}}"
+)
+
+PARAMETERS = {
+    "resourceName": {"type": "string", "pattern": "^[A-Z]", "description": "PascalCase name"},
+    "pageSize": {"type": "integer", "default": 25},
+    "enableCache": {"type": "boolean", "default": False},
+}
+
+
+def _blueprint(blueprint_id: str, content: str = TEMPLATE) -> dict:
+    return {
+        "id": blueprint_id,
+        "name": blueprint_id.title(),
+        "parameters": PARAMETERS,
+        "codeTemplate": {"language": "python", "content": content},
+    }
+
+
+@pytest.fixture
+def registry(tmp_path):
+    store = FilesystemBlueprintStore(str(tmp_path))
+    store.put("alpha", json.dumps(_blueprint("alpha")).encode("utf-8"))
+    store.put("broken", json.dumps(_blueprint("broken", "def {{resourceName}}(:\n")).encode("utf-8"))
+    registry = BlueprintRegistry(store)
+    registry.build()
+    return registry
+
+
+@pytest.fixture
+def extracts(registry):
+    extracts = BlueprintExtractCache()
+    registry.add_listener(extracts)
+    return extracts
+
+
+def test_conditional_blocks_follow_boolean_parameters():
+    assert render_template("a{{#if on}}b{{/if}}c{{#if off}}d{{/if}}", {"on": True, "off": False}) == "abc"
+    assert render_template("{{name}}-{{name}}", {"name": "x"}) == "x-x"
+
+
+def test_example_is_rendered_with_sample_parameters(extracts):
+    extract = extracts.get("alpha")
+    assert extract["extracted_code"] == "class SampleResource:\n    limit = 25\n"
+    assert extract["parameters"] == {"resourceName": "SampleResource", "pageSize": 25, "enableCache": False}
+    assert extract["lines"] == 2
+    assert extract["size"] == len(extract["extracted_code"])
+    assert extract["syntax_valid"] and extract["syntax_error"] is None
+
+
+def test_syntax_errors_are_recorded_with_their_line(extracts):
+    extract = extracts.get("broken")
+    assert not extract["syntax_valid"]
+    assert extract["syntax_error"]["line"] == 1
+
+
+def test_blueprint_without_code_template_has_no_extract():
+    assert build_extract("plain", {"id": "plain", "parameters": {}}) is None
+
+
+def test_saved_blueprint_is_re_rendered_and_deleted_one_dropped(registry, extracts):
+    renders = extracts.renders
+    previous = extracts.get("alpha")
+
+    registry.store.put("alpha", json.dumps(_blueprint("alpha", "value = {{pageSize}}\n")).encode("utf-8"))
+    registry.refresh("alpha")
+    assert extracts.get("alpha")["extracted_code"] == "value = 25\n"
+    assert extracts.get("alpha")["sha256"] != previous["sha256"]
+    assert extracts.renders == renders + 1
+
+    registry.store.delete("broken")
+    registry.refresh("broken")
+    assert extracts.get("broken") is None
+    assert len(extracts) == 1
+
+
+def test_rebuild_reuses_unchanged_renders(registry, extracts):
+    renders = extracts.renders
+    previous = extracts.get("alpha")
+    registry.build()
+    assert extracts.renders == renders
+    assert extracts.get("alpha") is previous
+
+
+def test_listing_endpoint_serves_summaries_without_code(registry, extracts, monkeypatch):
+    monkeypatch.setattr(blueprints_router, "get_blueprint_registry", lambda: registry)
+    monkeypatch.setattr(blueprints_router, "get_blueprint_extracts", lambda: extracts)
+    app = FastAPI()
+    app.include_router(blueprints_router.router)
+
+    response = TestClient(app).get("/api/blueprints/extract")
+    assert response.status_code == 200
+    listed = response.json()["extracts"]
+    assert [extract["blueprint_id"] for extract in listed] == ["alpha", "broken"]
+    assert [extract["syntax_valid"] for extract in listed] == [True, False]
+    assert all("extracted_code" not in extract for extract in listed)
+    assert listed[0]["sha256"] == extracts.get("alpha")["sha256"]
@@ -0,0 +1,165 @@
+"""
+Tests for the blueprint registry snapshots and listing queries.
+"""
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_registry import BlueprintRegistry  # noqa: E402
+from blueprint_store import FilesystemBlueprintStore  # noqa: E402
+
+
+def _document(blueprint_id: str, **fields) -> bytes:
+    return json.dumps({"id": blueprint_id, "name": blueprint_id.title(), **fields}).encode("utf-8")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    store = FilesystemBlueprintStore(str(tmp_path))
+    for blueprint_id in ("b", "d", "f", "h", "j"):
+        store.put(blueprint_id, _document(blueprint_id), "api/routes" if blueprint_id in "dh" else "utils")
+    registry = BlueprintRegistry(store)
+    registry.build()
+    return registry
+
+
+def _page_through(registry, limit: int, between_pages=None):
+    seen = []
+    after = None
+    while True:
+        summaries, after = registry.query(after=after, limit=limit)
+        seen.extend(summary["id"] for summary in summaries)
+        if after is None:
+            return seen
+        if between_pages is not None:
+            between_pages()
+            between_pages = None
+
+
+def test_cursor_pages_cover_the_listing_once(registry):
+    assert _page_through(registry, 2) == ["b", "d", "f", "h", "j"]
+    assert _page_through(registry, 10) == ["b", "d", "f", "h", "j"]
+
+
+def test_cursor_stays_stable_across_a_refresh(registry):
+    def change_library():
+        # Before the cursor, the cursor itself, and after it
+        registry.store.put("a", _document("a"))
+        registry.refresh("a")
+        registry.store.delete("d")
+        registry.refresh("d")
+        registry.store.put("e", _document("e"))
+        registry.refresh("e")
+        registry.store.delete("h")
+        registry.refresh("h")
+
+    # Blueprints present throughout are listed exactly once; later additions
+    # after the cursor show up, removals after it do not
+    assert _page_through(registry, 2, change_library) == ["b", "d", "e", "f", "j"]
+
+
+def test_filters_apply_before_the_limit(registry):
+    summaries, after = registry.query(category="api", limit=1)
+    assert [summary["id"] for summary in summaries] == ["d"]
+    summaries, after = registry.query(category="api", after=after, limit=1)
+    assert [summary["id"] for summary in summaries] == ["h"]
+    assert after is None
+
+
+def test_held_snapshot_is_not_changed_by_a_refresh_or_build(registry):
+    snapshot = registry.snapshot()
+    blueprints = dict(snapshot.blueprints)
+    hashes = dict(snapshot.hashes)
+    index_hash = snapshot.index_hash()
+    listing = snapshot.query()
+    api_page = snapshot.query(category="api", limit=1)
+
+    registry.store.put("b", _document("b", version="2.0.0"))
+    registry.refresh("b")
+    registry.store.put("c", _document("c"), "api/routes")
+    registry.refresh("c")
+    registry.store.delete("d")
+    registry.build()
+
+    assert dict(snapshot.blueprints) == blueprints
+    assert "version" not in snapshot.get("b")
+    assert dict(snapshot.hashes) == hashes
+    assert snapshot.index_hash() == index_hash
+    assert snapshot.query() == listing
+    assert snapshot.query(category="api", limit=1) == api_page
+    assert not snapshot.contains("c") and snapshot.contains("d")
+
+    current = registry.snapshot()
+    assert current.get("b")["version"] == "2.0.0"
+    assert current.contains("c") and not current.contains("d")
+    assert registry.index_hash() != index_hash
+
+
+def test_concurrent_refreshes_publish_the_newest_read(registry):
+    store = registry.store
+    read_done = threading.Event()
+    release = threading.Event()
+    real_get = store.get
+    calls = []
+
+    def slow_first_get(blueprint_id):
+        record = real_get(blueprint_id)
+        calls.append(blueprint_id)
+        if len(calls) == 1:
+            # The first refresh read the old document; stall it before publishing
+            read_done.set()
+            release.wait(5)
+        return record
+
+    store.get = slow_first_get
+    first = threading.Thread(target=registry.refresh, args=("b",))
+    first.start()
+    assert read_done.wait(5)
+
+    store.put("b", _document("b", version="2.0.0"))
+    second = threading.Thread(target=registry.refresh, args=("b",))
+    second.start()
+    second.join(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert registry.get("b")["version"] == "2.0.0"
+
+
+class _RecordingFeed:
+    """Change feed stand-in that counts polls and hands out queued changes"""
+
+    def __init__(self):
+        self.polls = 0
+        self.pending = []
+
+    def poll(self):
+        self.polls += 1
+        changed, self.pending = self.pending, []
+        return changed
+
+
+def test_change_feed_is_polled_at_most_once_per_interval(registry, monkeypatch):
+    feed = _RecordingFeed()
+    clock = [1000.0]
+    monkeypatch.setattr("blueprint_registry.time.monotonic", lambda: clock[0])
+    polled = BlueprintRegistry(registry.store, feed, poll_interval_ms=250)
+
+    for _ in range(100):
+        assert polled.contains("b")
+    assert feed.polls == 1
+
+    registry.store.put("k", _document("k"), "utils")
+    feed.pending = ["k"]
+    clock[0] += 0.2
+    assert not polled.contains("k")
+    clock[0] += 0.05
+    assert polled.contains("k")
+    assert feed.polls == 2
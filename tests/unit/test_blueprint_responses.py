@@ -0,0 +1,98 @@
+"""
+Tests for conditional, compressed blueprint responses.
+"""
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import blueprint_responses  # noqa: E402
+from blueprint_responses import SerializedBodyCache, cached_json_response, etag_matches, make_etag  # noqa: E402
+
+PAYLOAD = {"id": "alpha", "description": "x" * 4096}
+
+
+def _client(content_hash: str = "abc123") -> TestClient:
+    app = FastAPI()
+
+    @app.get("/blueprint")
+    async def blueprint(request: Request):
+        return cached_json_response(request, "test-blueprint", content_hash, lambda: PAYLOAD)
+
+    return TestClient(app)
+
+
+def test_matching_etag_gets_304():
+    client = _client()
+    response = client.get("/blueprint", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.json() == PAYLOAD
+    etag = response.headers["etag"]
+
+    revalidated = client.get("/blueprint", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+
+def test_changed_content_hash_gets_a_new_body():
+    etag = _client("abc123").get("/blueprint", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    response = _client("def456").get("/blueprint", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_compressed_representation_has_its_own_etag():
+    client = _client()
+    response = client.get("/blueprint", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == make_etag("abc123", "gzip")
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    # The client decodes the body transparently
+    assert response.json() == PAYLOAD
+
+    identity_etag = make_etag("abc123")
+    revalidated = client.get("/blueprint", headers={"Accept-Encoding": "gzip", "If-None-Match": identity_etag})
+    assert revalidated.status_code == 200
+
+
+def test_revalidation_does_not_rebuild_an_evicted_body(monkeypatch):
+    monkeypatch.setattr(blueprint_responses, "body_cache", SerializedBodyCache(1024 * 1024))
+    builds = []
+
+    def payload():
+        builds.append(1)
+        return PAYLOAD
+
+    app = FastAPI()
+
+    @app.get("/blueprint")
+    async def blueprint(request: Request):
+        return cached_json_response(request, "test-blueprint", "abc123", payload)
+
+    client = TestClient(app)
+    etag = client.get("/blueprint", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert etag == make_etag("abc123", "gzip")
+    blueprint_responses.body_cache._entries.clear()
+
+    revalidated = client.get("/blueprint", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert len(builds) == 1
+
+    # A stale ETag still gets the body, rebuilt once
+    response = client.get("/blueprint", headers={"Accept-Encoding": "gzip", "If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.json() == PAYLOAD
+    assert len(builds) == 2
+
+
+def test_if_none_match_parsing():
+    etag = make_etag("abc123")
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
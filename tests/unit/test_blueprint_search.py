@@ -0,0 +1,60 @@
+"""
+Tests for the blueprint full-text search index.
+"""
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_search import BlueprintSearchIndex  # noqa: E402
+
+BLUEPRINTS = {
+    "smart-auth-middleware": {"name": "Smart Auth Middleware", "description": "JWT authentication middleware"},
+    "smart-cors-middleware": {"name": "Smart CORS Middleware", "description": "Cross-origin resource sharing"},
+    "crud-router": {"name": "CRUD Router", "description": "Create, read, update and delete routes"},
+}
+
+
+def _index() -> BlueprintSearchIndex:
+    index = BlueprintSearchIndex()
+    index.rebuild(BLUEPRINTS)
+    return index
+
+
+def test_best_match_ranks_first():
+    results = _index().search("jwt authentication")
+    assert results[0]["id"] == "smart-auth-middleware"
+    assert "jwt" in results[0]["matched"]
+
+
+def test_typos_match_fuzzily():
+    results = _index().search("autentication midleware")
+    assert results[0]["id"] == "smart-auth-middleware"
+
+
+def test_updates_and_deletes_are_reflected():
+    index = _index()
+    index.update("crud-router", None)
+    assert [result["id"] for result in index.search("routes")] == []
+    assert len(index) == 2
+
+    index.update("smart-cors-middleware", {"name": "Smart CORS Middleware", "description": "Preflight caching"})
+    assert [result["id"] for result in index.search("preflight")] == ["smart-cors-middleware"]
+    assert index.search("sharing") == []
+
+
+def test_search_tool_rejects_a_limit_that_is_not_an_integer(monkeypatch):
+    from tools import blueprint_tool
+
+    calls = []
+    monkeypatch.setattr(blueprint_tool, "search_blueprints", lambda query, limit: calls.append(limit) or [])
+
+    for limit in ("ten", None, True, [5]):
+        result = blueprint_tool.handle_search_blueprints({"query": "auth", "limit": limit})
+        assert result == {"success": False, "error": "Argument 'limit' must be an integer"}
+    assert calls == []
+
+    for limit, expected in (("20", 20), (0, 1), (500, 100)):
+        assert blueprint_tool.handle_search_blueprints({"query": "auth", "limit": limit})["success"]
+        assert calls[-1] == expected
@@ -0,0 +1,108 @@
+"""
+Tests for the filesystem and SQLite blueprint stores.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import blueprint_store  # noqa: E402
+from blueprint_store import FilesystemBlueprintStore, SQLiteBlueprintStore  # noqa: E402
+
+
+@pytest.fixture(params=["filesystem", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "filesystem":
+        store = FilesystemBlueprintStore(str(tmp_path / "blueprints"))
+    else:
+        store = SQLiteBlueprintStore(str(tmp_path / "blueprints.db"), pool_size=2)
+    yield store
+    store.close()
+
+
+def _document(blueprint_id: str, version: str = "1.0.0") -> bytes:
+    return f'{{"id": "{blueprint_id}", "version": "{version}"}}'.encode("utf-8")
+
+
+def test_put_get_and_delete(store):
+    store.put("alpha", _document("alpha"), "api/routes")
+
+    record = store.get("alpha")
+    assert record.content == _document("alpha")
+    assert record.category == "api/routes"
+    assert store.exists("alpha")
+
+    assert store.delete("alpha") is True
+    assert store.get("alpha") is None
+    assert not store.exists("alpha")
+    assert store.delete("alpha") is False
+
+
+def test_overwrite_keeps_the_category(store):
+    store.put("alpha", _document("alpha"), "api")
+    store.put("alpha", _document("alpha", "2.0.0"), "elsewhere")
+
+    record = store.get("alpha")
+    assert record.content == _document("alpha", "2.0.0")
+    assert record.category == "api"
+    assert [record.id for record in store.iter_records()] == ["alpha"]
+
+
+def test_put_many_writes_nothing_when_one_write_fails(store, monkeypatch):
+    store.put("alpha", _document("alpha"))
+    if isinstance(store, FilesystemBlueprintStore):
+        real_fdopen = os.fdopen
+        calls = []
+
+        def failing_fdopen(fd, *args, **kwargs):
+            calls.append(fd)
+            if len(calls) == 2:
+                os.close(fd)
+                raise OSError("disk full")
+            return real_fdopen(fd, *args, **kwargs)
+
+        monkeypatch.setattr(blueprint_store.os, "fdopen", failing_fdopen)
+    else:
+        # The second row fails inside the transaction, after the first was written
+        with store.db.connection() as conn:
+            conn.execute(
+                "CREATE TRIGGER reject_beta BEFORE INSERT ON blueprints WHEN NEW.id = 'beta' "
+                "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+            )
+    records = [("alpha", _document("alpha", "2.0.0"), None), ("beta", _document("beta"), None)]
+
+    with pytest.raises(Exception):
+        store.put_many(records)
+
+    assert store.get("alpha").content == _document("alpha")
+    assert store.get("beta") is None
+    if isinstance(store, FilesystemBlueprintStore):
+        leftovers = [name for _, _, files in os.walk(store.root) for name in files if name.endswith(".tmp")]
+        assert leftovers == []
+
+
+def test_delete_removes_empty_category_directories(tmp_path):
+    store = FilesystemBlueprintStore(str(tmp_path))
+    store.put("alpha", _document("alpha"), "api/routes")
+    assert (tmp_path / "api" / "routes" / "alpha.json").exists()
+
+    store.delete("alpha")
+    assert not (tmp_path / "api").exists()
+
+
+def test_sqlite_store_is_seeded_from_the_blueprints_directory(tmp_path, monkeypatch):
+    FilesystemBlueprintStore(str(tmp_path / "blueprints")).put("alpha", _document("alpha"), "api")
+    monkeypatch.setattr(blueprint_store, "BLUEPRINT_STORE", "sqlite")
+    monkeypatch.setattr(blueprint_store, "BLUEPRINT_DB_PATH", str(tmp_path / "library.db"))
+
+    store = blueprint_store.open_blueprint_store(str(tmp_path / "blueprints"))
+    try:
+        record = store.get("alpha")
+        assert record.category == "api"
+        assert record.content == _document("alpha")
+    finally:
+        store.close()
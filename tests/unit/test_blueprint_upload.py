@@ -0,0 +1,99 @@
+"""
+Tests for the streaming blueprint upload spool.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_upload import (  # noqa: E402
+    BlueprintUploadSpool,
+    JSONStreamScanner,
+    UploadRejected,
+    spool_request_body
+)
+
+
+def _spool(tmp_path, chunks, max_bytes: int = 1024) -> bytes:
+    with BlueprintUploadSpool(str(tmp_path), max_bytes) as spool:
+        for chunk in chunks:
+            spool.write(chunk)
+        return spool.finish()
+
+
+def _chunked(data: bytes, size: int):
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_valid_document_survives_any_chunking(tmp_path, chunk_size):
+    document = json.dumps({"id": "alpha", "nested": {"list": [1, "}]", "a\\\"b"]}, "text": "café"},
+                          ensure_ascii=False).encode("utf-8")
+    assert _spool(tmp_path, _chunked(document, chunk_size)) == document
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("document, message", [
+    (b'["not", "an", "object"]', "must be a JSON object"),
+    (b'{"a": [1, 2}', "Mismatched bracket"),
+    (b'{"a": 1} {"b": 2}', "after the JSON document"),
+    (b'{"a": "unterminated}', "Truncated"),
+    (b'{"a": 1', "Truncated"),
+    (b'{"a": "\xff"}', "UTF-8"),
+])
+def test_malformed_documents_are_rejected(tmp_path, document, message):
+    with pytest.raises(UploadRejected) as excinfo:
+        _spool(tmp_path, _chunked(document, 4))
+    assert excinfo.value.status_code == 400
+    assert message in excinfo.value.detail
+    assert os.listdir(tmp_path) == []
+
+
+def test_oversized_upload_is_rejected_while_streaming(tmp_path):
+    chunks = [b'{"padding": "'] + [b"x" * 256] * 8
+
+    with pytest.raises(UploadRejected) as excinfo:
+        _spool(tmp_path, chunks, max_bytes=1024)
+    assert excinfo.value.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_nesting_depth_is_capped():
+    scanner = JSONStreamScanner(max_depth=3)
+    scanner.feed('{"a": [{"b": 1}]}')
+    scanner.close()
+
+    with pytest.raises(ValueError, match="deeper than 3"):
+        JSONStreamScanner(max_depth=3).feed('{"a": [{"b": [')
+
+
+def test_chunks_are_stored_in_batches_from_the_threadpool(tmp_path):
+    class Request:
+        headers = {"content-type": "application/json"}
+
+        async def stream(self):
+            for chunk in _chunked(document, 10):
+                yield chunk
+
+    document = json.dumps({"id": "alpha", "padding": "x" * 100}).encode("utf-8")
+    batches = []
+    event_loop_thread = threading.get_ident()
+
+    class RecordingSpool(BlueprintUploadSpool):
+        def check_chunk(self, chunk: bytes) -> None:
+            batches.append((len(chunk), threading.get_ident()))
+            super().check_chunk(chunk)
+
+    with RecordingSpool(str(tmp_path)) as spool:
+        spool.batch_bytes = 40
+        asyncio.run(spool_request_body(Request(), spool))
+        assert [size for size, _ in batches] == [40, 40, 40, len(document) - 120]
+        assert all(thread != event_loop_thread for _, thread in batches)
+        assert spool.finish() == document
@@ -0,0 +1,123 @@
+"""
+Tests for the blueprint revision history and VersionedBlueprintStore.
+"""
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_store import FilesystemBlueprintStore  # noqa: E402
+from blueprint_versions import (  # noqa: E402
+    _HISTORY_SCHEMA,
+    KEYFRAME_INTERVAL,
+    BlueprintHistory,
+    HistoryWriteError,
+    VersionedBlueprintStore,
+    apply_delta,
+    make_delta
+)
+
+
+@pytest.fixture
+def versioned(tmp_path):
+    history = BlueprintHistory(str(tmp_path / "history.db"))
+    store = VersionedBlueprintStore(FilesystemBlueprintStore(str(tmp_path / "blueprints")), history)
+    yield store
+    store.close()
+
+
+def _document(revision: int) -> bytes:
+    lines = "\\n".join(f"line {index} of revision {revision if index % 7 == 0 else 0}" for index in range(40))
+    return json.dumps({"id": "alpha", "version": f"1.0.{revision}", "codeTemplate": {"content": lines}}).encode("utf-8")
+
+
+def test_delta_round_trip():
+    base, target = _document(1), _document(2)
+    assert apply_delta(base, make_delta(base, target)) == target
+    assert apply_delta(target, make_delta(target, b"")) == b""
+
+
+def test_every_revision_materializes_across_keyframes(versioned):
+    revisions = KEYFRAME_INTERVAL * 2 + 3
+    for revision in range(1, revisions + 1):
+        versioned.put("alpha", _document(revision))
+
+    history = versioned.history
+    versions = history.list_versions("alpha")
+    assert [entry["revision"] for entry in versions] == list(range(1, revisions + 1))
+    assert versions[-1]["current"]
+    # Older revisions are stored as deltas, keyframes stay whole
+    with history.db.connection() as conn:
+        kinds = dict(conn.execute("SELECT revision, kind FROM blueprint_revisions WHERE blueprint_id = 'alpha'"))
+    assert kinds[KEYFRAME_INTERVAL] == "full"
+    assert kinds[KEYFRAME_INTERVAL - 1] == "delta"
+    assert kinds[KEYFRAME_INTERVAL + 1] == "delta"
+
+    history._materialized.clear()
+    for revision in range(1, revisions + 1):
+        assert history.materialize("alpha", revision) == _document(revision)
+
+
+def test_rollback_after_delete(versioned):
+    versioned.put("alpha", _document(1), "api/routes")
+    versioned.put("alpha", _document(2))
+    assert versioned.delete("alpha")
+
+    history = versioned.history
+    assert [entry["deleted"] for entry in history.list_versions("alpha")] == [False, False, True]
+    assert history.materialize("alpha", 3) is None
+
+    deleted = history.get_version("alpha", 1)
+    assert deleted["category"] == "api/routes"
+    versioned.put("alpha", history.materialize("alpha", 1), deleted["category"])
+    assert versioned.get("alpha").content == _document(1)
+    assert versioned.get("alpha").category == "api/routes"
+    assert history.current_revision("alpha") == 4
+    assert history.materialize("alpha", 4) == _document(1)
+
+
+def test_edits_made_outside_the_store_are_recorded_first(versioned, tmp_path):
+    versioned.put("alpha", _document(1))
+    (tmp_path / "blueprints" / "alpha.json").write_bytes(_document(2))
+
+    versioned.put("alpha", _document(3))
+    history = versioned.history
+    assert [history.materialize("alpha", revision) for revision in (1, 2, 3)] == [
+        _document(1), _document(2), _document(3)
+    ]
+
+
+def test_write_is_undone_when_its_history_cannot_be_recorded(versioned, monkeypatch):
+    versioned.put("alpha", _document(1), "api")
+
+    def fail(changes):
+        raise OSError("history database is read-only")
+
+    monkeypatch.setattr(versioned.history, "record_many", fail)
+    with pytest.raises(HistoryWriteError):
+        versioned.put_many([("alpha", _document(2), None), ("beta", _document(1), None)])
+    assert versioned.get("alpha").content == _document(1)
+    assert not versioned.exists("beta")
+
+    with pytest.raises(HistoryWriteError):
+        versioned.delete("alpha")
+    record = versioned.get("alpha")
+    assert (record.content, record.category) == (_document(1), "api")
+
+
+def test_history_without_categories_is_upgraded(tmp_path):
+    path = str(tmp_path / "history.db")
+    connection = sqlite3.connect(path)
+    connection.executescript(_HISTORY_SCHEMA.replace("    category TEXT,\n", ""))
+    connection.close()
+
+    history = BlueprintHistory(path)
+    history.record_many([("alpha", None, _document(1), "api")])
+    assert history.get_version("alpha", 1)["category"] == "api"
+    history.db.close()
+    BlueprintHistory(path).db.close()
@@ -0,0 +1,131 @@
+"""
+Tests for the cached, mtime-invalidated code example catalog.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import code_example_catalog  # noqa: E402
+from code_example_catalog import CodeExampleCatalog  # noqa: E402
+
+
+def _touch_dir(path: Path, offset: int) -> None:
+    """Move a directory's mtime explicitly, independent of filesystem granularity"""
+    mtime_ns = path.stat().st_mtime_ns + offset * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def examples(tmp_path):
+    (tmp_path / "routes").mkdir()
+    (tmp_path / "models").mkdir()
+    (tmp_path / "routes" / "users.py").write_text("users = 1\n")
+    (tmp_path / "models" / "user.py").write_text("user = 1\n")
+    (tmp_path / "README.md").write_text("# Examples\n")
+    return tmp_path
+
+
+def _paths(catalog):
+    return [example["path"] for example in catalog.list_examples()]
+
+
+def test_only_the_changed_directory_is_rescanned(examples, monkeypatch):
+    catalog = CodeExampleCatalog(str(examples))
+    assert _paths(catalog) == ["README.md", os.path.join("models", "user.py"), os.path.join("routes", "users.py")]
+
+    scanned = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        scanned.append(os.path.relpath(path, examples))
+        return real_scandir(path)
+
+    monkeypatch.setattr(code_example_catalog.os, "scandir", counting_scandir)
+
+    listing = catalog.list_examples()
+    assert scanned == []
+    assert catalog.list_examples() is listing
+
+    (examples / "routes" / "items.py").write_text("items = 1\n")
+    _touch_dir(examples / "routes", 1)
+    assert os.path.join("routes", "items.py") in _paths(catalog)
+    assert scanned == ["routes"]
+
+
+def test_removed_subdirectories_are_dropped(examples):
+    (examples / "models" / "nested").mkdir()
+    (examples / "models" / "nested" / "deep.py").write_text("deep = 1\n")
+    catalog = CodeExampleCatalog(str(examples))
+    assert os.path.join("models", "nested", "deep.py") in _paths(catalog)
+    catalog.load(os.path.join("models", "nested", "deep.py"))
+
+    (examples / "models" / "nested" / "deep.py").unlink()
+    (examples / "models" / "nested").rmdir()
+    (examples / "models" / "user.py").unlink()
+    (examples / "models").rmdir()
+    _touch_dir(examples, 1)
+
+    assert _paths(catalog) == ["README.md", os.path.join("routes", "users.py")]
+    assert catalog.stats()["directories"] == 2
+    assert catalog.content_hash(os.path.join("models", "nested", "deep.py")) is None
+
+
+def test_identical_files_share_one_cached_content(examples):
+    (examples / "routes" / "copy.py").write_text("users = 1\n")
+    catalog = CodeExampleCatalog(str(examples))
+
+    first = catalog.load(os.path.join("routes", "users.py"))
+    second = catalog.load(os.path.join("routes", "copy.py"))
+    assert first == second == "users = 1\n"
+    assert catalog.content_hash(os.path.join("routes", "users.py")) == catalog.content_hash(os.path.join("routes", "copy.py"))
+    assert catalog.stats()["cached_contents"] == 1
+    assert catalog.stats()["cached_bytes"] == len(b"users = 1\n")
+
+    assert catalog.load(os.path.join("routes", "copy.py")) is first
+    assert catalog.stats()["hits"] == 1
+
+
+def test_least_recently_used_contents_are_evicted_at_the_byte_budget(tmp_path):
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.py").write_text(name * 40)
+    catalog = CodeExampleCatalog(str(tmp_path), max_content_bytes=100)
+
+    catalog.load("a.py")
+    catalog.load("b.py")
+    catalog.load("a.py")  # b is now the least recently used
+    catalog.load("c.py")
+
+    stats = catalog.stats()
+    assert stats["cached_contents"] == 2
+    assert stats["cached_bytes"] == 80
+    misses = stats["misses"]
+
+    catalog.load("a.py")
+    catalog.load("c.py")
+    assert catalog.stats()["misses"] == misses
+    catalog.load("b.py")
+    assert catalog.stats()["misses"] == misses + 1
+
+
+def test_content_larger_than_the_budget_is_not_cached(tmp_path):
+    (tmp_path / "big.py").write_text("x" * 200)
+    catalog = CodeExampleCatalog(str(tmp_path), max_content_bytes=100)
+    assert catalog.load("big.py") == "x" * 200
+    assert catalog.stats()["cached_bytes"] == 0
+
+
+def test_load_rejects_paths_that_escape_the_root(examples, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    (outside / "secret.py").write_text("secret = 1\n")
+    (examples / "link").symlink_to(outside, target_is_directory=True)
+    catalog = CodeExampleCatalog(str(examples / "routes"))
+
+    assert catalog.load(os.path.join("..", "README.md")) is None
+    assert catalog.load(str(outside / "secret.py")) is None
+    assert CodeExampleCatalog(str(examples)).load(os.path.join("link", "secret.py")) is None
+    assert catalog.load("users.py") == "users = 1\n"
@@ -0,0 +1,86 @@
+"""
+Tests for the application bootstrap and router wiring.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import main  # noqa: E402
+import template_engine  # noqa: E402
+from blueprint_registry import BlueprintRegistry  # noqa: E402
+from blueprint_store import FilesystemBlueprintStore  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def library(tmp_path, monkeypatch):
+    """template_engine wired to a temporary two-blueprint library"""
+    store = FilesystemBlueprintStore(str(tmp_path / "blueprints"))
+    for blueprint_id in ("alpha", "beta"):
+        store.put(blueprint_id, json.dumps({"id": blueprint_id, "name": blueprint_id.title()}).encode("utf-8"))
+    monkeypatch.setattr(template_engine, "_blueprint_registry", BlueprintRegistry(store))
+    monkeypatch.setattr(template_engine, "_blueprint_search_index", None)
+    monkeypatch.setattr(template_engine, "_blueprint_extracts", None)
+    monkeypatch.setattr(main, "ensure_directories", lambda: None)
+    return store
+
+
+def _new_app() -> FastAPI:
+    app = FastAPI()
+    app.state.included_routers = []
+    app.state.templates = None
+    return app
+
+
+def _paths(app: FastAPI):
+    return [getattr(route, "path", None) for route in app.routes]
+
+
+def test_missing_optional_router_is_skipped(monkeypatch):
+    monkeypatch.setattr(main, "ROUTERS", [("blueprints_router", True), ("not_installed_router", False)])
+    app = _new_app()
+    main.include_routers(app)
+
+    assert app.state.included_routers == ["blueprints_router"]
+    assert "/api/blueprints/" in _paths(app)
+
+
+def test_missing_required_router_raises(monkeypatch):
+    monkeypatch.setattr(main, "ROUTERS", [("not_installed_router", True)])
+    with pytest.raises(ModuleNotFoundError):
+        main.include_routers(_new_app())
+
+
+def test_bootstrap_is_safe_to_call_twice():
+    app = _new_app()
+    assert main.bootstrap(app) == 2
+    routes = _paths(app)
+    templates = app.state.templates
+
+    # A worker lifespan after a preloading master finds everything in place
+    assert main.bootstrap(app) == 2
+    assert _paths(app) == routes
+    assert routes.count("/static") == 1
+    assert app.state.templates is templates
+    assert app.state.included_routers == ["blueprints_router"]
+
+
+def test_health_reports_startup_time(monkeypatch):
+    monkeypatch.setattr(main.app.router, "routes", list(main.app.router.routes))
+    monkeypatch.setattr(main.app.state, "included_routers", [])
+    monkeypatch.setattr(main.app.state, "templates", None)
+    monkeypatch.setattr(main.app.state, "startup_ms", None)
+    monkeypatch.setattr(main.app.state, "import_to_ready_ms", None)
+
+    with TestClient(main.app) as client:
+        health = client.get("/health").json()
+
+    assert health["status"] == "healthy"
+    assert isinstance(health["startup_ms"], float) and health["startup_ms"] >= 0
+    assert health["import_to_ready_ms"] >= health["startup_ms"]
@@ -0,0 +1,88 @@
+"""
+Tests for the write-behind output sink.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import generation_output  # noqa: E402
+from generation_output import DURABILITY_POLICIES, OutputProject, OutputSink  # noqa: E402
+
+
+@pytest.fixture(params=DURABILITY_POLICIES)
+def sink(request):
+    sink = OutputSink(durability=request.param, linger_seconds=0.01)
+    yield sink
+    sink.close()
+
+
+def test_projects_are_written_in_batches(sink, tmp_path):
+    projects = []
+    for index in range(5):
+        project = OutputProject()
+        project.add(str(tmp_path / f"pkg{index}" / "main.py"), f"print({index})\n")
+        project.add(str(tmp_path / f"pkg{index}" / "__init__.py"), "")
+        projects.append(project)
+
+    futures = [sink.submit(project) for project in projects]
+    assert [future.result(timeout=5) for future in futures] == [2] * 5
+
+    for index in range(5):
+        assert (tmp_path / f"pkg{index}" / "main.py").read_text() == f"print({index})\n"
+    stats = sink.stats()
+    assert stats["projects"] == 5 and stats["files"] == 10
+    assert stats["batches"] <= 5
+
+
+def test_failed_project_leaves_no_files(sink, tmp_path):
+    (tmp_path / "blocker").write_text("not a directory")
+    project = OutputProject()
+    project.add(str(tmp_path / "ok.py"), "x = 1\n")
+    project.add(str(tmp_path / "blocker" / "bad.py"), "y = 2\n")
+
+    with pytest.raises(OSError):
+        sink.write(project, timeout=5)
+    assert sorted(os.listdir(tmp_path)) == ["blocker"]
+
+
+def test_failed_rename_restores_the_files_already_replaced(sink, tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text("old a\n")
+    (tmp_path / "b.py").write_text("old b\n")
+    project = OutputProject()
+    project.add(str(tmp_path / "a.py"), "new a\n")
+    project.add(str(tmp_path / "new.py"), "new\n")
+    project.add(str(tmp_path / "b.py"), "new b\n")
+
+    replace = os.replace
+
+    def failing_replace(source, target):
+        if str(target).endswith("b.py") and str(source).endswith(".tmp"):
+            raise OSError("disk full")
+        replace(source, target)
+
+    monkeypatch.setattr(generation_output.os, "replace", failing_replace)
+    with pytest.raises(OSError, match="disk full"):
+        sink.write(project, timeout=5)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.py", "b.py"]
+    assert (tmp_path / "a.py").read_text() == "old a\n"
+    assert (tmp_path / "b.py").read_text() == "old b\n"
+
+
+def test_replaced_files_leave_no_backups(sink, tmp_path):
+    (tmp_path / "a.py").write_text("old\n")
+    project = OutputProject()
+    project.add(str(tmp_path / "a.py"), "new\n")
+    assert sink.write(project, timeout=5) == 1
+    assert os.listdir(tmp_path) == ["a.py"]
+    assert (tmp_path / "a.py").read_text() == "new\n"
+
+
+def test_unknown_durability_is_rejected():
+    with pytest.raises(ValueError, match="Unknown output durability"):
+        OutputSink(durability="sometimes")
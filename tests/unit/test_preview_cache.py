@@ -0,0 +1,105 @@
+"""
+Tests for cached generation previews.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import template_engine  # noqa: E402
+from blueprint_registry import BlueprintRegistry  # noqa: E402
+from blueprint_store import FilesystemBlueprintStore  # noqa: E402
+from generation_output import OutputProject, PreviewCache  # noqa: E402
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """template_engine wired to a temporary blueprint library and templates directory"""
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "greeting.txt").write_text("Hello {name}\n", encoding="utf-8")
+
+    store = FilesystemBlueprintStore(str(tmp_path / "blueprints"))
+    store.put("greeting", json.dumps({"id": "greeting", "template": "greeting.txt"}).encode("utf-8"))
+    monkeypatch.setattr(template_engine, "_blueprint_registry", BlueprintRegistry(store))
+    monkeypatch.setattr(template_engine, "_preview_cache", PreviewCache())
+    monkeypatch.setattr(template_engine, "find_templates_dir", lambda: str(templates_dir))
+    return template_engine
+
+
+FILES = [{"blueprintId": "greeting", "parameters": {"name": "World"}, "outputPath": "out/greeting.txt"}]
+
+
+def _preview(engine, files=FILES):
+    result = engine.preview_project(files)
+    assert result["success"], result
+    (content,) = result["project"].files.values()
+    return result["previewId"], content
+
+
+def test_identical_requests_are_served_from_the_cache(engine):
+    first_id, content = _preview(engine)
+    second_id, _ = _preview(engine)
+
+    assert content == b"Hello World\n"
+    assert first_id == second_id
+    assert engine.get_preview_cache().stats()["hits"] == 1
+
+
+def test_different_parameters_get_their_own_preview(engine):
+    first_id, _ = _preview(engine)
+    other = [dict(FILES[0], parameters={"name": "There"})]
+    second_id, content = _preview(engine, other)
+
+    assert second_id != first_id
+    assert content == b"Hello There\n"
+
+
+def test_blueprint_change_invalidates_the_preview(engine):
+    first_id, _ = _preview(engine)
+
+    registry = engine.get_blueprint_registry()
+    registry.store.put("greeting", json.dumps({"id": "greeting", "template": "greeting.txt", "version": "2"}).encode())
+    registry.refresh("greeting")
+
+    second_id, _ = _preview(engine)
+    assert second_id != first_id
+    assert engine.get_preview_cache().stats()["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used_past_its_budget():
+    def project(size: int) -> OutputProject:
+        output = OutputProject()
+        output.add("file.txt", "x" * size)
+        return output
+
+    cache = PreviewCache(max_bytes=100)
+    cache.put("a", project(40))
+    cache.put("b", project(40))
+    cache.get("a")
+    cache.put("c", project(40))
+    cache.put("huge", project(200))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.get("huge") is None
+    assert cache.stats()["bytes"] == 80
+
+
+def test_template_change_invalidates_the_preview(engine, tmp_path):
+    first_id, _ = _preview(engine)
+
+    template = tmp_path / "templates" / "greeting.txt"
+    template.write_text("Goodbye {name}\n", encoding="utf-8")
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second_id, content = _preview(engine)
+    assert second_id != first_id
+    assert content == b"Goodbye World\n"
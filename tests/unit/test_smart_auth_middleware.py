@@ -0,0 +1,193 @@
+"""
+Tests for the code generated from the smart-auth-middleware blueprint.
+"""
+import importlib.util
+import inspect
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+BLUEPRINT = BACKEND_DIR / "blueprints" / "api" / "middleware" / "smart-auth-middleware.json"
+SECRET_KEY = "test-secret"
+
+
+@pytest.fixture(scope="module")
+def auth_module(tmp_path_factory):
+    """The blueprint rendered with every option on, imported as a module."""
+    blueprint = json.loads(BLUEPRINT.read_text(encoding="utf-8"))
+    params = {
+        name: (spec.get("type") == "boolean" or spec.get("default", name))
+        for name, spec in blueprint["parameters"].items()
+    }
+    params["enableDetailedLogging"] = False
+    path = tmp_path_factory.mktemp("auth") / "smart_auth_middleware.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location("smart_auth_middleware", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _token(jti: str, lifetime: int = 3600) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": "user-1", "role": "user", "iat": now, "exp": now + lifetime, "jti": jti},
+        SECRET_KEY,
+        algorithm="HS256"
+    )
+
+
+def _client(auth_module, middleware_class_name: str = "SmartAuthMiddleware", **options):
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"items": []}
+
+    app.add_middleware(
+        getattr(auth_module, middleware_class_name),
+        secret_key=SECRET_KEY,
+        enable_logging=False,
+        **options
+    )
+    client = TestClient(app)
+    client.get("/items")  # builds the middleware stack
+
+    middleware = app.middleware_stack
+    while not isinstance(middleware, getattr(auth_module, middleware_class_name)):
+        middleware = middleware.app
+    return client, middleware
+
+
+@pytest.mark.parametrize("middleware_class_name", ["SmartAuthMiddleware", "SmartAuthASGIMiddleware"])
+def test_session_opens_on_first_request_and_revocation_rejects(auth_module, middleware_class_name):
+    client, middleware = _client(auth_module, middleware_class_name)
+    jti = str(uuid.uuid4())
+    headers = {"Authorization": f"Bearer {_token(jti)}"}
+
+    assert client.get("/items", headers=headers).status_code == 200
+    assert middleware.authenticator.active_sessions.get(jti)["user_id"] == "user-1"
+    assert client.get("/items", headers=headers).status_code == 200
+
+    middleware.revoke_session(jti)
+    assert client.get("/items", headers=headers).status_code == 401
+
+
+def test_expired_session_is_not_reopened_by_its_token(auth_module):
+    client, middleware = _client(auth_module, session_timeout=0)
+    headers = {"Authorization": f"Bearer {_token(str(uuid.uuid4()))}"}
+
+    assert client.get("/items", headers=headers).status_code == 200
+    time.sleep(0.01)
+    assert client.get("/items", headers=headers).status_code == 401
+    assert client.get("/items", headers=headers).status_code == 401
+
+
+def test_in_memory_session_backend_is_bounded(auth_module):
+    backend = auth_module.InMemorySessionBackend(max_sessions=3)
+    for index in range(5):
+        backend.set(f"session-{index}", {"index": index}, ttl=60)
+    backend.set("short-lived", {"index": -1}, ttl=0)
+
+    assert backend.get("session-0") is None
+    assert backend.get("session-4") == {"index": 4}
+    assert backend.get("short-lived") is None
+    assert backend.stats()["sessions"] <= 3
+
+
+def test_revoked_token_is_rejected(auth_module):
+    client, middleware = _client(auth_module)
+    jti = str(uuid.uuid4())
+    headers = {"Authorization": f"Bearer {_token(jti)}"}
+
+    assert client.get("/items", headers=headers).status_code == 200
+    middleware.revoke_token(jti, time.time() + 3600)
+    assert client.get("/items", headers=headers).status_code == 401
+
+
+def test_revocations_are_forgotten_once_their_tokens_expire(auth_module):
+    cache = auth_module.VerifiedTokenCache(revocation_ttl=3600)
+    cache.revoke("expired", time.time() - 1)
+    cache.revoke("live")
+    assert not cache.is_revoked("expired")
+    assert cache.is_revoked("live")
+
+    for index in range(1000):
+        cache.revoke(f"old-{index}", time.time() - 1)
+    assert len(cache.revoked_ids) < 200
+    assert cache.is_revoked("live")
+
+
+@pytest.mark.parametrize("path", ["/health", "/health/live", "/healthz", "/docs", "/doc", "/", "", "/api/items"])
+def test_prefix_matcher_agrees_with_startswith(auth_module, path):
+    prefixes = ["/health", "/health/live", "/docs", "/api/"]
+    matcher = auth_module.PathPrefixMatcher(prefixes)
+    assert matcher.matches(path) == any(path.startswith(prefix) for prefix in prefixes)
+    assert auth_module.PathPrefixMatcher([""]).matches(path)
+    assert not auth_module.PathPrefixMatcher([]).matches(path)
+
+
+def test_route_permissions_prefer_the_most_specific_rule(auth_module):
+    matcher = auth_module.RoutePermissionMatcher({
+        "GET /items": ["items:list"],
+        "DELETE /items/{item_id}": ["items:delete"],
+        "DELETE /items/archived": ["items:purge"],
+        "* /admin/*": ["admin"],
+        "GET /admin/status": ["status"],
+        "* /reports/{report_id}/export": ["reports:export"]
+    })
+
+    assert matcher.required("GET", "/items") == {"items:list"}
+    assert matcher.required("POST", "/items") == frozenset()
+    assert matcher.required("DELETE", "/items/42") == {"items:delete"}
+    assert matcher.required("DELETE", "/items/archived") == {"items:purge"}
+    assert matcher.required("DELETE", "/items/42/notes") == frozenset()
+    assert matcher.required("GET", "/admin/status") == {"status"}
+    assert matcher.required("PUT", "/admin/users/7") == {"admin"}
+    assert matcher.required("PUT", "/admin") == {"admin"}
+    assert matcher.required("POST", "/reports/q3/export") == {"reports:export"}
+    assert matcher.required("POST", "/reports/q3") == frozenset()
+
+
+def test_route_permissions_and_exclusions_apply_to_requests(auth_module):
+    client, _ = _client(auth_module, required_permissions={"GET /items": ["items:list"]})
+    headers = {"Authorization": f"Bearer {_token(str(uuid.uuid4()))}"}
+    assert client.get("/items", headers=headers).status_code == 403
+
+    client, _ = _client(auth_module, excluded_paths=["/item"])
+    assert client.get("/items").status_code == 200
+
+
+def test_authenticator_without_session_tracking_has_no_session_options(tmp_path):
+    blueprint = json.loads(BLUEPRINT.read_text(encoding="utf-8"))
+    params = {
+        name: (spec.get("type") == "boolean" or spec.get("default", name))
+        for name, spec in blueprint["parameters"].items()
+    }
+    params.update(enableDetailedLogging=False, enableSessionTracking=False)
+    path = tmp_path / "smart_auth_middleware_stateless.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("smart_auth_middleware_stateless", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    assert not hasattr(module, "SessionBackend")
+    parameters = inspect.signature(module.RequestAuthenticator.__init__).parameters
+    assert "session_backend" not in parameters and "max_sessions" not in parameters
+
+    client, _ = _client(module)
+    headers = {"Authorization": f"Bearer {_token(str(uuid.uuid4()))}"}
+    assert client.get("/items", headers=headers).status_code == 200
@@ -0,0 +1,124 @@
+"""
+Tests for the code generated from the smart-cors-middleware blueprint.
+"""
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+BLUEPRINT = BACKEND_DIR / "blueprints" / "api" / "middleware" / "smart-cors-middleware.json"
+ALLOWED_ORIGINS = ["https://app.example.org", "https://*.example.com", "http://*.dev.local:8080"]
+
+
+@pytest.fixture(scope="module")
+def cors_module(tmp_path_factory):
+    """The blueprint rendered with every option on, imported as a module."""
+    blueprint = json.loads(BLUEPRINT.read_text(encoding="utf-8"))
+    params = {
+        name: (spec.get("type") == "boolean" or spec.get("default", name))
+        for name, spec in blueprint["parameters"].items()
+    }
+    params["enableDetailedLogging"] = False
+    path = tmp_path_factory.mktemp("cors") / "smart_cors_middleware.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location("smart_cors_middleware", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _client(cors_module, middleware_class_name: str = "SmartCORSMiddleware", **options):
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return {"items": []}
+
+    app.add_middleware(
+        getattr(cors_module, middleware_class_name),
+        allowed_origins=ALLOWED_ORIGINS,
+        enable_logging=False,
+        **options
+    )
+    client = TestClient(app)
+    client.get("/items")  # builds the middleware stack
+
+    middleware = app.middleware_stack
+    while not isinstance(middleware, getattr(cors_module, middleware_class_name)):
+        middleware = middleware.app
+    return client, middleware
+
+
+@pytest.mark.parametrize("origin, allowed", [
+    ("https://app.example.org", True),
+    ("https://api.example.com", True),
+    ("https://a.b.example.com", True),
+    ("https://API.Example.com", True),
+    ("https://example.com", False),
+    ("https://evil-example.com", False),
+    ("https://example.com.evil.net", False),
+    ("http://api.example.com", False),
+    ("https://api.example.com:8443", False),
+    ("http://web.dev.local:8080", True),
+    ("http://web.dev.local", False),
+    ("https://other.example.org", False),
+])
+def test_wildcard_origins_need_a_subdomain_and_the_same_scheme_and_port(cors_module, origin, allowed):
+    assert cors_module.OriginMatcher(ALLOWED_ORIGINS).matches(origin) is allowed
+
+
+def test_star_allows_every_origin(cors_module):
+    matcher = cors_module.OriginMatcher(["*"])
+    assert matcher.matches("https://anything.test")
+    assert not cors_module.OriginMatcher([]).matches("https://anything.test")
+
+
+def test_actual_requests_only_get_headers_for_allowed_origins(cors_module):
+    client, _ = _client(cors_module)
+    allowed = client.get("/items", headers={"Origin": "https://api.example.com"})
+    assert allowed.headers["access-control-allow-origin"] == "https://api.example.com"
+
+    rejected = client.get("/items", headers={"Origin": "https://evil-example.com"})
+    assert rejected.status_code == 200
+    assert "access-control-allow-origin" not in rejected.headers
+
+
+@pytest.mark.parametrize("middleware_class_name", ["SmartCORSMiddleware", "SmartCORSASGIMiddleware"])
+def test_preflights_are_answered_from_the_cache(cors_module, middleware_class_name):
+    client, middleware = _client(cors_module, middleware_class_name, preflight_cache_size=2)
+
+    def preflight(origin: str, method: str = "POST"):
+        return client.options("/items", headers={
+            "Origin": origin,
+            "Access-Control-Request-Method": method,
+            "Access-Control-Request-Headers": "content-type"
+        })
+
+    first = preflight("https://api.example.com")
+    second = preflight("https://api.example.com")
+    assert first.status_code == second.status_code == 200
+    assert second.headers["access-control-allow-origin"] == "https://api.example.com"
+    assert dict(second.headers) == dict(first.headers)
+    assert middleware.get_preflight_cache_stats()["hits"] == 1
+
+    # A cached preflight must not answer another origin
+    other = preflight("https://docs.example.com")
+    assert other.headers["access-control-allow-origin"] == "https://docs.example.com"
+
+    # Rejected origins are not cached
+    assert preflight("https://evil-example.com").status_code == 403
+
+    preflight("https://app.example.org")
+    stats = middleware.get_preflight_cache_stats()
+    assert stats["entries"] == 2
+    assert stats["misses"] == 3
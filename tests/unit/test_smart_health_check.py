@@ -0,0 +1,165 @@
+"""
+Tests for the code generated from the smart-health-check blueprint.
+"""
+import asyncio
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+BLUEPRINT = BACKEND_DIR / "blueprints" / "api" / "routes" / "smart-health-check.json"
+
+
+def _render(tmp_path_factory, **overrides):
+    """Render the blueprint with every option on, except overrides, and import it."""
+    pytest.importorskip("psutil")
+    blueprint = json.loads(BLUEPRINT.read_text(encoding="utf-8"))
+    params = {
+        name: (spec.get("type") == "boolean" or spec.get("default", name))
+        for name, spec in blueprint["parameters"].items()
+    }
+    params["enableDetailedLogging"] = False
+    params.update(overrides)
+    path = tmp_path_factory.mktemp("health") / "smart_health_check.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location("smart_health_check", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def health_module(tmp_path_factory):
+    """The blueprint rendered with every option on, imported as a module."""
+    return _render(tmp_path_factory)
+
+
+def _check(health_module, name: str, delay: float, calls: list = None):
+    async def check():
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        return health_module.ComponentHealth(
+            name=name,
+            type=health_module.ComponentType.DATABASE,
+            status=health_module.HealthStatus.HEALTHY
+        )
+    return check
+
+
+def test_component_checks_run_concurrently(health_module):
+    checker = health_module.HealthChecker(check_timeout=5, sample_interval=0)
+    for index in range(5):
+        checker.register_component(f"dependency-{index}", _check(health_module, f"dependency-{index}", 0.2))
+
+    start = time.perf_counter()
+    results = asyncio.run(checker.check_all_components())
+    assert time.perf_counter() - start < 0.6
+    assert [result.name for result in results] == [f"dependency-{index}" for index in range(5)]
+    assert all(result.status == health_module.HealthStatus.HEALTHY for result in results)
+
+
+def test_each_check_gets_its_own_timeout(health_module):
+    def blocking_check():
+        time.sleep(0.05)
+        return health_module.ComponentHealth(
+            name="blocking",
+            type=health_module.ComponentType.CACHE,
+            status=health_module.HealthStatus.HEALTHY
+        )
+
+    async def failing_check():
+        raise ConnectionError("connection refused")
+
+    checker = health_module.HealthChecker(check_timeout=0.2, sample_interval=0)
+    checker.register_component("hanging", _check(health_module, "hanging", 30))
+    checker.register_component("also-hanging", _check(health_module, "also-hanging", 30))
+    checker.register_component("fast", _check(health_module, "fast", 0))
+    checker.register_component("blocking", blocking_check)
+    checker.register_component("failing", failing_check)
+
+    start = time.perf_counter()
+    results = {result.name: result for result in asyncio.run(checker.check_all_components())}
+    assert time.perf_counter() - start < 1
+
+    unhealthy = health_module.HealthStatus.UNHEALTHY
+    assert results["hanging"].status == results["also-hanging"].status == unhealthy
+    assert results["hanging"].error_message == "Health check timeout"
+    assert results["fast"].status == results["blocking"].status == health_module.HealthStatus.HEALTHY
+    assert results["failing"].status == unhealthy
+    assert results["failing"].error_message == "connection refused"
+
+
+def test_concurrent_probes_share_one_refresh_of_stale_results(health_module):
+    calls = []
+    checker = health_module.HealthChecker(check_timeout=5, max_staleness=60, sample_interval=0)
+    checker.register_component("database", _check(health_module, "database", 0.05, calls))
+
+    async def probes():
+        first = await asyncio.gather(*(checker.get_component_health() for _ in range(10)))
+        second = await checker.get_component_health()
+        return first, second
+
+    first, second = asyncio.run(probes())
+    assert calls == ["database"]
+    assert all(result == first[0] for result in first)
+    assert second == first[0]
+
+    checker.register_component("cache", _check(health_module, "cache", 0, calls))
+    assert [result.name for result in asyncio.run(checker.get_component_health())] == ["database", "cache"]
+
+
+def _wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_sampler_runs_from_app_startup_to_shutdown(health_module):
+    checker = health_module.HealthChecker(max_staleness=60, sample_interval=0.05)
+    health_module._health_checker = checker
+    calls = []
+    checker.register_component("database", _check(health_module, "database", 0, calls))
+    app = FastAPI()
+    app.include_router(health_module.router)
+
+    with TestClient(app) as client:
+        # Sampled before any probe arrives
+        assert _wait_for(lambda: len(calls) >= 2)
+        assert checker._metrics_cache is not None
+        task = checker._sampler_task
+        assert client.get("/api/v1/health/ready").json()["ready"] is True
+
+    assert checker._sampler_task is None
+    assert task.done()
+    count = len(calls)
+    time.sleep(0.15)
+    assert len(calls) == count
+
+
+def test_metrics_are_sampled_in_the_background_without_dependency_checks(tmp_path_factory):
+    health_module = _render(tmp_path_factory, enableDependencyChecks=False)
+    checker = health_module.HealthChecker(max_staleness=60, sample_interval=0.05)
+    health_module._health_checker = checker
+    app = FastAPI()
+    app.include_router(health_module.router)
+
+    with TestClient(app):
+        assert _wait_for(lambda: checker._metrics_cache is not None)
+        sampled_at, metrics = checker._metrics_cache
+        assert checker.get_system_metrics() is metrics
+    assert checker._sampler_task is None
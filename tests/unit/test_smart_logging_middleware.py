@@ -0,0 +1,254 @@
+"""
+Tests for the code generated from the smart-logging-middleware blueprint.
+"""
+import importlib.util
+import json
+import logging
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+BLUEPRINT = BACKEND_DIR / "blueprints" / "api" / "middleware" / "smart-logging-middleware.json"
+
+
+@pytest.fixture(scope="module")
+def logging_module(tmp_path_factory):
+    """The blueprint rendered with every option on, imported as a module."""
+    blueprint = json.loads(BLUEPRINT.read_text(encoding="utf-8"))
+    params = {
+        name: (spec.get("type") == "boolean" or spec.get("default", name))
+        for name, spec in blueprint["parameters"].items()
+    }
+    params["enableDetailedLogging"] = False
+    path = tmp_path_factory.mktemp("logging") / "smart_logging_middleware.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location("smart_logging_middleware", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _metrics(logging_module, index: int, processing_time_ms: float, status_code: int = 200):
+    return logging_module.RequestMetrics(
+        request_id=f"req_{index}",
+        method="GET",
+        path="/items",
+        status_code=status_code,
+        processing_time_ms=processing_time_ms
+    )
+
+
+def test_histogram_percentiles_stay_within_bucket_precision(logging_module):
+    histogram = logging_module.LatencyHistogram()
+    rng = random.Random(7)
+    values = [rng.uniform(1, 2000) for _ in range(5000)]
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for percent, estimate in zip((50, 90, 99), histogram.percentiles(50, 90, 99)):
+        exact = ordered[int(percent / 100 * len(ordered)) - 1]
+        assert abs(estimate - exact) / exact < 0.05
+
+    assert histogram.count == len(values)
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+    assert histogram.max_value == max(values)
+    assert histogram.percentiles(100) == (max(values),)
+
+
+def test_histogram_handles_empty_tiny_and_huge_values(logging_module):
+    histogram = logging_module.LatencyHistogram()
+    assert histogram.percentiles(50, 99) == (0.0, 0.0)
+    assert histogram.mean == 0.0
+
+    histogram.record(0.0)
+    histogram.record(10_000_000.0)  # above highest, shares the top bucket
+    p50, p100 = histogram.percentiles(50, 100)
+    assert p50 == pytest.approx(histogram.lowest)
+    assert p100 == pytest.approx(600000.0, rel=0.05)
+    assert histogram.max_value == 10_000_000.0
+
+
+def test_ring_buffer_keeps_recent_requests_and_summary_keeps_all(logging_module):
+    request_logger = logging_module.RequestLogger(metrics_buffer_size=3)
+    for index, processing_time_ms in enumerate([10.0, 20.0, 1500.0, 40.0, 50.0]):
+        request_logger._store_metrics(
+            _metrics(logging_module, index, processing_time_ms, 500 if index == 2 else 200)
+        )
+
+    assert [metrics.request_id for metrics in request_logger.metrics_storage] == ["req_2", "req_3", "req_4"]
+
+    summary = request_logger.get_metrics_summary()
+    assert summary["total_requests"] == 5
+    assert summary["recent_requests"] == 3
+    assert summary["average_response_time_ms"] == pytest.approx(324.0)
+    assert summary["max_response_time_ms"] == 1500.0
+    assert summary["status_code_distribution"] == {200: 4, 500: 1}
+    assert summary["slow_requests"] == 1
+
+
+def test_summary_without_requests(logging_module):
+    assert logging_module.RequestLogger().get_metrics_summary() == {"total_requests": 0}
+
+
+def test_excluded_paths_match_by_prefix(logging_module):
+    request_logger = logging_module.RequestLogger(excluded_paths=["/health", "/internal/"])
+    assert request_logger.is_path_excluded("/health")
+    assert request_logger.is_path_excluded("/healthz")
+    assert request_logger.is_path_excluded("/internal/jobs")
+    assert not request_logger.is_path_excluded("/internal")
+    assert not request_logger.is_path_excluded("/api/health")
+
+
+def _records(name: str):
+    """Records covering extras of every kind, exceptions, stack info and awkward times."""
+    logger = logging.getLogger(name)
+    extra = {
+        "request_id": "req_1",
+        "user": "Zoë",
+        "when": datetime(2024, 1, 1, 12, 0, 0),
+        "status_codes": {200: 3},
+        "path_parts": ("api", "items"),
+        "processing_time_ms": 12.5
+    }
+    records = [
+        logger.makeRecord(name, logging.INFO, __file__, 10, "Request %s", ("started",), None, "handler", extra),
+        logger.makeRecord(name, logging.INFO, __file__, 11, "Huge", (), None, "handler", {"count": 2 ** 70}),
+        logger.makeRecord(name, logging.INFO, __file__, 12, "Traced", (), None, "handler", None, "Stack (most recent call last)")
+    ]
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        records.append(logger.makeRecord(name, logging.ERROR, __file__, 13, "Failed", (), sys.exc_info(), "handler"))
+
+    for record, created in zip(records, (1700000000.0, 1700000000.1234565, 1700000000.9999996, 1704067200.5)):
+        record.created = created
+    return records
+
+
+def test_fast_json_formatter_matches_json_formatter(logging_module, monkeypatch):
+    request_logger = logging_module.RequestLogger()
+    fast = request_logger._create_json_formatter()
+    assert isinstance(fast, logging_module.FastJSONFormatter)
+    with monkeypatch.context() as patch:
+        patch.setattr(logging_module, "orjson", None)
+        plain = request_logger._create_json_formatter()
+
+    for record in _records("test.fast-json"):
+        assert json.loads(fast.format(record)) == {**request_logger.static_fields, **json.loads(plain.format(record))}
+
+
+def test_sampling_rules_use_the_longest_match_and_method_rules_win_ties(logging_module):
+    sampler = logging_module.BodySampler(0.25, {
+        "/api": 0.5,
+        "POST /api/orders": 1.0,
+        "/api/orders": 0.75,
+        "GET /api/health": 0.0
+    })
+    assert sampler.rate_for("GET", "/other") == 0.25
+    assert sampler.rate_for("GET", "/api/items") == 0.5
+    assert sampler.rate_for("POST", "/api/orders/42") == 1.0
+    assert sampler.rate_for("PUT", "/api/orders/42") == 0.75
+    assert sampler.rate_for("GET", "/api/health") == 0.0
+
+
+def test_sampler_follows_its_rate_and_caps_captures_per_second(logging_module, monkeypatch):
+    draws = iter([0.1, 0.6, 0.4, 0.9])
+    monkeypatch.setattr(logging_module.random, "random", lambda: next(draws))
+    sampler = logging_module.BodySampler(0.5)
+    assert [sampler.should_capture("GET", "/items") for _ in range(4)] == [True, False, True, False]
+
+    never = logging_module.BodySampler(1.0, {"/health": 0.0})
+    assert not never.should_capture("GET", "/health")
+
+    capped = logging_module.BodySampler(1.0, max_per_second=2)
+    assert [capped.should_capture("POST", "/items") for _ in range(5)] == [True, True, False, False, False]
+    assert capped.stats()["sampled"] == 2 and capped.stats()["throttled"] == 3
+
+
+def test_body_tee_keeps_at_most_one_byte_over_its_limit(logging_module):
+    tee = logging_module.BodyTee(8)
+    assert tee.text() is None
+
+    tee.feed(b'{"a":')
+    tee.feed(b"1}")
+    assert tee.text() == '{"a":1}'
+
+    for _ in range(100):
+        tee.feed(b"x" * 1024)
+    assert tee.size == 9
+    assert tee.text() == "<body too large: over 8 bytes>"
+
+    binary = logging_module.BodyTee(8)
+    binary.feed(b"\xff\xfe")
+    assert binary.text() == "<binary data: 2 bytes>"
+
+
+def test_body_tee_copies_small_slices_of_large_chunks(logging_module):
+    tee = logging_module.BodyTee(16)
+    chunk = b"y" * 4096
+    tee.feed(chunk)
+    assert isinstance(tee._chunks[0], bytes)
+    assert len(tee._chunks[0]) == 17
+
+
+@pytest.mark.parametrize("middleware_class_name", ["SmartLoggingMiddleware", "SmartLoggingASGIMiddleware"])
+def test_streamed_bodies_pass_through_and_are_logged_capped(logging_module, middleware_class_name):
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+
+        async def chunks():
+            for start in range(0, len(body), 4):
+                yield body[start:start + 4]
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(
+        getattr(logging_module, middleware_class_name),
+        excluded_paths=["/excluded"],
+        include_request_body=True,
+        include_response_body=True,
+        max_body_size=8
+    )
+    client = TestClient(app)
+    client.post("/echo", content=b"warmup")  # builds the middleware stack
+    middleware = app.middleware_stack
+    while not isinstance(middleware, getattr(logging_module, middleware_class_name)):
+        middleware = middleware.app
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    middleware.request_logger.logger.addHandler(handler)
+    try:
+        small = client.post("/echo", content=b"hello")
+        large = client.post("/echo", content=b"z" * 1000)
+    finally:
+        middleware.request_logger.logger.removeHandler(handler)
+
+    assert small.content == b"hello"
+    assert large.content == b"z" * 1000
+
+    bodies = [
+        (getattr(record, "request_body", None), getattr(record, "response_body", None))
+        for record in records if hasattr(record, "request_body") or hasattr(record, "response_body")
+    ]
+    logged = [value for pair in bodies for value in pair if value is not None]
+    assert logged.count("hello") == 2
+    assert logged.count("<body too large: over 8 bytes>") == 2
+    assert middleware.get_body_sampling_stats()["sampled"] == 3
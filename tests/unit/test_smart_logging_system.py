@@ -0,0 +1,214 @@
+"""
+Tests for the code generated from the smart-logging-system blueprint.
+"""
+import importlib.util
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend-mcp"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from blueprint_extracts import render_template  # noqa: E402
+
+BLUEPRINT = BACKEND_DIR / "blueprints" / "utils" / "smart-logging-system.json"
+
+
+@pytest.fixture(scope="module")
+def system_module(tmp_path_factory):
+    """The blueprint rendered with every option on, imported as a module."""
+    blueprint = json.loads(BLUEPRINT.read_text(encoding="utf-8"))
+    params = {
+        name: (spec.get("type") == "boolean" or spec.get("default", name))
+        for name, spec in blueprint["parameters"].items()
+    }
+    params["enableDetailedLogging"] = False
+    path = tmp_path_factory.mktemp("logging_system") / "smart_logging_system.py"
+    path.write_text(render_template(blueprint["codeTemplate"]["content"], params), encoding="utf-8")
+
+    spec = importlib.util.spec_from_file_location("smart_logging_system", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def collector():
+    """A local endpoint recording the body of every POST it receives."""
+    batches = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            batches.append(body.decode("utf-8").split("\n"))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/ingest", batches
+    server.shutdown()
+    server.server_close()
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def test_drop_policy_counts_records_that_do_not_fit(system_module):
+    handler = system_module.BoundedQueueHandler(queue.Queue(maxsize=2), policy="drop")
+    logger = _logger("test.queue.drop", handler)
+
+    start = time.perf_counter()
+    for index in range(5):
+        logger.info("record %d", index)
+    assert time.perf_counter() - start < 0.5
+
+    assert handler.stats() == {"depth": 2, "capacity": 2, "policy": "drop", "dropped": 3}
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ["record 0", "record 1"]
+
+
+def test_block_policy_waits_for_space_then_gives_up(system_module):
+    log_queue = queue.Queue(maxsize=1)
+    handler = system_module.BoundedQueueHandler(log_queue, policy="block", block_timeout=0.2)
+    logger = _logger("test.queue.block", handler)
+    logger.info("first")
+
+    # Space frees up while the second call waits
+    threading.Timer(0.05, log_queue.get_nowait).start()
+    logger.info("second")
+    assert handler.dropped == 0
+    assert log_queue.get_nowait().msg == "second"
+
+    logger.info("third")
+    start = time.perf_counter()
+    logger.info("fourth")
+    assert time.perf_counter() - start >= 0.15
+    assert handler.dropped == 1
+
+    with pytest.raises(ValueError):
+        system_module.BoundedQueueHandler(queue.Queue(), policy="wait")
+
+
+def test_queued_records_are_safe_to_format_on_another_thread(system_module):
+    handler = system_module.BoundedQueueHandler(queue.Queue(), policy="drop")
+    logger = _logger("test.queue.prepare", handler)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("failed for %s", "item-1")
+
+    record = handler.queue.get_nowait()
+    assert record.msg == "failed for item-1" and record.args is None
+    assert record.exc_info is None
+    assert "RuntimeError: boom" in record.exc_text
+
+
+def test_remote_records_are_sent_in_batches_and_drained_on_close(system_module, collector):
+    url, batches = collector
+    handler = system_module.RemoteBatchHandler(url, batch_size=3, flush_interval=30)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = _logger("test.remote.batches", handler)
+
+    for index in range(7):
+        logger.info("record %d", index)
+    deadline = time.monotonic() + 5
+    while len(batches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches == [["record 0", "record 1", "record 2"], ["record 3", "record 4", "record 5"]]
+
+    handler.close()
+    assert batches[-1] == ["record 6"]
+    assert handler.stats() == {"pending": 0, "sent": 7, "failed": 0, "dropped": 0}
+
+
+def test_partial_remote_batch_is_sent_after_the_flush_interval(system_module, collector):
+    url, batches = collector
+    handler = system_module.RemoteBatchHandler(url, batch_size=100, flush_interval=0.1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _logger("test.remote.flush", handler).info("lonely")
+
+    deadline = time.monotonic() + 5
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches == [["lonely"]]
+    handler.close()
+
+
+def test_remote_buffer_is_bounded(system_module):
+    handler = system_module.RemoteBatchHandler("http://127.0.0.1:9/unreachable", batch_size=100, flush_interval=30, max_pending=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = _logger("test.remote.bounded", handler)
+    for index in range(5):
+        logger.info("record %d", index)
+    assert handler.stats()["dropped"] == 3
+    handler.close()
+    assert handler.stats()["failed"] == 2
+
+
+def test_shutdown_delivers_every_queued_record(system_module, tmp_path):
+    root = logging.getLogger()
+    root_handlers, root_level = root.handlers[:], root.level
+    log_file = tmp_path / "app.log"
+    logging_system = system_module.SmartLoggingSystem()
+    try:
+        logging_system.configure(system_module.LogConfig(
+            format=system_module.LogFormat.COMPACT,
+            handlers=[system_module.LogHandler.FILE],
+            file_path=str(log_file),
+            queue_size=1000
+        ))
+        assert logging_system.get_system_info()["queue"]["capacity"] == 1000
+
+        logger = logging_system.get_logger("test.pipeline")
+        for index in range(200):
+            logger.info("record %d", index)
+        logging_system.shutdown()
+    finally:
+        root.handlers[:] = root_handlers
+        root.setLevel(root_level)
+
+    lines = log_file.read_text().splitlines()
+    assert sum(1 for line in lines if "test.pipeline: record" in line) == 200
+
+
+def test_fast_json_formatter_matches_json_formatter(system_module):
+    static_fields = {"service": "orders", "environment": "test"}
+    fast = system_module.FastJSONFormatter(static_fields)
+    plain = system_module.JSONFormatter()
+    logger = logging.getLogger("test.fast-json")
+    extra = {"request_id": "req_1", "user": "Zoë", "when": datetime(2024, 1, 1, 12, 0, 0), "status_codes": {200: 3}}
+
+    records = [
+        logger.makeRecord(logger.name, logging.INFO, __file__, 10, "Request %s", ("started",), None, "handler", extra),
+        logger.makeRecord(logger.name, logging.INFO, __file__, 11, "Huge", (), None, "handler", {"count": 2 ** 70}),
+        logger.makeRecord(logger.name, logging.INFO, __file__, 12, "Traced", (), None, "handler", None, "Stack")
+    ]
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        records.append(logger.makeRecord(logger.name, logging.ERROR, __file__, 13, "Failed", (), sys.exc_info(), "handler"))
+    # Already prepared by BoundedQueueHandler: the traceback is text
+    queued = system_module.BoundedQueueHandler(queue.Queue()).prepare(records[-1])
+    records.append(queued)
+
+    for record, created in zip(records, (1700000000.0, 1700000000.1234565, 1700000000.9999996, 1704067200.5, 1704067200.25)):
+        record.created = created
+        assert json.loads(fast.format(record)) == {**static_fields, **json.loads(plain.format(record))}
+    assert "ValueError: bad input" in json.loads(fast.format(queued))["exception"]